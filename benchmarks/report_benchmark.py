@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк генерации отчета по этапам
+
+Генерирует N синтетических сессий (ответы на вопросы из data/prompts, баллы
+как в боте) и проводит каждую через те же шаги, что бот и воркер отчетов:
+
+    normalize  - ScaleNormalizer.auto_normalize по четырем тестам
+    interpret  - AIInterpreter.interpret_all с заглушкой OpenAI (без сети)
+    charts     - EnhancedPDFReportV2._create_all_charts
+    story      - _build_story для пользовательского и полного отчета
+    build      - верстка обоих PDF (нумерация "Стр. X из N" - в том же проходе)
+    upload     - постановка полного отчета в UploadOutbox и загрузка заглушкой
+
+Для каждого этапа выводятся p50/p95/p99 времени, пик RSS процесса после
+этапа и пик выделений Python (tracemalloc, отдельный проход по нескольким
+сессиям, чтобы трассировка не искажала время). Результат - JSON, который
+можно сохранить для коммита и сравнить с другим (--compare).
+
+Запуск из корня репозитория:
+    python benchmarks/report_benchmark.py --sessions 20 --output bench.json
+    python benchmarks/report_benchmark.py --sessions 20 --compare bench.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+STAGES = ("normalize", "interpret", "charts", "story", "build", "upload")
+
+STUB_INTERPRETATION = (
+    "Доминирующий стиль: {section}.\n"
+    "Сильные стороны: системность, ответственность, умение доводить задачи до результата.\n"
+    "Зоны роста: делегирование, гибкость в изменяющихся условиях.\n"
+) * 12
+
+
+class _StubCompletions:
+    """Заглушка client.chat.completions: фиксированный ответ с задержкой"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create(self, model: str, messages: List[Dict], temperature: float = 0.3):
+        if self.latency:
+            time.sleep(self.latency)
+        section = messages[-1]["content"][:40]
+        message = SimpleNamespace(content=STUB_INTERPRETATION.format(section=section))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class StubOpenAIClient:
+    """Заглушка OpenAI клиента для AIInterpreter (без сети и ключа)"""
+
+    def __init__(self, latency: float = 0.0):
+        self.chat = SimpleNamespace(completions=_StubCompletions(latency))
+
+    def with_options(self, **kwargs) -> "StubOpenAIClient":
+        return self
+
+
+def make_stub_interpreter(latency: float = 0.0):
+    """AIInterpreter с заглушкой клиента: промпты и пул запросов - настоящие"""
+    from src.psytest.ai_interpreter import AIInterpreter
+
+    interpreter = AIInterpreter.__new__(AIInterpreter)
+    interpreter.api_key = "benchmark"
+    interpreter.model = "benchmark-stub"
+    interpreter.client = StubOpenAIClient(latency)
+    return interpreter
+
+
+def make_session(rng: random.Random, question_bank) -> Dict:
+    """Синтетическая сессия: ответы на все вопросы и баллы, как их считает бот"""
+    answers = {'paei': {}, 'disc': {}, 'hexaco': {}, 'soft_skills': {}}
+
+    paei_scores = {"P": 0, "A": 0, "E": 0, "I": 0}
+    for question in question_bank.paei:
+        code = rng.choice("PAEI")
+        paei_scores[code] += 1
+        answers['paei'][str(question.index)] = code
+
+    disc_sums = {"D": 0, "I": 0, "S": 0, "C": 0}
+    for question in question_bank.disc:
+        score = rng.randint(1, 5)
+        disc_sums[question.scale] = disc_sums.get(question.scale, 0) + score
+        answers['disc'][str(question.index)] = score
+    counts = question_bank.disc.scale_counts()
+    disc_scores = {k: round(v / counts[k], 1) if counts.get(k) else v for k, v in disc_sums.items()}
+
+    hexaco_scores = {}
+    for question, dimension in zip(question_bank.hexaco, ["H", "E", "X", "A", "C", "O"]):
+        score = rng.randint(1, 5)
+        hexaco_scores[dimension] = float(score)
+        answers['hexaco'][str(question.index)] = score
+
+    soft_skills_scores = {}
+    for question in question_bank.soft_skills:
+        score = rng.randint(1, 5)
+        soft_skills_scores[question.scale] = score
+        answers['soft_skills'][str(question.index)] = score
+
+    return {
+        'name': f"Участник {rng.randint(1, 10 ** 6)}",
+        'paei': paei_scores,
+        'disc': disc_scores,
+        'hexaco': hexaco_scores,
+        'soft_skills': soft_skills_scores,
+        'answers': answers,
+    }
+
+
+class ReportPipeline:
+    """Шаги генерации отчета, вызываемые по отдельности для замеров"""
+
+    def __init__(self, work_dir: Path, ai_latency: float = 0.0, chart_backend: Optional[str] = None):
+        from enhanced_pdf_report import EnhancedPDFReportV2
+        from report_worker import _get_qa_section
+        from upload_outbox import UploadOutbox
+
+        self.work_dir = work_dir
+        self.charts_dir = work_dir / "charts"
+        self.charts_dir.mkdir(parents=True, exist_ok=True)
+        self.interpreter = make_stub_interpreter(ai_latency)
+        self.report_user = EnhancedPDFReportV2(template_dir=self.charts_dir, chart_backend=chart_backend)
+        self.report_full = EnhancedPDFReportV2(
+            template_dir=self.charts_dir, include_questions_section=True, qa_section=_get_qa_section(),
+            chart_backend=chart_backend
+        )
+        self.outbox = UploadOutbox(outbox_dir=work_dir / "outbox", uploader=self._stub_upload)
+
+    @staticmethod
+    def _stub_upload(path: str, file_name: str, folder_name: str,
+                     folder_id: Optional[str], use_monthly: bool) -> str:
+        """Загрузчик-заглушка: читает файл, как это делает MediaFileUpload"""
+        with open(path, 'rb') as f:
+            while f.read(1024 * 1024):
+                pass
+        return f"https://drive.example/{file_name}"
+
+    def normalize(self, session: Dict) -> Dict:
+        from scale_normalizer import ScaleNormalizer
+        return {
+            'paei': ScaleNormalizer.auto_normalize("PAEI", session['paei'])[0],
+            'disc': ScaleNormalizer.auto_normalize("DISC", session['disc'])[0],
+            'hexaco': ScaleNormalizer.auto_normalize("HEXACO", session['hexaco'])[0],
+            'soft_skills': ScaleNormalizer.auto_normalize("SOFT_SKILLS", session['soft_skills'])[0],
+        }
+
+    def interpret(self, scores: Dict) -> Dict[str, str]:
+        return self.interpreter.interpret_all(scores['paei'], scores['disc'], scores['hexaco'], scores['soft_skills'])
+
+    def charts(self, scores: Dict) -> Dict:
+        return self.report_user._create_all_charts(scores['paei'], scores['disc'], scores['hexaco'], scores['soft_skills'])
+
+    def story(self, session: Dict, scores: Dict, interpretations: Dict, chart_paths: Dict) -> tuple:
+        args = ("2025-10-01 12:00", scores['paei'], scores['disc'], scores['hexaco'], scores['soft_skills'],
+                interpretations, chart_paths)
+        return (
+            self.report_user._build_story(session['name'], *args),
+            self.report_full._build_story(session['name'], *args, user_answers=session['answers']),
+        )
+
+    def build(self, stories: tuple, index: int) -> Path:
+        user_pdf = self.work_dir / f"{index:05d}_user.pdf"
+        full_pdf = self.work_dir / f"{index:05d}_full.pdf"
+        self.report_user._build_document(self.report_user._create_doc_template(str(user_pdf)), stories[0])
+        self.report_full._build_document(self.report_full._create_doc_template(str(full_pdf)), stories[1])
+        user_pdf.unlink()
+        return full_pdf
+
+    def upload(self, full_pdf: Path) -> None:
+        self.outbox.enqueue(str(full_pdf))
+        self.outbox.process_due()
+
+    def close(self) -> None:
+        self.outbox.close()
+
+
+def _rss_mb() -> Optional[float]:
+    """Пик RSS процесса (МБ) или None, если недоступно"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_session(pipeline: ReportPipeline, session: Dict, index: int,
+                on_stage) -> None:
+    """Проводит сессию через все этапы; on_stage(stage) - контекст замера этапа"""
+    with on_stage("normalize"):
+        scores = pipeline.normalize(session)
+    with on_stage("interpret"):
+        interpretations = pipeline.interpret(scores)
+    with on_stage("charts"):
+        chart_paths = pipeline.charts(scores)
+    with on_stage("story"):
+        stories = pipeline.story(session, scores, interpretations, chart_paths)
+    with on_stage("build"):
+        full_pdf = pipeline.build(stories, index)
+    with on_stage("upload"):
+        pipeline.upload(full_pdf)
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    import numpy as np
+    values = np.asarray(samples) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+        'p99_ms': round(float(np.percentile(values, 99)), 2),
+        'mean_ms': round(float(values.mean()), 2),
+    }
+
+
+def run_benchmark(sessions: int = 20, warmup: int = 1, memory_sessions: int = 3,
+                  ai_latency: float = 0.0, seed: int = 42, use_caches: bool = False,
+                  verbose: bool = False, chart_backend: Optional[str] = None) -> Dict:
+    """
+    Выполняет бенчмарк и возвращает результаты (словарь, готовый для JSON)
+
+    Args:
+        sessions: Число замеряемых сессий
+        warmup: Сессий прогрева (импорты, шрифты, разбор вопросов) - не учитываются
+        memory_sessions: Сессий для прохода с tracemalloc (0 - не замерять)
+        ai_latency: Имитация задержки ответа OpenAI, секунды
+        seed: Зерно генератора синтетических сессий
+        use_caches: Не отключать кэши диаграмм и интерпретаций
+        verbose: Показывать вывод генератора отчетов
+        chart_backend: Бэкенд диаграмм ("raster"/"vector"), None - PSYTEST_CHART_BACKEND
+    """
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    rss: Dict[str, Optional[float]] = {stage: None for stage in STAGES}
+    alloc: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+    @contextlib.contextmanager
+    def untimed(stage):
+        yield
+
+    @contextlib.contextmanager
+    def timed(stage):
+        start = time.perf_counter()
+        yield
+        timings[stage].append(time.perf_counter() - start)
+        rss[stage] = _rss_mb()
+
+    @contextlib.contextmanager
+    def traced(stage):
+        tracemalloc.reset_peak()
+        yield
+        alloc[stage] = max(alloc[stage], tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+
+    work_dir = Path(tempfile.mkdtemp(prefix="report_bench_"))
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        stack.callback(shutil.rmtree, work_dir, ignore_errors=True)
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+
+        from src.psytest.chart_cache import get_chart_cache
+        from src.psytest.interpretation_cache import get_interpretation_cache
+        from src.psytest.question_bank import get_question_bank
+
+        if not use_caches:
+            # Каждая сессия должна рисовать и интерпретировать заново
+            for cache in (get_chart_cache(), get_interpretation_cache()):
+                stack.callback(setattr, cache, "enabled", cache.enabled)
+                cache.enabled = False
+
+        rng = random.Random(seed)
+        question_bank = get_question_bank()
+        pipeline = ReportPipeline(work_dir, ai_latency, chart_backend)
+        stack.callback(pipeline.close)
+
+        index = 0
+        for on_stage, count in ((untimed, warmup), (timed, sessions)):
+            for _ in range(count):
+                run_session(pipeline, make_session(rng, question_bank), index, on_stage)
+                index += 1
+        if memory_sessions:
+            tracemalloc.start()
+            try:
+                for _ in range(memory_sessions):
+                    run_session(pipeline, make_session(rng, question_bank), index, traced)
+                    index += 1
+            finally:
+                tracemalloc.stop()
+
+    totals = [sum(values) for values in zip(*(timings[stage] for stage in STAGES))]
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sessions': sessions,
+        'ai_latency_s': ai_latency,
+        'caches': use_caches,
+        'chart_backend': pipeline.report_user.chart_backend,
+        'wall_seconds': round(time.perf_counter() - started, 2),
+        'stages': {
+            stage: {
+                **_percentiles(timings[stage]),
+                'rss_peak_mb': rss[stage],
+                'alloc_peak_mb': round(alloc[stage], 2) if memory_sessions else None,
+            }
+            for stage in STAGES
+        },
+        'total': _percentiles(totals),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict) -> str:
+    """Таблица изменения p50/p95 по этапам относительно сохраненного результата"""
+    lines = [f"{'этап':<10} {'p50 было':>10} {'p50 стало':>10} {'p95 было':>10} {'p95 стало':>10}  изменение p50"]
+    rows = [(stage, baseline['stages'].get(stage), current['stages'][stage]) for stage in STAGES]
+    rows.append(('total', baseline.get('total'), current['total']))
+    for stage, old, new in rows:
+        if not old:
+            continue
+        change = (new['p50_ms'] / old['p50_ms'] - 1) * 100 if old['p50_ms'] else 0.0
+        lines.append(f"{stage:<10} {old['p50_ms']:>10.1f} {new['p50_ms']:>10.1f} "
+                     f"{old['p95_ms']:>10.1f} {new['p95_ms']:>10.1f}  {change:+.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации отчета по этапам")
+    parser.add_argument("--sessions", type=int, default=20, help="число замеряемых сессий")
+    parser.add_argument("--warmup", type=int, default=1, help="сессий прогрева")
+    parser.add_argument("--memory-sessions", type=int, default=3, help="сессий для замера tracemalloc (0 - без)")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="имитация задержки OpenAI, секунды")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--with-caches", action="store_true", help="не отключать кэши диаграмм и интерпретаций")
+    parser.add_argument("--chart-backend", choices=("raster", "vector"),
+                        help="бэкенд диаграмм (по умолчанию PSYTEST_CHART_BACKEND)")
+    parser.add_argument("--output", type=Path, help="записать JSON в файл (по умолчанию - в stdout)")
+    parser.add_argument("--compare", type=Path, help="сравнить с ранее сохраненным JSON")
+    parser.add_argument("--verbose", action="store_true", help="показывать вывод генератора отчетов")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        sessions=args.sessions, warmup=args.warmup, memory_sessions=args.memory_sessions,
+        ai_latency=args.ai_latency, seed=args.seed, use_caches=args.with_caches, verbose=args.verbose,
+        chart_backend=args.chart_backend
+    )
+    payload = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+        print(f"Результаты записаны в {args.output}")
+    elif not args.compare:
+        print(payload)
+    if args.compare:
+        print(compare(result, json.loads(args.compare.read_text(encoding="utf-8"))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
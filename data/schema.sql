@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS responses (
     ts TEXT NOT NULL,
     FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
 );
+CREATE INDEX IF NOT EXISTS idx_responses_session ON responses(session_id, test_id);
 
 CREATE TABLE IF NOT EXISTS scores (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,3 +29,35 @@ CREATE TABLE IF NOT EXISTS scores (
     ts TEXT NOT NULL,
     FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
 );
+CREATE INDEX IF NOT EXISTS idx_scores_session ON scores(session_id, test_id);
+
+-- Незавершенные сессии Telegram-бота (снимок состояния для продолжения после перезапуска)
+CREATE TABLE IF NOT EXISTS bot_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL UNIQUE,
+    state TEXT NOT NULL,     -- JSON snapshot of UserSession
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY(session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+);
+
+-- Популяционные нормы: гистограмма сырых баллов по тесту и шкале (src/psytest/norms.py)
+CREATE TABLE IF NOT EXISTS norm_bins (
+    test_id TEXT NOT NULL,
+    scale TEXT NOT NULL,
+    value REAL NOT NULL,     -- raw, rounded to the norm resolution
+    count INTEGER NOT NULL,
+    PRIMARY KEY (test_id, scale, value)
+);
+
+-- Приращения норм до уплотнения в norm_bins
+CREATE TABLE IF NOT EXISTS norm_delta (
+    test_id TEXT NOT NULL,
+    scale TEXT NOT NULL,
+    value REAL NOT NULL,
+    count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS norm_state (
+    key TEXT PRIMARY KEY,    -- last_score_id: last scores.id already counted
+    value INTEGER NOT NULL
+);
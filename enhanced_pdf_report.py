@@ -6,17 +6,20 @@
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from io import BytesIO
-from copy import deepcopy
+import copy
 import re
+import threading
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib.colors import Color
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.graphics.shapes import Drawing
+from reportlab.pdfgen import canvas
 import os
 import sys
 from interpretation_utils import generate_interpretations_from_prompt
@@ -27,13 +30,41 @@ from interpretation_formatter import format_ai_interpretations, parse_hexaco_sec
 sys.path.append(str(Path(__file__).parent / "src"))
 
 try:
-    from src.psytest.ai_interpreter import get_ai_interpreter
+    from src.psytest.ai_interpreter import get_ai_interpreter, INTERPRETATION_SECTIONS
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
+    INTERPRETATION_SECTIONS = ('paei', 'disc', 'hexaco', 'soft_skills', 'general')
     print("AI интерпретатор недоступен - будут использованы статические интерпретации")
 
-from src.psytest.charts import make_radar, make_bar_chart, make_paei_combined_chart, make_disc_combined_chart, make_hexaco_radar
+from src.psytest.fonts import get_font_set
+from src.psytest.render_workspace import RenderWorkspace
+
+# Бэкенды диаграмм: "raster" - PNG через matplotlib (charts.py), "vector" - Drawing
+# ReportLab (vector_charts.py). matplotlib импортируется только растровым бэкендом
+CHART_BACKENDS = ("raster", "vector")
+
+# Диаграмма отчёта: путь к PNG, PNG в BytesIO (в памяти) или Drawing (векторный бэкенд)
+ChartSource = Union[Path, BytesIO, Drawing]
+
+
+def default_chart_backend() -> str:
+    """Бэкенд диаграмм по умолчанию (переменная окружения PSYTEST_CHART_BACKEND)"""
+    backend = os.getenv("PSYTEST_CHART_BACKEND", "raster").strip().lower()
+    if backend not in CHART_BACKENDS:
+        print(f"Неизвестный бэкенд диаграмм {backend!r}, используется raster")
+        return "raster"
+    return backend
+
+
+def chart_threads() -> int:
+    """Число потоков для отрисовки диаграмм одного отчёта (PSYTEST_CHART_THREADS, 1 - по очереди)"""
+    default = min(4, os.cpu_count() or 1)
+    try:
+        return max(1, int(os.getenv("PSYTEST_CHART_THREADS", str(default))))
+    except ValueError:
+        print(f"Некорректное PSYTEST_CHART_THREADS, используется {default}")
+        return default
 
 # Константы для минималистичного дизайна
 class DesignConfig:
@@ -68,6 +99,21 @@ class DesignConfig:
     SMALL_SIZE = 9   # было 8
 
 
+# Жёстко задаём порядок и названия soft skills для диаграммы, чтобы совпадало с skills_mapping
+SOFT_SKILLS_CHART_LABELS = [
+    "Коммуникация",
+    "Работа в команде",
+    "Лидерство",
+    "Критическое мышление",
+    "Управление временем",
+    "Стрессоустойчивость",
+    "Восприимчивость к критике",
+    "Адаптивность",
+    "Решение проблем",
+    "Креативность"
+]
+
+
 class EnhancedCharts:
     """Класс для создания улучшенных диаграмм"""
     
@@ -75,114 +121,376 @@ class EnhancedCharts:
     def create_minimalist_radar(labels: List[str], values: List[float], 
                                title: str, out_path: Path) -> Path:
         """Создаёт минималистичную радарную диаграмму"""
+        from src.psytest.charts import make_radar
         return make_radar(labels, values, out_path, title=title, max_value=5, normalize=False)
     
     @staticmethod
     def create_minimalist_bar_chart(labels: List[str], values: List[float],
                                    title: str, out_path: Path) -> Path:
         """Создаёт минималистичную столбчатую диаграмму"""
+        from src.psytest.charts import make_bar_chart
         return make_bar_chart(labels, values, out_path, title=title, max_value=5, normalize=False)
     
     @staticmethod
     def create_paei_combined_chart(labels: List[str], values: List[float],
                                   title: str, out_path: Path) -> Path:
         """Создаёт комбинированную диаграмму PAEI (столбиковая + круговая)"""
+        from src.psytest.charts import make_paei_combined_chart
         return make_paei_combined_chart(labels, values, out_path, title=title)
     
     @staticmethod
     def create_disc_combined_chart(labels: List[str], values: List[float],
                                   title: str, out_path: Path) -> Path:
         """Создаёт комбинированную диаграмму DISC (столбиковая + круговая)"""
+        from src.psytest.charts import make_disc_combined_chart
         return make_disc_combined_chart(labels, values, out_path, title=title)
         
     @staticmethod
     def create_hexaco_radar(labels: List[str], values: List[float], 
                           title: str, out_path: Path) -> Path:
         """Создаёт радарную диаграмму HEXACO с расшифровками аббревиатур"""
+        from src.psytest.charts import make_hexaco_radar
         return make_hexaco_radar(labels, values, out_path, title=title, max_value=5, normalize=False)
+    
+    @staticmethod
+    def prerender_backgrounds() -> int:
+        """Рисует фоны радаров отчёта заранее (см. chart_sprites) - для прогрева воркера"""
+        from src.psytest.charts import make_hexaco_radar, make_radar, prerender_radar_backgrounds
+        return prerender_radar_backgrounds([
+            (make_radar, {'labels': SOFT_SKILLS_CHART_LABELS, 'title': "Soft Skills",
+                          'max_value': 5, 'normalize': False}),
+            (make_hexaco_radar, {'labels': ['H', 'E', 'X', 'A', 'C', 'O'], 'title': "HEXACO",
+                                 'max_value': 5, 'normalize': False}),
+        ])
+
+
+class NumberedCanvas(canvas.Canvas):
+    """
+    Canvas с отложенной нумерацией страниц "Стр. X из N"
+
+    Общее число страниц известно только после вёрстки всего документа, поэтому
+    страницы не сбрасываются в PDF сразу, а запоминаются и дорисовываются
+    колонтитулом при сохранении. Документ верстается за один проход.
+    """
+
+    def __init__(self, *args, page_decorator: Optional[Callable] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._saved_page_states: List[dict] = []
+        self._page_decorator = page_decorator
+
+    def showPage(self):
+        self._saved_page_states.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        total_pages = len(self._saved_page_states)
+        for state in self._saved_page_states:
+            self.__dict__.update(state)
+            if self._page_decorator:
+                self._page_decorator(self, total_pages)
+            super().showPage()
+        super().save()
+
+
+SOFT_SKILLS_DESCRIPTION = """
+        <b>Soft Skills</b> - это надпрофессиональные навыки, которые помогают решать жизненные и рабочие задачи 
+        независимо от специальности. Включают коммуникативные способности, способность работать в команде, лидерские качества, критическое мышление,  
+        управление временем, стрессоустойчивость, восприятие критики (как элемент эмоционального интеллекта), адаптивность, 
+        способность решать проблемы, креативность. Эти навыки определяют эффективность взаимодействия с людьми и способность
+        к профессиональному росту в любой сфере деятельности.
+        """
+
+HEXACO_DESCRIPTION = """
+        <b>Основные измерения HEXACO:</b><br/>
+        • <b>H (Honesty-Humility)</b> - честность, скромность, искренность в отношениях<br/>
+        • <b>E (Emotionality)</b> - эмоциональность, чувствительность, эмпатия<br/>
+        • <b>X (eXtraversion)</b> - экстраверсия, социальная активность, общительность<br/>
+        • <b>A (Agreeableness)</b> - доброжелательность, сотрудничество, терпимость<br/>
+        • <b>C (Conscientiousness)</b> - добросовестность, организованность, дисциплина<br/>
+        • <b>O (Openness)</b> - открытость опыту, креативность, любознательность
+        """
+
+DISC_DESCRIPTION = """
+        <b>DISC</b> - методика оценки поведенческих особенностей и стилей общения:<br/>
+        • <b>D (Dominance)</b> - доминирование, прямота, решительность, ориентация на результат<br/>
+        • <b>I (Influence)</b> - влияние, общительность, оптимизм, ориентация на людей<br/>
+        • <b>S (Steadiness)</b> - постоянство, терпение, командная работа, стабильность<br/>
+        • <b>C (Compliance)</b> - соответствие стандартам, аналитичность, точность, осторожность
+        """
+
+# Постоянные фрагменты отчёта: (текст, стиль, отступ после в мм)
+STATIC_SECTIONS: Dict[str, Tuple[Tuple[str, str, float], ...]] = {
+    'title': (
+        ("ОЦЕНКА КОМАНДНЫХ НАВЫКОВ", 'MainTitle', 1),
+    ),
+    'summary': (
+        ("ОБЩЕЕ ЗАКЛЮЧЕНИЕ И РЕКОМЕНДАЦИИ", 'SectionTitle', 2),
+    ),
+    'summary_results': (
+        ("<b>Ключевые характеристики профиля и использованные методики:</b>", 'SubTitle', 0),
+        ("<b>Результаты тестирования:</b>", 'Body', 0),
+    ),
+    'paei': (
+        ("1. ТЕСТ АДИЗЕСА (PAEI) - УПРАВЛЕНЧЕСКИЕ РОЛИ", 'SectionTitle', 0),
+        ("Тест Адизеса (PAEI) - оценка управленческих ролей и стилей руководства (5 вопросов по 4 типам).", 'Body', 2),
+        ("<b>Расшифровка PAEI:</b>", 'Body', 0),
+    ),
+    'soft_skills': (
+        ("2. SOFT SKILLS - ОЦЕНКА МЯГКИХ НАВЫКОВ", 'SectionTitle', 0),
+        ("Оценка Soft Skills - анализ надпрофессиональных компетенций (10 вопросов по 5-балльной шкале).", 'Body', 2),
+        (SOFT_SKILLS_DESCRIPTION, 'Body', 2),
+    ),
+    'hexaco': (
+        ("3. ТЕСТ HEXACO - МОДЕЛЬ ЛИЧНОСТИ", 'SectionTitle', 0),
+        ("HEXACO - современная шестифакторная модель личности (10 вопросов по 5-балльной шкале).", 'Body', 3),
+        (HEXACO_DESCRIPTION, 'Body', 5),
+    ),
+    'disc': (
+        ("4. ТЕСТ DISC - МОДЕЛЬ ПОВЕДЕНИЯ", 'SectionTitle', 0),
+        ("DISC - методика оценки поведенческих особенностей и стилей (8 вопросов по 4 типам).", 'Body', 3),
+        (DISC_DESCRIPTION, 'Body', 5),
+    ),
+    'recommendations': (
+        ("РЕКОМЕНДАЦИИ ПО ПРОФЕССИОНАЛЬНОМУ РАЗВИТИЮ", 'SectionTitle', 2),
+        ("<b>1. Использование сильных сторон:</b>", 'SubTitle', 0),
+    ),
+    'development_areas': (
+        ("<b>2. Области для развития:</b>", 'SubTitle', 0),
+        ("• (PAEI): Работать над менее выраженными управленческими ролями", 'ListWithIndent', 0),
+        ("• (Soft Skills): Развивать дополнительные soft skills для универсальности [поиск курсов в Google]", 'ListWithIndent', 0),
+        ("• (DISC): Балансировать поведенческий стиль в зависимости от ситуации", 'ListWithIndent', 2),
+        ("<b>3. Карьерные перспективы:</b>", 'SubTitle', 0),
+    ),
+    'career_static': (
+        ("• (HEXACO): Планировать развитие с учетом личностного профиля HEXACO", 'ListWithIndent', 0),
+        ("• (DISC): Выстраивать команду с учетом комплементарных ролей по DISC", 'ListWithIndent', 2),
+        ("<b>4. Рекомендации по подбору кандидатов в свою команду:</b>", 'SubTitle', 0),
+    ),
+    'team_fallback': (
+        ("• Добавлять специалистов с высокими показателями в производительности (P) и интеграции (I) для баланса", 'ListWithIndent', 0),
+        ("• Искать кандидатов с сильными производственными и интеграционными ролями для создания полноценной управленческой команды", 'ListWithIndent', 0),
+    ),
+}
+
+
+class StaticParagraph(Paragraph):
+    """
+    Абзац шаблона с постоянным текстом
+
+    Разметка разбирается один раз, разбивка на строки запоминается для каждой
+    ширины колонки и общая для всех копий. В story кладётся поверхностная
+    копия (instance), поэтому отчёты в разных потоках не делят width/height.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._layouts: Dict[float, tuple] = {}
+
+    def instance(self) -> "StaticParagraph":
+        return copy.copy(self)
+
+    def wrap(self, availWidth, availHeight):
+        layout = self._layouts.get(availWidth)
+        if layout is None:
+            width, height = super().wrap(availWidth, availHeight)
+            self._layouts[availWidth] = (self._wrapWidths, self.blPara, height)
+            return width, height
+        self.width = availWidth
+        self._wrapWidths, self.blPara, self.height = layout
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        # Разбиение на страницы меняет слова строк - разбиваем собственную вёрстку
+        Paragraph.wrap(self, availWidth, availHeight)
+        return super().split(availWidth, availHeight)
+
+
+class ReportTemplate:
+    """
+    Неизменная часть отчёта: стили и постоянные абзацы
+
+    Создаётся один раз на процесс для набора шрифтов (for_fonts). На отчёт
+    остаётся только вёрстка переменных частей: имени, баллов, интерпретаций.
+    """
+
+    _instances: Dict[Tuple[str, str], "ReportTemplate"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, title_font: str, body_font: str):
+        self.styles = self._build_styles(title_font, body_font)
+        self._paragraphs: Dict[tuple, StaticParagraph] = {}
+        self._sections: Dict[str, List] = {}
+
+    @classmethod
+    def for_fonts(cls, title_font: str, body_font: str) -> "ReportTemplate":
+        with cls._lock:
+            template = cls._instances.get((title_font, body_font))
+            if template is None:
+                template = cls._instances[(title_font, body_font)] = cls(title_font, body_font)
+            return template
+
+    def paragraph(self, text: str, style_name: str, bullet_text: Optional[str] = None) -> StaticParagraph:
+        """Копия закэшированного абзаца (только для постоянного текста)"""
+        key = (text, style_name, bullet_text)
+        template = self._paragraphs.get(key)
+        if template is None:
+            template = self._paragraphs.setdefault(
+                key, StaticParagraph(text, self.styles[style_name], bulletText=bullet_text)
+            )
+        return template.instance()
+
+    def section(self, name: str) -> List:
+        """Постоянный фрагмент из STATIC_SECTIONS: абзацы с отступами"""
+        if name not in self._sections:
+            self._sections[name] = [
+                (self.paragraph(text, style_name), space)
+                for text, style_name, space in STATIC_SECTIONS[name]
+            ]
+        flowables = []
+        for paragraph, space in self._sections[name]:
+            flowables.append(paragraph.instance())
+            if space:
+                flowables.append(Spacer(1, space * mm))
+        return flowables
+
+    @staticmethod
+    def _build_styles(title_font: str, body_font: str):
+        """Создаёт пользовательские стили"""
+        styles = getSampleStyleSheet()
+        
+        # Основной заголовок
+        styles.add(ParagraphStyle(
+            name='MainTitle',
+            parent=styles['Title'],
+            fontSize=DesignConfig.TITLE_SIZE,
+            fontName=title_font,
+            textColor=DesignConfig.PRIMARY_COLOR,
+            alignment=1,  # CENTER
+            spaceAfter=6,
+        ))
+        
+        # Заголовок секции
+        styles.add(ParagraphStyle(
+            name='SectionTitle',
+            parent=styles['Heading2'],
+            fontSize=12,
+            fontName=title_font,
+            textColor=DesignConfig.PRIMARY_COLOR,
+            spaceBefore=6,
+            spaceAfter=3,
+        ))
+        
+        # Подзаголовок
+        styles.add(ParagraphStyle(
+            name='SubTitle',
+            parent=styles['Heading3'],
+            fontSize=11,
+            fontName=title_font,
+            textColor=DesignConfig.PRIMARY_COLOR,
+            spaceBefore=4,
+            spaceAfter=2,
+        ))
+        
+        # Основной текст
+        styles.add(ParagraphStyle(
+            name='Body',
+            parent=styles['Normal'],
+            fontSize=DesignConfig.BODY_SIZE,
+            fontName=body_font,
+            textColor=DesignConfig.TEXT_COLOR,
+            spaceAfter=4,
+            leading=14,  # было 12, увеличено для лучшей читаемости
+        ))
+        
+        # Имя участника (увеличенный шрифт, по центру)
+        styles.add(ParagraphStyle(
+            name='ParticipantName',
+            parent=styles['Normal'],
+            fontSize=12,  # уменьшенный шрифт
+            fontName=title_font,
+            textColor=DesignConfig.PRIMARY_COLOR,
+            alignment=1,  # CENTER
+            spaceAfter=1,
+            spaceBefore=1,
+        ))
+        
+        # Стиль для списков с отступом (как на скриншоте)
+        styles.add(ParagraphStyle(
+            name='ListWithIndent',
+            parent=styles['Normal'],
+            fontSize=DesignConfig.BODY_SIZE,
+            fontName=body_font,
+            textColor=DesignConfig.TEXT_COLOR,
+            leftIndent=15,  # отступ слева для элементов списка
+            spaceAfter=2,
+            leading=14,
+        ))
+        
+        return styles
 
 
 class EnhancedPDFReportV2:
     """Класс для создания улучшенных PDF отчётов версии 2.0"""
     
-    def __init__(self, template_dir: Optional[Path] = None, include_questions_section: bool = False):
-        self.template_dir = template_dir or Path.cwd() / "temp_charts"
-        self.template_dir.mkdir(exist_ok=True)
+    def __init__(self, template_dir: Optional[Path] = None, include_questions_section: bool = False,
+                 qa_section: Optional[QuestionAnswerSection] = None, chart_backend: Optional[str] = None):
+        """
+        Args:
+            template_dir: Папка для PNG диаграмм. Если не задана, каждый отчёт рисует
+                диаграммы в свою временную папку (RenderWorkspace) - отчёты можно строить параллельно
+            include_questions_section: Добавлять ли раздел с вопросами и ответами
+            qa_section: Готовый раздел с вопросами (чтобы не разбирать промпты заново)
+            chart_backend: "raster" (matplotlib PNG) или "vector" (Drawing ReportLab);
+                по умолчанию из PSYTEST_CHART_BACKEND
+        """
+        if chart_backend is not None and chart_backend not in CHART_BACKENDS:
+            raise ValueError(f"Неизвестный бэкенд диаграмм: {chart_backend}")
+        self.chart_backend = chart_backend or default_chart_backend()
+        self.template_dir = template_dir
+        if self.template_dir is not None:
+            self.template_dir.mkdir(exist_ok=True)
         self.include_questions_section = include_questions_section
-        self.qa_section = QuestionAnswerSection() if include_questions_section else None
+        self.qa_section = (qa_section or QuestionAnswerSection()) if include_questions_section else None
         self._setup_fonts()
+        self.template = ReportTemplate.for_fonts(DesignConfig.TITLE_FONT, DesignConfig.BODY_FONT)
         
+    def render_workspace(self, in_memory: bool = False) -> RenderWorkspace:
+        """Рабочее место для диаграмм одного отчёта (template_dir или своя временная папка)"""
+        return RenderWorkspace(self.template_dir, in_memory=in_memory)
+
     def _setup_fonts(self):
-        """Настраивает шрифты с поддержкой кириллицы"""
-        try:
-            # Пытаемся использовать системные шрифты Windows с кириллицей
-            import os
-            windows_fonts = "C:/Windows/Fonts/"
-            
-            # Список шрифтов в порядке предпочтения
-            font_candidates = [
-                ("arial.ttf", "Arial-Regular"),
-                ("arialbd.ttf", "Arial-Bold"), 
-                ("times.ttf", "Times-Regular"),
-                ("timesbd.ttf", "Times-Bold"),
-            ]
-            
-            fonts_registered = {}
-            
-            for font_file, font_name in font_candidates:
-                font_path = os.path.join(windows_fonts, font_file)
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont(font_name, font_path))
-                        fonts_registered[font_name] = True
-                        print(f"Зарегистрирован шрифт: {font_name}")
-                    except Exception as e:
-                        print(f"Ошибка регистрации {font_name}: {e}")
-            
-            # Устанавливаем шрифты в зависимости от того, что удалось зарегистрировать
-            if "Arial-Regular" in fonts_registered:
-                DesignConfig.BODY_FONT = "Arial-Regular"
-                DesignConfig.SMALL_FONT = "Arial-Regular"
-                print("Используется Arial для основного текста")
-            else:
-                DesignConfig.BODY_FONT = "Times-Roman"
-                DesignConfig.SMALL_FONT = "Times-Roman"
-                print("Используется Times-Roman для основного текста")
-            
-            if "Arial-Bold" in fonts_registered:
-                DesignConfig.TITLE_FONT = "Arial-Bold"
-                print("Используется Arial-Bold для заголовков")
-            elif "Times-Bold" in fonts_registered:
-                DesignConfig.TITLE_FONT = "Times-Bold"
-                print("Используется Times-Bold для заголовков")
-            else:
-                DesignConfig.TITLE_FONT = "Times-Bold"
-                print("Используется встроенный Times-Bold для заголовков")
-                
-        except Exception as e:
-            print(f"Ошибка настройки шрифтов: {e}")
-            # В случае ошибки используем встроенные шрифты
-            DesignConfig.TITLE_FONT = "Times-Bold"
-            DesignConfig.BODY_FONT = "Times-Roman"
-            DesignConfig.SMALL_FONT = "Times-Roman"
-            print("Используются встроенные шрифты Times")
+        """Настраивает шрифты с поддержкой кириллицы (регистрируются один раз на процесс)"""
+        font_set = get_font_set()
+        DesignConfig.TITLE_FONT = font_set.bold
+        DesignConfig.BODY_FONT = font_set.regular
+        DesignConfig.SMALL_FONT = font_set.regular
     
     def _add_chart_to_story(
         self,
         story,
-        chart_path: Path,
+        chart_path,
         styles,
         width: Optional[int] = None,
         height: Optional[int] = None,
     ):
-        """Добавляет диаграмму в документ с оптимизированными размерами"""
-        if chart_path.exists():
+        """Добавляет диаграмму (путь к PNG, BytesIO с PNG или Drawing) с оптимизированными размерами"""
+        if isinstance(chart_path, Drawing):
+            # Векторная диаграмма уже нарисована в нужном размере. Копия: одна диаграмма
+            # попадает в оба отчёта, а Platypus помечает flowable при переносе на новую страницу
+            drawing = copy.copy(chart_path)
+            drawing.hAlign = 'CENTER'
+            story.append(drawing)
+            story.append(Spacer(1, 3*mm))
+            return
+        in_memory = hasattr(chart_path, 'getvalue')
+        chart_name = getattr(chart_path, 'name', '') if in_memory else str(chart_path)
+        if in_memory or chart_path.exists():
             try:
                 # Специальные размеры для комбинированных диаграмм
-                if "paei_combined" in str(chart_path):
+                if "paei_combined" in chart_name:
                     chart_width = DesignConfig.PAEI_COMBINED_WIDTH
                     chart_height = DesignConfig.PAEI_COMBINED_HEIGHT
-                elif "disc_combined" in str(chart_path):
+                elif "disc_combined" in chart_name:
                     chart_width = DesignConfig.BAR_CHART_WIDTH
                     chart_height = DesignConfig.BAR_CHART_HEIGHT
                 # Используем стандартные размеры если не указаны явно
@@ -196,15 +504,17 @@ class EnhancedPDFReportV2:
                     chart_width = width
                     chart_height = height or DesignConfig.RADAR_SIZE
                     
-                # Конвертируем размеры в миллиметры
-                img = Image(str(chart_path), width=chart_width*mm, height=chart_height*mm)
+                # Конвертируем размеры в миллиметры. Буфер копируется: одна диаграмма
+                # может попасть в оба отчёта, а ReportLab читает поток при отрисовке
+                source = BytesIO(chart_path.getvalue()) if in_memory else str(chart_path)
+                img = Image(source, width=chart_width*mm, height=chart_height*mm)
                 img.hAlign = 'CENTER'
                 story.append(img)
                 story.append(Spacer(1, 3*mm))  # уменьшен с 5мм до 3мм
             except Exception as e:
                 print(f"Ошибка при добавлении диаграммы {chart_path}: {e}")
                 # Добавляем плейсхолдер
-                story.append(Paragraph(f"[Диаграмма: {chart_path.name}]", styles['Body']))
+                story.append(Paragraph(f"[Диаграмма: {Path(chart_name).name}]", styles['Body']))
                 story.append(Spacer(1, 3*mm))  # уменьшен с 5мм до 3мм
 
     def _create_doc_template(self, target) -> SimpleDocTemplate:
@@ -218,12 +528,9 @@ class EnhancedPDFReportV2:
             bottomMargin=DesignConfig.MARGIN * mm,
         )
 
-    def _count_story_pages(self, story) -> int:
-        """Подсчитывает итоговое количество страниц, не записывая файл на диск."""
-        temp_buffer = BytesIO()
-        temp_doc = self._create_doc_template(temp_buffer)
-        temp_doc.build(deepcopy(story))
-        return temp_doc.page
+    def _build_document(self, doc: SimpleDocTemplate, story) -> None:
+        """Верстает документ за один проход; "из N" проставляется при сохранении."""
+        doc.build(story, canvasmaker=partial(NumberedCanvas, page_decorator=self._draw_page_number))
 
     def _draw_page_number(self, canvas_obj, total_pages: int) -> None:
         """Рисует нумерацию страниц в формате 'Стр. X из N'."""
@@ -266,38 +573,37 @@ class EnhancedPDFReportV2:
                         f"Проанализируй результаты теста PAEI: {', '.join([f'{k}: {v}' for k, v in paei_scores.items()])}\n"
                         "Составь подробную интерпретацию в стиле психологического портрета, как в примерах, с выделением доминирующего стиля, сильных сторон, зон роста, рекомендаций и подходящих профессиональных ролей. Используй структуру и разметку, как в образцах."
                     )
-                    ai_result = ai.interpret_paei(paei_scores, dialog_context=user_prompt)
-                    print("\n===== AI PAEI INTERPRETATION (DEBUG) =====\n" + ai_result + "\n==========================================\n")
-                    interpretations['paei'] = ai_result
-                    
-                    # Soft Skills интерпретация с промптом soft_system_res.txt
-                    soft_skills_result = ai.interpret_soft_skills(soft_skills_scores)
-                    print("\n===== AI SOFT SKILLS INTERPRETATION (DEBUG) =====\n" + soft_skills_result + "\n===============================================\n")
-                    interpretations['soft_skills'] = soft_skills_result
-                    
-                    # HEXACO интерпретация с промптом hexaco_system_res.txt
-                    interpretations['hexaco'] = ai.interpret_hexaco(hexaco_scores)
-                    
-                    # DISC интерпретация с промптом disk_system_res.txt
-                    interpretations['disc'] = ai.interpret_disc(disc_scores)
-                    
-                    # ✨ НОВОЕ: Общее заключение с рекомендациями по команде с промптом general_system_res.txt
-                    all_scores = {
-                        'paei': paei_scores,
-                        'disc': disc_scores,
-                        'hexaco': hexaco_scores,
-                        'soft_skills': soft_skills_scores
-                    }
-                    general_result = ai.interpret_general_conclusion(all_scores)
-                    print("\n===== AI GENERAL INTERPRETATION WITH TEAM RECOMMENDATIONS (DEBUG) =====\n" + general_result + "\n========================================================================\n")
-                    interpretations['general'] = general_result
+                    # Все пять разделов запрашиваются параллельно с общим дедлайном
+                    interpretations = ai.interpret_all(
+                        paei_scores, disc_scores, hexaco_scores, soft_skills_scores,
+                        dialog_contexts={'paei': user_prompt}
+                    )
+                    for section, text in interpretations.items():
+                        print(f"\n===== AI {section.upper()} INTERPRETATION (DEBUG) =====\n" + text + "\n==========================================\n")
                     
-                    print("Динамические интерпретации сгенерированы успешно")
-                    return interpretations
+                    if all(interpretations.get(section) for section in INTERPRETATION_SECTIONS):
+                        print("Динамические интерпретации сгенерированы успешно")
+                        return interpretations
                     
             except Exception as e:
                 print(f"Ошибка AI интерпретации: {e}")
         
+        if interpretations:
+            # Часть разделов получена от AI - статикой дополняем только недостающие
+            missing_sections = [s for s in INTERPRETATION_SECTIONS if not interpretations.get(s)]
+            print(f"Статические интерпретации для разделов без ответа AI: {', '.join(missing_sections)}")
+            try:
+                fallback = generate_interpretations_from_prompt(
+                    paei_scores, disc_scores, hexaco_scores, soft_skills_scores
+                )
+                for section in missing_sections:
+                    interpretations[section] = fallback.get(section, '')
+            except Exception as e:
+                print(f"Ошибка статической интерпретации: {e}")
+                for section in missing_sections:
+                    interpretations[section] = ''
+            return interpretations
+        
         print("Используем статические интерпретации через generate_interpretations_from_prompt...")
         try:
             interpretations = generate_interpretations_from_prompt(
@@ -330,19 +636,19 @@ class EnhancedPDFReportV2:
         hexaco_scores: Dict[str, float],
         soft_skills_scores: Dict[str, float],
         ai_interpretations: Dict[str, str],
-        chart_paths: Dict[str, Path],
+        chart_paths: Dict[str, ChartSource],
         user_answers: Optional[Dict] = None,
     ):
         """Формирует последовательность элементов отчёта (story)."""
         styles = self._get_custom_styles()
+        template = self.template
         story = []
         
         # Форматируем AI интерпретации для улучшенного отображения
         formatted_interpretations = format_ai_interpretations(ai_interpretations)
 
         # === ЗАГОЛОВОК ДОКУМЕНТА ===
-        story.append(Paragraph("ОЦЕНКА КОМАНДНЫХ НАВЫКОВ", styles['MainTitle']))
-        story.append(Spacer(1, 1 * mm))
+        story.extend(template.section('title'))
 
         # === ИМЯ УЧАСТНИКА (ПО ЦЕНТРУ, уменьшенный шрифт) ===
         if participant_name.strip():
@@ -355,8 +661,7 @@ class EnhancedPDFReportV2:
         story.append(Spacer(1, 2 * mm))
 
         # === ОБЩЕЕ ЗАКЛЮЧЕНИЕ И РЕКОМЕНДАЦИИ ===
-        story.append(Paragraph("ОБЩЕЕ ЗАКЛЮЧЕНИЕ И РЕКОМЕНДАЦИИ", styles['SectionTitle']))
-        story.append(Spacer(1, 2 * mm))
+        story.extend(template.section('summary'))
 
         # Определяем доминирующие черты для заключения
         max_paei = max(paei_scores, key=lambda k: paei_scores[k])
@@ -378,10 +683,8 @@ class EnhancedPDFReportV2:
         story.append(Spacer(1, 3 * mm))  # уменьшен отступ с 5мм до 3мм
 
         # Сводка по ключевым характеристикам и методикам
-        story.append(Paragraph("<b>Ключевые характеристики профиля и использованные методики:</b>", styles['SubTitle']))
-
         # Результаты тестирования с детальным описанием методик
-        story.append(Paragraph("<b>Результаты тестирования:</b>", styles['Body']))
+        story.extend(template.section('summary_results'))
         bullet_items = [
             f"<b>Тест Адизеса (PAEI)</b> - оценка управленческих ролей и стилей руководства (5 вопросов по 4 типам). Преобладает роль {paei_names.get(max_paei, max_paei)} - {paei_scores[max_paei]} баллов",
             f"<b>Оценка Soft Skills</b> - анализ надпрофессиональных компетенций (10 вопросов по 5-балльной шкале). Наиболее развитый навык: {max_soft} - {soft_skills_scores[max_soft]} баллов",
@@ -393,13 +696,7 @@ class EnhancedPDFReportV2:
         story.append(Spacer(1, 2 * mm))  # уменьшен отступ с 6мм до 2мм
 
         # === 1. ТЕСТ АДИЗЕСА (PAEI) - переносим на первую страницу ===
-        story.append(Paragraph("1. ТЕСТ АДИЗЕСА (PAEI) - УПРАВЛЕНЧЕСКИЕ РОЛИ", styles['SectionTitle']))
-
-        test_description = "Тест Адизеса (PAEI) - оценка управленческих ролей и стилей руководства (5 вопросов по 4 типам)."
-        story.append(Paragraph(test_description, styles['Body']))
-        story.append(Spacer(1, 2 * mm))
-
-        story.append(Paragraph("<b>Расшифровка PAEI:</b>", styles['Body']))
+        story.extend(template.section('paei'))
         paei_bullets = [
             f"<b>P (Producer - Производитель)</b> - ориентация на результат, выполнение задач, достижение целей: {paei_scores.get('P', '')} баллов",
             f"<b>A (Administrator - Администратор)</b> - организация процессов, контроль, систематизация работы: {paei_scores.get('A', '')} баллов.",
@@ -415,7 +712,7 @@ class EnhancedPDFReportV2:
 
         # Добавляем интерпретацию PAEI
         if 'paei' in formatted_interpretations:
-            story.append(Paragraph("<b>Интерпретация:</b>", styles['SubTitle']))
+            story.append(template.paragraph("<b>Интерпретация:</b>", 'SubTitle'))
             story.append(Spacer(1, 1 * mm))
             
             paei_text = formatted_interpretations['paei'].replace('\n', '<br/>')
@@ -426,49 +723,19 @@ class EnhancedPDFReportV2:
         story.append(Spacer(1, 4 * mm))
 
         # === 2. SOFT SKILLS - МЯГКИЕ НАВЫКИ ===
-        story.append(Paragraph("2. SOFT SKILLS - ОЦЕНКА МЯГКИХ НАВЫКОВ", styles['SectionTitle']))
-
-        test_description = "Оценка Soft Skills - анализ надпрофессиональных компетенций (10 вопросов по 5-балльной шкале)."
-        story.append(Paragraph(test_description, styles['Body']))
-        story.append(Spacer(1, 2 * mm))
-
-        soft_description = """
-        <b>Soft Skills</b> - это надпрофессиональные навыки, которые помогают решать жизненные и рабочие задачи 
-        независимо от специальности. Включают коммуникативные способности, способность работать в команде, лидерские качества, критическое мышление,  
-        управление временем, стрессоустойчивость, восприятие критики (как элемент эмоционального интеллекта), адаптивность, 
-        способность решать проблемы, креативность. Эти навыки определяют эффективность взаимодействия с людьми и способность
-        к профессиональному росту в любой сфере деятельности.
-        """
-        story.append(Paragraph(soft_description, styles['Body']))
-        story.append(Spacer(1, 2 * mm))
+        story.extend(template.section('soft_skills'))
 
         if 'soft_skills' in chart_paths:
             self._add_chart_to_story(story, chart_paths['soft_skills'], styles)
 
         if 'soft_skills' in formatted_interpretations:
-            story.append(Paragraph("<b>Интерпретация Soft Skills:</b>", styles['SubTitle']))
+            story.append(template.paragraph("<b>Интерпретация Soft Skills:</b>", 'SubTitle'))
             soft_text = formatted_interpretations['soft_skills'].replace('\n', '<br/>')
             story.append(Paragraph(soft_text, styles['Body']))
             story.append(Spacer(1, 2 * mm))
 
         # === 3. ТЕСТ HEXACO - ЛИЧНОСТНЫЕ ЧЕРТЫ ===
-        story.append(Paragraph("3. ТЕСТ HEXACO - МОДЕЛЬ ЛИЧНОСТИ", styles['SectionTitle']))
-
-        test_description = "HEXACO - современная шестифакторная модель личности (10 вопросов по 5-балльной шкале)."
-        story.append(Paragraph(test_description, styles['Body']))
-        story.append(Spacer(1, 3 * mm))
-
-        hexaco_description = """
-        <b>Основные измерения HEXACO:</b><br/>
-        • <b>H (Honesty-Humility)</b> - честность, скромность, искренность в отношениях<br/>
-        • <b>E (Emotionality)</b> - эмоциональность, чувствительность, эмпатия<br/>
-        • <b>X (eXtraversion)</b> - экстраверсия, социальная активность, общительность<br/>
-        • <b>A (Agreeableness)</b> - доброжелательность, сотрудничество, терпимость<br/>
-        • <b>C (Conscientiousness)</b> - добросовестность, организованность, дисциплина<br/>
-        • <b>O (Openness)</b> - открытость опыту, креативность, любознательность
-        """
-        story.append(Paragraph(hexaco_description, styles['Body']))
-        story.append(Spacer(1, 5 * mm))
+        story.extend(template.section('hexaco'))
 
         if 'hexaco' in chart_paths:
             self._add_chart_to_story(story, chart_paths['hexaco'], styles)
@@ -478,7 +745,7 @@ class EnhancedPDFReportV2:
             hexaco_sections = parse_hexaco_sections(formatted_interpretations['hexaco'])
             
             if hexaco_sections:
-                story.append(Paragraph("<b>Интерпретация HEXACO:</b>", styles['SubTitle']))
+                story.append(template.paragraph("<b>Интерпретация HEXACO:</b>", 'SubTitle'))
                 
                 # Добавляем качества HEXACO по отдельности
                 hexaco_qualities = [
@@ -546,33 +813,19 @@ class EnhancedPDFReportV2:
                     story.append(Paragraph(clean_recommendations, styles['Body']))
             else:
                 # Fallback к стандартному форматированию
-                story.append(Paragraph("<b>Интерпретация:</b>", styles['SubTitle']))
+                story.append(template.paragraph("<b>Интерпретация:</b>", 'SubTitle'))
                 clean_text = formatted_interpretations['hexaco'].replace('\n', '<br/>')
                 story.append(Paragraph(clean_text, styles['Body']))
         story.append(Spacer(1, 2 * mm))
 
         # === 4. ТЕСТ DISC - ПОВЕДЕНЧЕСКИЕ СТИЛИ ===
-        story.append(Paragraph("4. ТЕСТ DISC - МОДЕЛЬ ПОВЕДЕНИЯ", styles['SectionTitle']))
-
-        test_description = "DISC - методика оценки поведенческих особенностей и стилей (8 вопросов по 4 типам)."
-        story.append(Paragraph(test_description, styles['Body']))
-        story.append(Spacer(1, 3 * mm))
-
-        disc_description = """
-        <b>DISC</b> - методика оценки поведенческих особенностей и стилей общения:<br/>
-        • <b>D (Dominance)</b> - доминирование, прямота, решительность, ориентация на результат<br/>
-        • <b>I (Influence)</b> - влияние, общительность, оптимизм, ориентация на людей<br/>
-        • <b>S (Steadiness)</b> - постоянство, терпение, командная работа, стабильность<br/>
-        • <b>C (Compliance)</b> - соответствие стандартам, аналитичность, точность, осторожность
-        """
-        story.append(Paragraph(disc_description, styles['Body']))
-        story.append(Spacer(1, 5 * mm))
+        story.extend(template.section('disc'))
 
         if 'disc' in chart_paths:
             self._add_chart_to_story(story, chart_paths['disc'], styles)
 
         if 'disc' in formatted_interpretations:
-            story.append(Paragraph("<b>Интерпретация DISC:</b>", styles['SubTitle']))
+            story.append(template.paragraph("<b>Интерпретация DISC:</b>", 'SubTitle'))
             # Выводим всю DISC интерпретацию целиком без разбиения на секции
             disc_text = formatted_interpretations['disc'].replace('\n', '<br/>')
             story.append(Paragraph(disc_text, styles['Body']))
@@ -581,32 +834,18 @@ class EnhancedPDFReportV2:
 
         # === РЕКОМЕНДАЦИИ ПО ПРОФЕССИОНАЛЬНОМУ РАЗВИТИЮ (В КОНЦЕ ОТЧЕТА) ===
         story.append(PageBreak())
-        story.append(Paragraph("РЕКОМЕНДАЦИИ ПО ПРОФЕССИОНАЛЬНОМУ РАЗВИТИЮ", styles['SectionTitle']))
-        story.append(Spacer(1, 2 * mm))
-
         # 1. Использование сильных сторон
-        story.append(Paragraph("<b>1. Использование сильных сторон:</b>", styles['SubTitle']))
+        story.extend(template.section('recommendations'))
         story.append(Paragraph(f"• (PAEI): Делегировать задачи, соответствующие профилю {paei_names.get(max_paei, max_paei)}", styles['ListWithIndent']))
         story.append(Paragraph(f"• (Soft Skills): Развивать {max_soft.lower()} через специализированные проекты", styles['ListWithIndent']))
         story.append(Paragraph(f"• (DISC): Использовать {disc_names.get(max_disc, max_disc)} в командном взаимодействии", styles['ListWithIndent']))
         story.append(Spacer(1, 2 * mm))
 
-        # 2. Области для развития
-        story.append(Paragraph("<b>2. Области для развития:</b>", styles['SubTitle']))
-        story.append(Paragraph("• (PAEI): Работать над менее выраженными управленческими ролями", styles['ListWithIndent']))
-        story.append(Paragraph("• (Soft Skills): Развивать дополнительные soft skills для универсальности [поиск курсов в Google]", styles['ListWithIndent']))
-        story.append(Paragraph("• (DISC): Балансировать поведенческий стиль в зависимости от ситуации", styles['ListWithIndent']))
-        story.append(Spacer(1, 2 * mm))
-
-        # 3. Карьерные перспективы
-        story.append(Paragraph("<b>3. Карьерные перспективы:</b>", styles['SubTitle']))
+        # 2. Области для развития, 3. Карьерные перспективы
+        story.extend(template.section('development_areas'))
         story.append(Paragraph(f"• (PAEI): Рассмотреть позиции, требующие качеств {paei_names.get(max_paei, max_paei)}", styles['ListWithIndent']))
-        story.append(Paragraph("• (HEXACO): Планировать развитие с учетом личностного профиля HEXACO", styles['ListWithIndent']))
-        story.append(Paragraph("• (DISC): Выстраивать команду с учетом комплементарных ролей по DISC", styles['ListWithIndent']))
-        story.append(Spacer(1, 2 * mm))
-
         # 4. Рекомендации по подбору команды
-        story.append(Paragraph("<b>4. Рекомендации по подбору кандидатов в свою команду:</b>", styles['SubTitle']))
+        story.extend(template.section('career_static'))
         
         if 'general' in ai_interpretations and ai_interpretations['general']:
             # Ищем в общей интерпретации раздел с рекомендациями по команде
@@ -648,16 +887,13 @@ class EnhancedPDFReportV2:
                 
                 # Если не нашли специальный раздел, добавляем общие рекомендации
                 if not team_recommendations_found:
-                    story.append(Paragraph("• Добавлять специалистов с высокими показателями в производительности (P) и интеграции (I) для баланса", styles['ListWithIndent']))
-                    story.append(Paragraph("• Искать кандидатов с сильными производственными и интеграционными ролями для создания полноценной управленческой команды", styles['ListWithIndent']))
+                    story.extend(template.section('team_fallback'))
             else:
                 # Fallback рекомендации по команде
-                story.append(Paragraph("• Добавлять специалистов с высокими показателями в производительности (P) и интеграции (I) для баланса", styles['ListWithIndent']))
-                story.append(Paragraph("• Искать кандидатов с сильными производственными и интеграционными ролями для создания полноценной управленческой команды", styles['ListWithIndent']))
+                story.extend(template.section('team_fallback'))
         else:
             # Fallback если нет AI интерпретации
-            story.append(Paragraph("• Добавлять специалистов с высокими показателями в производительности (P) и интеграции (I) для баланса", styles['ListWithIndent']))
-            story.append(Paragraph("• Искать кандидатов с сильными производственными и интеграционными ролями для создания полноценной управленческой команды", styles['ListWithIndent']))
+            story.extend(template.section('team_fallback'))
         
         story.append(Spacer(1, 6 * mm))
 
@@ -690,8 +926,20 @@ class EnhancedPDFReportV2:
                                soft_skills_scores: Dict[str, float],
                                ai_interpretations: Optional[Dict[str, str]],
                                out_path: Path,
-                               user_answers: Optional[Dict] = None) -> Tuple[Path, Optional[str]]:
-        """Генерирует улучшенный PDF отчёт с детальными описаниями"""
+                               user_answers: Optional[Dict] = None,
+                               chart_paths: Optional[Dict[str, ChartSource]] = None,
+                               in_memory_charts: bool = False) -> Tuple[Path, Optional[str]]:
+        """
+        Генерирует улучшенный PDF отчёт с детальными описаниями
+
+        Args:
+            out_path: Путь к PDF или бинарный поток (BytesIO) для отчёта в памяти
+            chart_paths: Готовый набор диаграмм от _create_all_charts (пути к PNG, BytesIO
+                или Drawing). Если передан, диаграммы не перерисовываются
+                (один набор на сессию для обоих отчётов)
+            in_memory_charts: Рисовать диаграммы в память, без PNG в template_dir
+                (без template_dir PNG пишутся во временную папку отчёта и удаляются после сборки)
+        """
         prepared_interpretations = dict(ai_interpretations or {})
         expected_keys = {'paei', 'disc', 'hexaco', 'soft_skills', 'general'}
         missing_keys = expected_keys - set(prepared_interpretations)
@@ -701,158 +949,115 @@ class EnhancedPDFReportV2:
             )
             prepared_interpretations = {**generated, **prepared_interpretations}
 
-        chart_paths = self._create_all_charts(
-            paei_scores,
-            disc_scores,
-            hexaco_scores,
-            soft_skills_scores,
-        )
-
-        story = self._build_story(
-            participant_name,
-            test_date,
-            paei_scores,
-            disc_scores,
-            hexaco_scores,
-            soft_skills_scores,
-            prepared_interpretations,
-            chart_paths,
-            user_answers,
-        )
-
-        total_pages = self._count_story_pages(story)
-        doc = self._create_doc_template(str(out_path))
+        # PNG диаграмм нужны до конца сборки PDF - рабочее место закрывается после неё
+        with self.render_workspace(in_memory=in_memory_charts) as workspace:
+            if chart_paths is None:
+                chart_paths = self._create_all_charts(
+                    paei_scores,
+                    disc_scores,
+                    hexaco_scores,
+                    soft_skills_scores,
+                    workspace=workspace,
+                )
 
-        def _draw_page(canvas_obj, _doc):
-            self._draw_page_number(canvas_obj, total_pages)
+            story = self._build_story(
+                participant_name,
+                test_date,
+                paei_scores,
+                disc_scores,
+                hexaco_scores,
+                soft_skills_scores,
+                prepared_interpretations,
+                chart_paths,
+                user_answers,
+            )
 
-        doc.build(story, onFirstPage=_draw_page, onLaterPages=_draw_page)
+            target = out_path if hasattr(out_path, 'write') else str(out_path)
+            self._build_document(self._create_doc_template(target), story)
         return out_path, None
     
     def _create_all_charts(self, paei_scores: Dict, disc_scores: Dict, 
-                         hexaco_scores: Dict, soft_skills_scores: Dict) -> Dict[str, Path]:
-        """Создаёт все радарные диаграммы для отчета"""
-        charts = {}
-        
-        # PAEI диаграмма (комбинированная - столбиковая + круговая)
-        paei_labels = list(paei_scores.keys())
-        paei_values = list(paei_scores.values())
-        paei_path = self.template_dir / "paei_combined.png"
-        EnhancedCharts.create_paei_combined_chart(paei_labels, paei_values, 
-                                                "PAEI (Адизес) - Управленческие роли", paei_path)
-        charts['paei'] = paei_path
-        
-        # Soft Skills диаграмма (радарная)
-        # Жёстко задаём порядок и названия soft skills для диаграммы, чтобы совпадало с skills_mapping
-        soft_labels = [
-            "Коммуникация",
-            "Работа в команде",
-            "Лидерство",
-            "Критическое мышление",
-            "Управление временем",
-            "Стрессоустойчивость",
-            "Восприимчивость к критике",
-            "Адаптивность",
-            "Решение проблем",
-            "Креативность"
-        ]
-        soft_values = list(soft_skills_scores.values())
-        soft_radar_path = self.template_dir / "soft_skills_radar.png"
-        EnhancedCharts.create_minimalist_radar(soft_labels, soft_values,
-                                             "Soft Skills", soft_radar_path)
-        charts['soft_skills'] = soft_radar_path
-        
-        # HEXACO диаграмма (радарная с расшифровками)
-        hexaco_labels = list(hexaco_scores.keys())
-        hexaco_values = list(hexaco_scores.values())
-        hexaco_path = self.template_dir / "hexaco_radar.png"
-        EnhancedCharts.create_hexaco_radar(hexaco_labels, hexaco_values,
-                                         "HEXACO", hexaco_path)
-        charts['hexaco'] = hexaco_path
-        
-        # DISC диаграмма (комбинированная - столбиковая + круговая)  
-        disc_labels = list(disc_scores.keys())
-        disc_values = list(disc_scores.values())
-        disc_path = self.template_dir / "disc_combined.png"
-        EnhancedCharts.create_disc_combined_chart(disc_labels, disc_values,
-                                                "DISC - Поведенческие стили", disc_path)
-        charts['disc'] = disc_path
-        
+                         hexaco_scores: Dict, soft_skills_scores: Dict,
+                         in_memory: bool = False,
+                         workspace: Optional[RenderWorkspace] = None) -> Dict[str, ChartSource]:
+        """
+        Создаёт все радарные диаграммы для отчета
+
+        Args:
+            in_memory: Вернуть PNG в BytesIO (с именем файла в .name) вместо файлов в template_dir
+                (векторный бэкенд всегда рисует в память)
+            workspace: Рабочее место отчёта, куда пишутся PNG (и которое их удалит).
+                Без него и без template_dir диаграммы рисуются в память
+
+        Returns:
+            Словарь диаграмм: пути к PNG, BytesIO с PNG (в памяти) или Drawing (векторный бэкенд)
+        """
+        if self.chart_backend == "vector":
+            return self._create_vector_charts(paei_scores, disc_scores, hexaco_scores, soft_skills_scores)
+
+        if workspace is None:
+            workspace = self.render_workspace(in_memory=in_memory or self.template_dir is None)
+
+        def target(file_name: str):
+            return workspace.target(file_name)
+
+        def named(chart, file_name: str):
+            if workspace.in_memory:
+                chart.name = file_name
+            return chart
+
+        # Ключ -> (функция, метки, значения, заголовок, файл). Растровые диаграммы
+        # рисуются без pyplot на своих Figure, поэтому независимы и могут строиться в потоках
+        jobs = {
+            # PAEI диаграмма (комбинированная - столбиковая + круговая)
+            'paei': (EnhancedCharts.create_paei_combined_chart, list(paei_scores.keys()),
+                     list(paei_scores.values()), "PAEI (Адизес) - Управленческие роли", "paei_combined.png"),
+            # Soft Skills диаграмма (радарная)
+            'soft_skills': (EnhancedCharts.create_minimalist_radar, SOFT_SKILLS_CHART_LABELS,
+                            list(soft_skills_scores.values()), "Soft Skills", "soft_skills_radar.png"),
+            # HEXACO диаграмма (радарная с расшифровками)
+            'hexaco': (EnhancedCharts.create_hexaco_radar, list(hexaco_scores.keys()),
+                       list(hexaco_scores.values()), "HEXACO", "hexaco_radar.png"),
+            # DISC диаграмма (комбинированная - столбиковая + круговая)
+            'disc': (EnhancedCharts.create_disc_combined_chart, list(disc_scores.keys()),
+                     list(disc_scores.values()), "DISC - Поведенческие стили", "disc_combined.png"),
+        }
+
+        def render(job) -> object:
+            make_chart, labels, values, title, file_name = job
+            return named(make_chart(labels, values, title, target(file_name)), file_name)
+
+        threads = min(chart_threads(), len(jobs))
+        if threads == 1:
+            return {key: render(job) for key, job in jobs.items()}
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="charts") as executor:
+            futures = {key: executor.submit(render, job) for key, job in jobs.items()}
+            charts = {key: future.result() for key, future in futures.items()}
         return charts
+
+    def _create_vector_charts(self, paei_scores: Dict, disc_scores: Dict,
+                              hexaco_scores: Dict, soft_skills_scores: Dict) -> Dict[str, Drawing]:
+        """Рисует те же диаграммы как Drawing ReportLab в размерах, которые занимают PNG в отчёте"""
+        from src.psytest.vector_charts import draw_disc_bars, draw_hexaco_radar, draw_paei_pie, draw_radar
+
+        radar_size = DesignConfig.RADAR_SIZE * mm
+        return {
+            'paei': draw_paei_pie(list(paei_scores.keys()), list(paei_scores.values()),
+                                  DesignConfig.PAEI_COMBINED_WIDTH * mm, DesignConfig.PAEI_COMBINED_HEIGHT * mm,
+                                  title="PAEI (Адизес) - Управленческие роли"),
+            'soft_skills': draw_radar(SOFT_SKILLS_CHART_LABELS, list(soft_skills_scores.values()),
+                                      radar_size, radar_size, title="Soft Skills", max_value=5),
+            'hexaco': draw_hexaco_radar(list(hexaco_scores.keys()), list(hexaco_scores.values()),
+                                        radar_size, radar_size, title="HEXACO", max_value=5),
+            'disc': draw_disc_bars(list(disc_scores.keys()), list(disc_scores.values()),
+                                   DesignConfig.BAR_CHART_WIDTH * mm, DesignConfig.BAR_CHART_HEIGHT * mm,
+                                   title="DISC - Поведенческие стили"),
+        }
     
     def _get_custom_styles(self):
-        """Создаёт пользовательские стили"""
-        styles = getSampleStyleSheet()
-        
-        # Основной заголовок
-        styles.add(ParagraphStyle(
-            name='MainTitle',
-            parent=styles['Title'],
-            fontSize=DesignConfig.TITLE_SIZE,
-            fontName=DesignConfig.TITLE_FONT,
-            textColor=DesignConfig.PRIMARY_COLOR,
-            alignment=1,  # CENTER
-            spaceAfter=6,
-        ))
-        
-        # Заголовок секции
-        styles.add(ParagraphStyle(
-            name='SectionTitle',
-            parent=styles['Heading2'],
-            fontSize=12,
-            fontName=DesignConfig.TITLE_FONT,
-            textColor=DesignConfig.PRIMARY_COLOR,
-            spaceBefore=6,
-            spaceAfter=3,
-        ))
-        
-        # Подзаголовок
-        styles.add(ParagraphStyle(
-            name='SubTitle',
-            parent=styles['Heading3'],
-            fontSize=11,
-            fontName=DesignConfig.TITLE_FONT,
-            textColor=DesignConfig.PRIMARY_COLOR,
-            spaceBefore=4,
-            spaceAfter=2,
-        ))
-        
-        # Основной текст
-        styles.add(ParagraphStyle(
-            name='Body',
-            parent=styles['Normal'],
-            fontSize=DesignConfig.BODY_SIZE,
-            fontName=DesignConfig.BODY_FONT,
-            textColor=DesignConfig.TEXT_COLOR,
-            spaceAfter=4,
-            leading=14,  # было 12, увеличено для лучшей читаемости
-        ))
-        
-        # Имя участника (увеличенный шрифт, по центру)
-        styles.add(ParagraphStyle(
-            name='ParticipantName',
-            parent=styles['Normal'],
-            fontSize=12,  # уменьшенный шрифт
-            fontName=DesignConfig.TITLE_FONT,
-            textColor=DesignConfig.PRIMARY_COLOR,
-            alignment=1,  # CENTER
-            spaceAfter=1,
-            spaceBefore=1,
-        ))
-        
-        # Стиль для списков с отступом (как на скриншоте)
-        styles.add(ParagraphStyle(
-            name='ListWithIndent',
-            parent=styles['Normal'],
-            fontSize=DesignConfig.BODY_SIZE,
-            fontName=DesignConfig.BODY_FONT,
-            textColor=DesignConfig.TEXT_COLOR,
-            leftIndent=15,  # отступ слева для элементов списка
-            spaceAfter=2,
-            leading=14,
-        ))
-        
-        return styles
+        """Стили отчёта (общие для процесса, см. ReportTemplate)"""
+        return self.template.styles
     
     def _format_scores(self, scores: Dict[str, float]) -> str:
         """Форматирует результаты в читаемую строку"""
@@ -906,7 +1111,8 @@ class EnhancedPDFReportV2:
                                            ai_interpretations: Dict[str, str],
                                            out_path: Path,
                                            upload_to_gdrive: bool = True,
-                                           user_answers: Optional[Dict] = None) -> Tuple[Path, Optional[str]]:
+                                           user_answers: Optional[Dict] = None,
+                                           chart_paths: Optional[Dict[str, ChartSource]] = None) -> Tuple[Path, Optional[str]]:
         """
         Генерирует PDF отчёт и загружает в Google Drive
         
@@ -916,7 +1122,8 @@ class EnhancedPDFReportV2:
         # Генерируем обычный отчет
         pdf_result = self.generate_enhanced_report(
             participant_name, test_date, paei_scores, disc_scores,
-            hexaco_scores, soft_skills_scores, ai_interpretations, out_path, user_answers
+            hexaco_scores, soft_skills_scores, ai_interpretations, out_path, user_answers,
+            chart_paths=chart_paths
         )
         
         # Распаковываем результат
@@ -924,7 +1131,7 @@ class EnhancedPDFReportV2:
         
         # Загружаем в Google Drive если нужно и еще не загружен
         gdrive_link = existing_gdrive_link
-        if upload_to_gdrive and not existing_gdrive_link:
+        if upload_to_gdrive and not existing_gdrive_link and not hasattr(pdf_path, 'write'):
             gdrive_link = self.upload_to_google_drive(pdf_path, participant_name)
         
         return pdf_path, gdrive_link
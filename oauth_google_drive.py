@@ -1,57 +1,269 @@
 """
 Альтернативная реализация Google Drive интеграции с OAuth
+
+DriveClient живет весь процесс: токены читаются из token.json один раз и
+обновляются заранее (до истечения), сервис Drive и его HTTP соединение
+создаются один раз, а ID папок год/месяц запоминаются. В установившемся
+режиме загрузка отчета - один запрос к API.
 """
 
 import os
 import json
+import threading
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
-def setup_oauth_google_drive():
-    """Настраивает OAuth аутентификацию для Google Drive"""
-    
-    try:
+SCOPES = ['https://www.googleapis.com/auth/drive.file']
+DEFAULT_FOLDER_ID = "1Z77eo09GmcLuhsDGlb17E86vfb2p3jEM"
+
+# Токен обновляется, если до истечения осталось меньше (секунд)
+TOKEN_REFRESH_MARGIN = 300
+
+# Размер части возобновляемой загрузки (кратен 256 КБ)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class DriveClient:
+    """Долгоживущий клиент Google Drive: кэш токенов, сервиса и ID папок"""
+
+    def __init__(self, token_file: str = 'token.json', credentials_file: str = 'oauth_credentials.json',
+                 service=None, refresh_margin: int = TOKEN_REFRESH_MARGIN,
+                 api_endpoint: Optional[str] = None):
+        """
+        Args:
+            token_file: Файл с сохраненными OAuth токенами
+            credentials_file: OAuth credentials из Google Cloud Console
+            service: Готовый сервис Drive (для тестов; токены тогда не используются)
+            refresh_margin: За сколько секунд до истечения обновлять токен
+            api_endpoint: Другой адрес Drive API (локальный fake-сервер для тестов)
+        """
+        self.token_file = token_file
+        self.credentials_file = credentials_file
+        self.refresh_margin = refresh_margin
+        self.api_endpoint = api_endpoint or os.getenv('GDRIVE_API_ENDPOINT') or None
+        # httplib2 соединение сервиса не потокобезопасно - запросы идут под блокировкой
+        self._lock = threading.RLock()
+        self._creds = None
+        self._service = service
+        self._external_service = service is not None
+        # (базовая папка, год, месяц) -> ID папки; для папки без структуры год/месяц - (имя, None, None)
+        self._folders: Dict[Tuple[str, Optional[int], Optional[int]], str] = {}
+        self._folders_month: Optional[Tuple[int, int]] = None
+
+    # --- Авторизация ---
+
+    def _token_expiring(self) -> bool:
+        creds = self._creds
+        if creds is None or not creds.valid:
+            return True
+        # expiry в google-auth - наивное UTC время
+        return bool(creds.expiry) and creds.expiry - datetime.utcnow() < timedelta(seconds=self.refresh_margin)
+
+    def _authorize(self):
+        """Загружает токены при первом обращении и обновляет их до истечения"""
         from google.auth.transport.requests import Request
         from google.oauth2.credentials import Credentials
         from google_auth_oauthlib.flow import InstalledAppFlow
-        from googleapiclient.discovery import build
-        from googleapiclient.http import MediaFileUpload
-        
-        SCOPES = ['https://www.googleapis.com/auth/drive.file']
-        
-        creds = None
-        token_file = 'token.json'
-        credentials_file = 'oauth_credentials.json'
-        
-        # Загружаем существующие токены
-        if os.path.exists(token_file):
-            creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-        
-        # Если нет валидных токенов, запускаем OAuth flow
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(credentials_file):
-                    print(f"❌ Файл {credentials_file} не найден!")
-                    print("📖 Создайте OAuth credentials в Google Cloud Console")
+
+        if self._creds is None and os.path.exists(self.token_file):
+            self._creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+            if not self._token_expiring():
+                return self._creds
+
+        creds = self._creds
+        if creds and creds.refresh_token:
+            creds.refresh(Request())
+            print("🔑 OAuth токен Google Drive обновлен")
+        else:
+            if not os.path.exists(self.credentials_file):
+                print(f"❌ Файл {self.credentials_file} не найден!")
+                print("📖 Создайте OAuth credentials в Google Cloud Console")
+                return None
+
+            flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, SCOPES)
+            creds = flow.run_local_server(port=0)
+            self._creds = creds
+
+        # Сохраняем токены для будущего использования (только когда они изменились)
+        with open(self.token_file, 'w') as token:
+            token.write(creds.to_json())
+        return creds
+
+    @property
+    def service(self):
+        """Сервис Drive API (создается один раз, токен обновляется на месте)"""
+        with self._lock:
+            if self._external_service:
+                return self._service
+            if self._token_expiring():
+                try:
+                    if not self._authorize():
+                        return None
+                except Exception as e:
+                    print(f"❌ Ошибка инициализации OAuth: {e}")
                     return None
-                    
-                flow = InstalledAppFlow.from_client_secrets_file(credentials_file, SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            # Сохраняем токены для будущего использования
-            with open(token_file, 'w') as token:
-                token.write(creds.to_json())
-        
-        service = build('drive', 'v3', credentials=creds)
-        print("✅ OAuth Google Drive API инициализирован")
-        return service
-        
-    except Exception as e:
-        print(f"❌ Ошибка инициализации OAuth: {e}")
-        return None
+            if self._service is None:
+                from googleapiclient.discovery import build
+
+                # Сервис держит AuthorizedHttp с теми же credentials: обновленный
+                # токен подхватывается без пересоздания сервиса и соединения
+                client_options = {'api_endpoint': self.api_endpoint} if self.api_endpoint else None
+                self._service = build('drive', 'v3', credentials=self._creds, cache_discovery=False,
+                                      client_options=client_options)
+                print("✅ OAuth Google Drive API инициализирован")
+            return self._service
+
+    # --- Папки ---
+
+    def invalidate_folders(self) -> None:
+        """Сбрасывает запомненные ID папок (например, если папку удалили)"""
+        with self._lock:
+            self._folders.clear()
+            self._folders_month = None
+
+    def monthly_folder(self, year: int, month: int, base_folder_id: Optional[str] = None,
+                       base_folder_name: str = "PsychTest Reports") -> Optional[str]:
+        """ID папки месяца (base / год / месяц), с запоминанием до смены месяца"""
+        with self._lock:
+            if self._folders_month != (year, month):
+                # Новый месяц: папки прошлого месяца больше не нужны
+                self._folders = {key: value for key, value in self._folders.items() if key[1] is None}
+                self._folders_month = (year, month)
+
+            key = (base_folder_id or base_folder_name, year, month)
+            folder_id = self._folders.get(key)
+            if folder_id is None:
+                service = self.service
+                if not service:
+                    return None
+                folder_id = create_monthly_folder_structure(service, year, month, base_folder_id, base_folder_name)
+                if folder_id:
+                    self._folders[key] = folder_id
+            return folder_id
+
+    def named_folder(self, folder_name: str) -> Optional[str]:
+        """ID папки по имени (создается, если не найдена)"""
+        with self._lock:
+            key = (folder_name, None, None)
+            folder_id = self._folders.get(key)
+            if folder_id is None:
+                service = self.service
+                if not service:
+                    return None
+                query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder'"
+                results = service.files().list(q=query, fields="files(id, name)").execute()
+                folders = results.get('files', [])
+
+                if folders:
+                    folder_id = folders[0]['id']
+                    print(f"📁 Найдена папка: {folder_name}")
+                else:
+                    # Создаем папку
+                    folder_metadata = {
+                        'name': folder_name,
+                        'mimeType': 'application/vnd.google-apps.folder'
+                    }
+                    folder = service.files().create(body=folder_metadata).execute()
+                    folder_id = folder.get('id')
+                    print(f"📁 Создана папка: {folder_name}")
+                self._folders[key] = folder_id
+            return folder_id
+
+    def resolve_folder(self, folder_name: str = "PsychTest Reports", folder_id: Optional[str] = DEFAULT_FOLDER_ID,
+                       use_monthly_structure: bool = False) -> Optional[str]:
+        """Папка для загрузки по тем же правилам, что и upload_to_google_drive_oauth"""
+        if use_monthly_structure:
+            now = datetime.now()
+            monthly_folder_id = self.monthly_folder(now.year, now.month, folder_id, folder_name)
+            if monthly_folder_id or not folder_id:
+                return monthly_folder_id
+            print("❌ Не удалось создать месячную структуру, используем базовую папку")
+            return folder_id
+        if folder_id:
+            return folder_id
+        return self.named_folder(folder_name)
+
+    # --- Загрузка ---
+
+    def upload(self, file_path: str, folder_name: str = "PsychTest Reports",
+               folder_id: Optional[str] = DEFAULT_FOLDER_ID, use_monthly_structure: bool = False,
+               mimetype: str = 'application/pdf', file_name: Optional[str] = None,
+               resumable: bool = True) -> Optional[str]:
+        """
+        Загружает файл и возвращает ссылку для просмотра
+
+        Возвращает None, если нет доступа к Drive или папке; ошибки API
+        пробрасываются (очередь загрузок повторяет их с задержкой).
+        Возобновляемая загрузка идет частями: оборвавшаяся часть повторяется,
+        а не весь файл.
+        """
+        from googleapiclient.http import MediaFileUpload
+
+        with self._lock:
+            service = self.service
+            if not service:
+                return None
+            target_folder_id = self.resolve_folder(folder_name, folder_id, use_monthly_structure)
+            if not target_folder_id:
+                return None
+
+            file_name = file_name or os.path.basename(file_path)
+            file_metadata = {
+                'name': file_name,
+                'parents': [target_folder_id]
+            }
+            for attempt in range(2):
+                media = MediaFileUpload(file_path, mimetype=mimetype, resumable=resumable,
+                                        chunksize=UPLOAD_CHUNK_SIZE)
+                try:
+                    request = service.files().create(
+                        body=file_metadata,
+                        media_body=media,
+                        fields='id,webViewLink'
+                    )
+                    if resumable:
+                        file = None
+                        while file is None:
+                            _, file = request.next_chunk(num_retries=3)
+                    else:
+                        file = request.execute()
+                    break
+                except Exception as e:
+                    status = getattr(getattr(e, 'resp', None), 'status', None)
+                    if attempt == 0 and status == 404 and self._folders:
+                        # Запомненную папку удалили в Drive - находим/создаем заново
+                        print("⚠️ Папка Google Drive не найдена, обновляем кэш папок")
+                        self.invalidate_folders()
+                        target_folder_id = self.resolve_folder(folder_name, folder_id, use_monthly_structure)
+                        if not target_folder_id:
+                            return None
+                        file_metadata['parents'] = [target_folder_id]
+                        continue
+                    raise
+
+        web_link = file.get('webViewLink')
+        print(f"📤 Файл загружен: {file_name}")
+        print(f"🔗 Ссылка: {web_link}")
+        return web_link
+
+
+_drive_client: Optional[DriveClient] = None
+_drive_client_lock = threading.Lock()
+
+
+def get_drive_client() -> DriveClient:
+    """Возвращает общий для процесса клиент Google Drive"""
+    global _drive_client
+    with _drive_client_lock:
+        if _drive_client is None:
+            _drive_client = DriveClient()
+        return _drive_client
+
+
+def setup_oauth_google_drive():
+    """Настраивает OAuth аутентификацию для Google Drive (сервис общего клиента)"""
+    return get_drive_client().service
 
 def create_monthly_folder_structure(service, year: int, month: int, base_folder_id: str = None, base_folder_name: str = "PsychTest Reports") -> Optional[str]:
     """Создает структуру папок: базовая_папка / 2025 / 10-October
@@ -143,7 +355,7 @@ def create_monthly_folder_structure(service, year: int, month: int, base_folder_
         print(f"❌ Ошибка создания структуры папок: {e}")
         return None
 
-def upload_to_google_drive_oauth(file_path: str, folder_name: str = "PsychTest Reports", folder_id: str = "1Z77eo09GmcLuhsDGlb17E86vfb2p3jEM", use_monthly_structure: bool = False) -> Optional[str]:
+def upload_to_google_drive_oauth(file_path: str, folder_name: str = "PsychTest Reports", folder_id: str = DEFAULT_FOLDER_ID, use_monthly_structure: bool = False) -> Optional[str]:
     """Загружает файл в Google Drive используя OAuth
     
     Args:
@@ -152,81 +364,10 @@ def upload_to_google_drive_oauth(file_path: str, folder_name: str = "PsychTest R
         folder_id: Конкретный ID базовой папки Google Drive (внутри создается структура год/месяц)
         use_monthly_structure: Использовать ли месячную структуру папок (год/месяц)
     """
-    
-    service = setup_oauth_google_drive()
-    if not service:
-        return None
-    
     try:
-        from googleapiclient.http import MediaFileUpload
-        from googleapiclient.errors import HttpError
-        import datetime
-        
-        # Если указан конкретный ID папки и нужна месячная структура
-        if folder_id and use_monthly_structure:
-            # Создаем месячную структуру внутри указанной папки
-            now = datetime.datetime.now()
-            monthly_folder_id = create_monthly_folder_structure(service, now.year, now.month, folder_id, folder_name)
-            if monthly_folder_id:
-                folder_id = monthly_folder_id
-            else:
-                print("❌ Не удалось создать месячную структуру, используем базовую папку")
-                print(f"📁 Используется базовая папка с ID: {folder_id}")
-        elif folder_id:
-            print(f"📁 Используется указанная папка с ID: {folder_id}")
-        elif use_monthly_structure:
-            # Используем месячную структуру папок
-            now = datetime.datetime.now()
-            folder_id = create_monthly_folder_structure(service, now.year, now.month, folder_id, folder_name)
-            if not folder_id:
-                print("❌ Не удалось создать месячную структуру папок")
-                return None
-        else:
-            # Ищем или создаем папку по имени (старая логика)
-            query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder'"
-            results = service.files().list(q=query, fields="files(id, name)").execute()
-            folders = results.get('files', [])
-            
-            if folders:
-                folder_id = folders[0]['id']
-                print(f"📁 Найдена папка: {folder_name}")
-            else:
-                # Создаем папку
-                folder_metadata = {
-                    'name': folder_name,
-                    'mimeType': 'application/vnd.google-apps.folder'
-                }
-                folder = service.files().create(body=folder_metadata).execute()
-                folder_id = folder.get('id')
-                print(f"📁 Создана папка: {folder_name}")
-        
-        # Загружаем файл
-        file_name = os.path.basename(file_path)
-        file_metadata = {
-            'name': file_name,
-            'parents': [folder_id]
-        }
-        
-        media = MediaFileUpload(file_path, mimetype='application/pdf')
-        file = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id,webViewLink'
-        ).execute()
-        
-        file_id = file.get('id')
-        web_link = file.get('webViewLink')
-        
-        print(f"📤 Файл загружен: {file_name}")
-        print(f"🔗 Ссылка: {web_link}")
-        
-        return web_link
-        
-    except HttpError as e:
-        print(f"❌ Ошибка загрузки: {e}")
-        return None
+        return get_drive_client().upload(file_path, folder_name, folder_id, use_monthly_structure)
     except Exception as e:
-        print(f"❌ Общая ошибка: {e}")
+        print(f"❌ Ошибка загрузки: {e}")
         return None
 
 if __name__ == "__main__":
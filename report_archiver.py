@@ -2,13 +2,137 @@
 # -*- coding: utf-8 -*-
 """
 Модуль для автоматического сохранения отчетов в локальную папку docs/reports/
+
+Отчеты раскладываются по дням: docs/reports/YYYY/MM/DD/. Копия в архиве -
+жесткая ссылка на исходный файл, если файловая система позволяет, иначе
+reflink (copy-on-write клон), и только затем обычное копирование. Срок
+хранения соблюдается удалением целых папок дней.
+
+Отчеты старше N дней можно упаковать в помесячные zip архивы
+docs/reports/bundles/YYYY-MM.zip (python report_archiver.py --pack N). Смещение
+каждого отчета в архиве хранится в каталоге, поэтому отдельный отчет читается
+одним seek без распаковки всего архива (read_report).
+
+Метаданные отчетов (тип теста, хэш пользователя, время, размер, контрольная
+сумма) записываются в каталог docs/reports/catalog.sqlite3 при сохранении.
+Статистика, выборки по датам и очистка старых отчетов работают по индексам
+каталога, а не перебором и разбором имен файлов. Для архивов, созданных до
+появления каталога: python report_archiver.py --rebuild
 """
+import argparse
+import hashlib
+import os
 import shutil
-from datetime import datetime
+import sqlite3
+import struct
+import threading
+import zipfile
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import re
 
+from src.psytest.user_hash import hash_user
+
+CATALOG_NAME = "catalog.sqlite3"
+
+# ioctl клонирования файла (reflink) в Linux: btrfs, XFS, overlayfs поверх них
+FICLONE = 0x40049409
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT NOT NULL UNIQUE,   -- путь относительно папки отчетов
+    test_type TEXT NOT NULL,
+    user_hash TEXT,
+    created_at TEXT NOT NULL,         -- ISO время сохранения
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_type_created ON reports(test_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_user ON reports(user_hash, created_at);
+"""
+
+# Колонки упакованных отчетов (добавляются и в каталоги, созданные до упаковки)
+BUNDLE_COLUMNS = {
+    "bundle": "TEXT",               # путь к zip относительно папки отчетов (NULL - отдельный файл)
+    "bundle_offset": "INTEGER",     # смещение локального заголовка файла в zip
+    "bundle_length": "INTEGER",     # размер сжатых данных
+    "compression": "INTEGER",       # метод сжатия zip (0 - без сжатия, 8 - deflate)
+}
+
+BUNDLES_DIR = "bundles"
+
+# Локальный заголовок файла zip: сигнатура, 5 x uint16, 3 x uint32, длины имени и extra
+ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def partition_dir(base_dir: Path, moment: datetime) -> Path:
+    """Папка дня YYYY/MM/DD внутри base_dir"""
+    return base_dir / moment.strftime("%Y") / moment.strftime("%m") / moment.strftime("%d")
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    import fcntl
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            destination.unlink(missing_ok=True)
+            raise
+    shutil.copystat(source, destination)
+
+
+def store_file(source: Path, destination: Path) -> str:
+    """
+    Кладет файл в архив без копирования данных, если это возможно
+    
+    Порядок: жесткая ссылка (os.link) -> reflink (FICLONE) -> shutil.copy2.
+    Жесткая ссылка делит данные с исходником, поэтому исходный файл нельзя
+    переписывать на месте (PDF отчеты всегда создаются заново).
+    
+    Returns:
+        Способ: "link", "reflink" или "copy"
+    """
+    try:
+        os.link(source, destination)
+        return "link"
+    except (OSError, NotImplementedError):
+        pass
+    try:
+        _reflink(source, destination)
+        return "reflink"
+    except (OSError, ImportError):
+        pass
+    shutil.copy2(source, destination)
+    return "copy"
+
+
+def parse_report_name(path: Path) -> Tuple[str, Optional[datetime]]:
+    """Тип теста и время из имени YYYY-MM-DD_HH-MM-SS_TYPE_... (время None, если не разобрано)"""
+    parts = path.stem.split("_")
+    test_type = parts[2] if len(parts) >= 3 else "UNKNOWN"
+    try:
+        created_at = datetime.strptime(f"{parts[0]}_{parts[1]}", "%Y-%m-%d_%H-%M-%S")
+    except (ValueError, IndexError):
+        created_at = None
+    return test_type, created_at
+
+
+def file_sha256(path: Path) -> str:
+    """Контрольная сумма файла (читается частями)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class ReportArchiver:
     """Класс для автоматического архивирования отчетов"""
     
@@ -25,11 +149,57 @@ class ReportArchiver:
         self.base_dir = Path(base_dir)
         self.reports_dir = self.base_dir / "docs" / "reports"
         
-        # Создаем папку если её нет
-        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog_path = self.reports_dir / CATALOG_NAME
+        
+        # Папка и каталог создаются при первом обращении, а не при импорте модуля
+        self._catalog_ready = False
+        self._catalog_lock = threading.Lock()
+    
+    def _init_catalog(self) -> None:
+        """Создает папку отчетов и схему каталога (один раз на экземпляр)"""
+        with self._catalog_lock:
+            if self._catalog_ready:
+                return
+            self.reports_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.catalog_path), timeout=30)
+            try:
+                with conn:
+                    conn.executescript(CATALOG_SCHEMA)
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(reports)")}
+                    for column, column_type in BUNDLE_COLUMNS.items():
+                        if column not in columns:
+                            conn.execute(f"ALTER TABLE reports ADD COLUMN {column} {column_type}")
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_bundle ON reports(bundle)")
+            finally:
+                conn.close()
+            self._catalog_ready = True
+    
+    @contextmanager
+    def _catalog(self) -> Iterator[sqlite3.Connection]:
+        """Соединение с каталогом (транзакция фиксируется при выходе)"""
+        if not self._catalog_ready:
+            self._init_catalog()
+        conn = sqlite3.connect(str(self.catalog_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _record(self, conn: sqlite3.Connection, report_path: Path, test_type: str,
+                user_hash: Optional[str], created_at: datetime, checksum: Optional[str] = None) -> None:
+        """Добавляет (или обновляет) запись об отчете в каталоге"""
+        conn.execute(
+            "INSERT OR REPLACE INTO reports (file_name, test_type, user_hash, created_at, size, sha256) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (report_path.relative_to(self.reports_dir).as_posix(), test_type.upper(), user_hash,
+             created_at.isoformat(timespec="seconds"), report_path.stat().st_size,
+             checksum or file_sha256(report_path))
+        )
     
     def save_report(self, source_path: Path, test_type: str, 
-                   user_name: str = "User", additional_info: Dict[str, Any] = None) -> Path:
+                   user_name: str = "User", additional_info: Dict[str, Any] = None,
+                   user_hash: Optional[str] = None) -> Path:
         """
         Сохраняет отчет в архивную папку с информативным именем
         
@@ -38,6 +208,7 @@ class ReportArchiver:
             test_type: Тип теста (DISC, PAEI, HEXACO, etc.)
             user_name: Имя пользователя (анонимизированное)
             additional_info: Дополнительная информация для имени файла
+            user_hash: Анонимный идентификатор пользователя (по умолчанию - хэш имени)
             
         Returns:
             Путь к сохраненному файлу
@@ -46,7 +217,8 @@ class ReportArchiver:
             raise FileNotFoundError(f"Исходный файл не найден: {source_path}")
         
         # Формируем временную метку
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        created_at = datetime.now()
+        timestamp = created_at.strftime("%Y-%m-%d_%H-%M-%S")
         
         # Очищаем имя пользователя от небезопасных символов
         safe_user_name = re.sub(r'[^\w\-_.]', '_', user_name)[:20]
@@ -62,10 +234,14 @@ class ReportArchiver:
         
         # Создаем финальное имя файла
         filename = "_".join(filename_parts) + source_path.suffix
-        destination = self.reports_dir / filename
+        day_dir = partition_dir(self.reports_dir, created_at)
+        day_dir.mkdir(parents=True, exist_ok=True)
+        destination = day_dir / filename
         
-        # Копируем файл
-        shutil.copy2(source_path, destination)
+        # Сохраняем файл (ссылка/клон/копия) и записываем его в каталог
+        store_file(source_path, destination)
+        with self._catalog() as conn:
+            self._record(conn, destination, test_type, user_hash or hash_user(user_name), created_at)
         
         # Логируем сохранение
         print(f"📁 Отчет сохранен: {destination.name}")
@@ -97,74 +273,328 @@ class ReportArchiver:
             "v": "balanced"  # Версия с сбалансированными диаграммами
         }
         
-        return self.save_report(source_path, test_type, display_name, additional_info)
+        return self.save_report(source_path, test_type, display_name, additional_info,
+                                user_hash=hash_user(user_id))
     
     def get_report_stats(self) -> Dict[str, Any]:
         """
-        Получает статистику сохраненных отчетов
+        Получает статистику сохраненных отчетов (по каталогу)
         
         Returns:
             Словарь со статистикой
         """
-        reports = list(self.reports_dir.glob("*.pdf"))
-        
-        # Подсчитываем по типам тестов
-        test_types = {}
-        dates = []
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        with self._catalog() as conn:
+            total, total_size, first, last = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at), MAX(created_at) FROM reports"
+            ).fetchone()
+            test_types = dict(conn.execute(
+                "SELECT test_type, COUNT(*) FROM reports GROUP BY test_type ORDER BY test_type"
+            ).fetchall())
+            bundled = conn.execute("SELECT COUNT(*) FROM reports WHERE bundle IS NOT NULL").fetchone()[0]
+            reports_today = conn.execute(
+                "SELECT COUNT(*) FROM reports WHERE created_at >= ?",
+                (today.isoformat(timespec="seconds"),)
+            ).fetchone()[0]
         
-        for report in reports:
-            # Парсим имя файла: YYYY-MM-DD_HH-MM-SS_TYPE_User...
-            parts = report.stem.split("_")
-            if len(parts) >= 3:
-                test_type = parts[2]
-                test_types[test_type] = test_types.get(test_type, 0) + 1
-                
-                # Извлекаем дату
-                if len(parts) >= 2:
-                    try:
-                        date_str = f"{parts[0]}_{parts[1]}"
-                        date = datetime.strptime(date_str, "%Y-%m-%d_%H-%M-%S")
-                        dates.append(date)
-                    except ValueError:
-                        pass
+        def fmt(value: Optional[str]) -> Optional[str]:
+            return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M") if value else None
         
         stats = {
-            "total_reports": len(reports),
+            "total_reports": total,
             "test_types": test_types,
             "date_range": {
-                "first": min(dates).strftime("%Y-%m-%d %H:%M") if dates else None,
-                "last": max(dates).strftime("%Y-%m-%d %H:%M") if dates else None
+                "first": fmt(first),
+                "last": fmt(last)
             },
-            "reports_today": len([d for d in dates if d.date() == datetime.now().date()]),
+            "reports_today": reports_today,
+            "bundled_reports": bundled,
+            "total_size": total_size,
             "storage_path": str(self.reports_dir)
         }
         
         return stats
     
+    def find_reports(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     test_type: Optional[str] = None, user_hash: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Отчеты за период [start, end) с необязательным фильтром по типу теста и пользователю
+        
+        Returns:
+            Список записей каталога (path - полный путь к файлу), от старых к новым
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("created_at >= ?")
+            params.append(start.isoformat(timespec="seconds"))
+        if end is not None:
+            conditions.append("created_at < ?")
+            params.append(end.isoformat(timespec="seconds"))
+        if test_type:
+            conditions.append("test_type = ?")
+            params.append(test_type.upper())
+        if user_hash:
+            conditions.append("user_hash = ?")
+            params.append(user_hash)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self._catalog() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"SELECT * FROM reports {where} ORDER BY created_at, id", params).fetchall()
+        
+        reports = []
+        for row in rows:
+            report = dict(row)
+            report["path"] = self.reports_dir / row["file_name"]
+            reports.append(report)
+        return reports
+    
+    def _day_partitions(self) -> Iterator[Tuple[datetime, Path]]:
+        """Папки дней архива: (дата, путь)"""
+        for year_dir in self.reports_dir.glob("[0-9][0-9][0-9][0-9]"):
+            for month_dir in year_dir.glob("[0-9][0-9]"):
+                for day_dir in month_dir.glob("[0-9][0-9]"):
+                    try:
+                        day = datetime.strptime(f"{year_dir.name}{month_dir.name}{day_dir.name}", "%Y%m%d")
+                    except ValueError:
+                        continue
+                    yield day, day_dir
+    
     def cleanup_old_reports(self, days_to_keep: int = 30) -> int:
         """
-        Удаляет старые отчеты
+        Удаляет старые отчеты: целые папки дней старше срока хранения
         
         Args:
-            days_to_keep: Количество дней для хранения
+            days_to_keep: Количество дней для хранения (текущий день не считается)
             
         Returns:
-            Количество удаленных файлов
+            Количество удаленных отчетов
         """
-        cutoff_date = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
-        reports = list(self.reports_dir.glob("*.pdf"))
-        deleted_count = 0
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = today - timedelta(days=days_to_keep)
+        cutoff_iso = cutoff.isoformat(timespec="seconds")
+        
+        with self._catalog() as conn:
+            deleted_count = conn.execute(
+                "SELECT COUNT(*) FROM reports WHERE created_at < ?", (cutoff_iso,)
+            ).fetchone()[0]
+            
+            # Отчеты старого плоского формата (до разбиения по дням) удаляем по одному
+            legacy = conn.execute(
+                "SELECT file_name FROM reports WHERE created_at < ? AND file_name NOT LIKE '%/%'",
+                (cutoff_iso,)
+            ).fetchall()
+            for (file_name,) in legacy:
+                (self.reports_dir / file_name).unlink(missing_ok=True)
+            
+            expired_bundles = [row[0] for row in conn.execute(
+                "SELECT DISTINCT bundle FROM reports WHERE created_at < ? AND bundle IS NOT NULL",
+                (cutoff_iso,)
+            )]
+            conn.execute("DELETE FROM reports WHERE created_at < ?", (cutoff_iso,))
+            
+            # Архив месяца удаляется, когда истек срок всех отчетов в нем
+            for bundle in expired_bundles:
+                if not conn.execute("SELECT 1 FROM reports WHERE bundle = ? LIMIT 1", (bundle,)).fetchone():
+                    (self.reports_dir / bundle).unlink(missing_ok=True)
+                    print(f"🗑️ Удален архив {bundle}")
         
-        for report in reports:
-            if report.stat().st_mtime < cutoff_date:
-                report.unlink()
-                deleted_count += 1
-                print(f"🗑️ Удален старый отчет: {report.name}")
+        for day, day_dir in sorted(self._day_partitions()):
+            if day < cutoff:
+                shutil.rmtree(day_dir, ignore_errors=True)
+                print(f"🗑️ Удалены отчеты за {day:%Y-%m-%d}")
         
+        self._remove_empty_partitions()
         return deleted_count
+    
+    def _remove_empty_partitions(self) -> None:
+        """Удаляет пустые папки дней, месяцев и лет"""
+        for pattern in ("[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9]",
+                        "[0-9][0-9][0-9][0-9]/[0-9][0-9]",
+                        "[0-9][0-9][0-9][0-9]"):
+            for directory in self.reports_dir.glob(pattern):
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+    
+    def pack_old_reports(self, older_than_days: int = 90) -> int:
+        """
+        Упаковывает отчеты старше older_than_days дней в помесячные zip архивы
+        
+        Порядок устойчив к сбоям: сначала файл дописывается в архив, затем
+        каталог получает его смещение, и только после фиксации каталога
+        отдельный файл удаляется.
+        
+        Returns:
+            Количество упакованных отчетов
+        """
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = (today - timedelta(days=older_than_days)).isoformat(timespec="seconds")
+        
+        with self._catalog() as conn:
+            rows = conn.execute(
+                "SELECT file_name, substr(created_at, 1, 7) FROM reports "
+                "WHERE created_at < ? AND bundle IS NULL ORDER BY created_at, id", (cutoff,)
+            ).fetchall()
+        
+        by_month: Dict[str, List[str]] = {}
+        for file_name, month in rows:
+            by_month.setdefault(month, []).append(file_name)
+        
+        packed = 0
+        bundles_dir = self.reports_dir / BUNDLES_DIR
+        for month, file_names in by_month.items():
+            bundles_dir.mkdir(exist_ok=True)
+            bundle_path = bundles_dir / f"{month}.zip"
+            bundle = bundle_path.relative_to(self.reports_dir).as_posix()
+            
+            with zipfile.ZipFile(bundle_path, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+                existing = set(zf.namelist())  # уже дописаны при прерванной упаковке
+                for file_name in file_names:
+                    path = self.reports_dir / file_name
+                    if file_name not in existing and path.exists():
+                        zf.write(path, arcname=file_name)
+                members = {info.filename: info for info in zf.infolist()}
+            
+            done = [name for name in file_names if name in members]
+            with self._catalog() as conn:
+                conn.executemany(
+                    "UPDATE reports SET bundle = ?, bundle_offset = ?, bundle_length = ?, compression = ? "
+                    "WHERE file_name = ?",
+                    [(bundle, members[name].header_offset, members[name].compress_size,
+                      members[name].compress_type, name) for name in done]
+                )
+            for name in done:
+                (self.reports_dir / name).unlink(missing_ok=True)
+            packed += len(done)
+            print(f"📦 {bundle}: упаковано отчетов {len(done)}")
+        
+        self._remove_empty_partitions()
+        return packed
+    
+    def read_report(self, file_name: str) -> bytes:
+        """
+        Содержимое отчета по имени из каталога (отдельный файл или запись в архиве)
+        
+        Из архива читаются только данные этого отчета: seek по смещению из
+        каталога, без чтения центрального каталога zip и других отчетов.
+        """
+        with self._catalog() as conn:
+            row = conn.execute(
+                "SELECT bundle, bundle_offset, bundle_length, compression, sha256 FROM reports "
+                "WHERE file_name = ?", (file_name,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Отчет не найден в каталоге: {file_name}")
+        
+        bundle, offset, length, compression, checksum = row
+        if bundle is None:
+            return (self.reports_dir / file_name).read_bytes()
+        
+        with open(self.reports_dir / bundle, "rb") as f:
+            f.seek(offset)
+            header = ZIP_LOCAL_HEADER.unpack(f.read(ZIP_LOCAL_HEADER.size))
+            if header[0] != b"PK\x03\x04":
+                raise ValueError(f"Поврежден архив {bundle}: нет заголовка {file_name}")
+            name_length, extra_length = header[-2:]
+            f.seek(offset + ZIP_LOCAL_HEADER.size + name_length + extra_length)
+            data = f.read(length)
+        
+        if compression == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        elif compression != zipfile.ZIP_STORED:
+            raise ValueError(f"Неподдерживаемое сжатие {compression} в {bundle}")
+        if hashlib.sha256(data).hexdigest() != checksum:
+            raise ValueError(f"Контрольная сумма {file_name} в {bundle} не совпадает")
+        return data
+    
+    def rebuild_catalog(self, partition: bool = False) -> int:
+        """
+        Пересобирает каталог по файлам в папке отчетов (однократно для старых архивов)
+        
+        Время и тип теста берутся из имени файла (YYYY-MM-DD_HH-MM-SS_TYPE_...),
+        при нестандартном имени - время изменения файла. Записи о пропавших
+        файлах удаляются.
+        
+        Args:
+            partition: Перенести отчеты из корня архива в папки дней YYYY/MM/DD
+        
+        Returns:
+            Количество отчетов в каталоге
+        """
+        with self._catalog() as conn:
+            known = {
+                file_name: (size, checksum, user_hash)
+                for file_name, size, checksum, user_hash
+                in conn.execute("SELECT file_name, size, sha256, user_hash FROM reports WHERE bundle IS NULL")
+            }
+            found = set()
+            for report in sorted(self.reports_dir.rglob("*.pdf")):
+                file_name = report.relative_to(self.reports_dir).as_posix()
+                
+                test_type, created_at = parse_report_name(report)
+                if created_at is None:
+                    created_at = datetime.fromtimestamp(report.stat().st_mtime)
+                
+                size, checksum, user_hash = known.get(file_name, (None, None, None))
+                if size != report.stat().st_size:
+                    checksum = None  # файл изменился - считаем сумму заново
+                
+                if partition and "/" not in file_name:
+                    day_dir = partition_dir(self.reports_dir, created_at)
+                    day_dir.mkdir(parents=True, exist_ok=True)
+                    report = report.rename(day_dir / report.name)
+                    file_name = report.relative_to(self.reports_dir).as_posix()
+                
+                found.add(file_name)
+                self._record(conn, report, test_type, user_hash, created_at, checksum)
+            
+            missing = [(name,) for name in known if name not in found]
+            conn.executemany("DELETE FROM reports WHERE file_name = ?", missing)
+            
+            bundled = self._rebuild_bundles(conn)
+        
+        print(f"📚 Каталог отчетов пересобран: {len(found)} файлов, {bundled} в архивах, "
+              f"удалено записей: {len(missing)}")
+        return len(found) + bundled
+    
+    def _rebuild_bundles(self, conn: sqlite3.Connection) -> int:
+        """Индексирует отчеты в zip архивах месяцев. Возвращает их число"""
+        known = {name: bundle for name, bundle in
+                 conn.execute("SELECT file_name, bundle FROM reports WHERE bundle IS NOT NULL")}
+        found = set()
+        for bundle_path in sorted((self.reports_dir / BUNDLES_DIR).glob("*.zip")):
+            bundle = bundle_path.relative_to(self.reports_dir).as_posix()
+            with zipfile.ZipFile(bundle_path) as zf:
+                for info in zf.infolist():
+                    found.add(info.filename)
+                    if known.get(info.filename) == bundle:
+                        continue
+                    test_type, created_at = parse_report_name(Path(info.filename))
+                    if created_at is None:
+                        created_at = datetime(*info.date_time)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO reports (file_name, test_type, user_hash, created_at, size, "
+                        "sha256, bundle, bundle_offset, bundle_length, compression) "
+                        "VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?, ?)",
+                        (info.filename, test_type.upper(), created_at.isoformat(timespec="seconds"),
+                         info.file_size, hashlib.sha256(zf.read(info)).hexdigest(), bundle,
+                         info.header_offset, info.compress_size, info.compress_type)
+                    )
+        conn.executemany("DELETE FROM reports WHERE file_name = ?",
+                         [(name,) for name in known if name not in found])
+        return len(found)
+
+# Общий экземпляр для использования в других модулях (создается при первом обращении)
+_report_archiver: Optional[ReportArchiver] = None
+
+
+def get_report_archiver() -> ReportArchiver:
+    """Возвращает общий архиватор отчетов"""
+    global _report_archiver
+    if _report_archiver is None:
+        _report_archiver = ReportArchiver()
+    return _report_archiver
 
-# Глобальный экземпляр для использования в других модулях
-report_archiver = ReportArchiver()
 
 def save_report_copy(source_path: Path, test_type: str, user_info: Dict[str, Any]) -> Optional[Path]:
     """
@@ -180,14 +610,14 @@ def save_report_copy(source_path: Path, test_type: str, user_info: Dict[str, Any
     """
     try:
         if "telegram_id" in user_info:
-            return report_archiver.save_telegram_report(
+            return get_report_archiver().save_telegram_report(
                 source_path, 
                 user_info["telegram_id"], 
                 test_type,
                 user_info.get("name")
             )
         else:
-            return report_archiver.save_report(
+            return get_report_archiver().save_report(
                 source_path,
                 test_type,
                 user_info.get("name", "User"),
@@ -199,7 +629,7 @@ def save_report_copy(source_path: Path, test_type: str, user_info: Dict[str, Any
 
 def print_report_stats():
     """Выводит статистику сохраненных отчетов"""
-    stats = report_archiver.get_report_stats()
+    stats = get_report_archiver().get_report_stats()
     
     print(f"\n📊 СТАТИСТИКА ОТЧЕТОВ:")
     print(f"Всего отчетов: {stats['total_reports']}")
@@ -210,18 +640,36 @@ def print_report_stats():
         for test_type, count in stats['test_types'].items():
             print(f"  • {test_type}: {count}")
     
+    if stats['bundled_reports']:
+        print(f"В архивах месяцев: {stats['bundled_reports']}")
+    
     if stats['date_range']['first']:
         print(f"Период: {stats['date_range']['first']} - {stats['date_range']['last']}")
     
     print(f"Папка: {stats['storage_path']}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Архив отчетов docs/reports")
+    parser.add_argument("--rebuild", action="store_true", help="пересобрать каталог по файлам архива")
+    parser.add_argument("--partition", action="store_true",
+                        help="при пересборке разложить старые отчеты по папкам YYYY/MM/DD")
+    parser.add_argument("--pack", type=int, metavar="DAYS",
+                        help="упаковать отчеты старше DAYS дней в помесячные zip архивы")
+    parser.add_argument("--cleanup", type=int, metavar="DAYS", help="удалить отчеты старше DAYS дней")
+    args = parser.parse_args()
+    
     print("📁 СИСТЕМА АРХИВИРОВАНИЯ ОТЧЕТОВ")
     print("=" * 50)
     
+    report_archiver = get_report_archiver()
+    if args.rebuild:
+        report_archiver.rebuild_catalog(partition=args.partition)
+    if args.pack is not None:
+        print(f"📦 Упаковано отчетов: {report_archiver.pack_old_reports(args.pack)}")
+    if args.cleanup is not None:
+        print(f"🗑️ Удалено отчетов: {report_archiver.cleanup_old_reports(args.cleanup)}")
+    
     # Показываем текущую статистику
     print_report_stats()
     
-    # Демонстрируем функциональность
     print(f"\n📂 Папка для отчетов готова: {report_archiver.reports_dir}")
-    print("✅ Система настроена для автоматического сохранения отчетов")
\ No newline at end of file
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Планировщик генерации отчетов с ограничением параллельности
+
+Одна генерация занимает ~86 МБ памяти на пике (docs/MEMORY_ANALYSIS_REPORT.md),
+поэтому одновременно выполняется не более max_workers генераций, остальные ждут
+в ограниченной очереди. При переполнении очереди новые задания отклоняются
+(ReportQueueFull), а не накапливаются в памяти. Задания выполняются в пуле
+процессов, чтобы matplotlib/ReportLab не конкурировали за GIL с ботом. Если
+процесс пула погиб (например, убит OOM), пул пересоздается, а прерванные
+задания повторяются один раз.
+"""
+import asyncio
+import os
+import statistics
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+PositionCallback = Callable[[int], Awaitable[None]]
+
+
+class ReportQueueFull(Exception):
+    """Очередь генерации отчетов переполнена"""
+
+
+class _Job:
+    """Задание в очереди"""
+
+    def __init__(self, func: Callable, args: tuple, on_position: Optional[PositionCallback]):
+        self.func = func
+        self.args = args
+        self.on_position = on_position
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class ReportScheduler:
+    """Ограниченная очередь заданий и пул воркеров для генерации отчетов"""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 20, use_processes: bool = True,
+                 executor_factory: Optional[Callable[[int], Executor]] = None,
+                 initializer: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            max_workers: Максимум одновременно выполняемых генераций
+            max_queue: Максимум заданий, ожидающих в очереди
+            use_processes: Выполнять задания в пуле процессов (иначе - в потоках)
+            executor_factory: Фабрика пула по числу воркеров (переопределяет use_processes)
+            initializer: Прогрев воркера (вызывается один раз в каждом процессе/потоке пула)
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self.initializer = initializer
+        self._executor_factory = executor_factory
+        self._executor: Optional[Executor] = None
+        self._pending: Deque[_Job] = deque()
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+
+        # Метрики
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self._run_times: Deque[float] = deque(maxlen=500)
+
+    @classmethod
+    def from_env(cls, initializer: Optional[Callable[[], None]] = None) -> "ReportScheduler":
+        """Создает планировщик с настройками из переменных окружения"""
+        return cls(
+            max_workers=int(os.getenv("REPORT_WORKERS", "2")),
+            max_queue=int(os.getenv("REPORT_QUEUE_SIZE", "20")),
+            use_processes=os.getenv("REPORT_EXECUTOR", "process").lower() != "thread",
+            initializer=initializer,
+        )
+
+    def _create_executor(self) -> Executor:
+        if self._executor_factory:
+            return self._executor_factory(self.max_workers)
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report",
+                                  initializer=self.initializer)
+
+    def _replace_executor(self, broken: Executor) -> None:
+        """Заменяет сломанный пул новым (один раз, даже если сбой заметили несколько воркеров)"""
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+        self.restarts += 1
+        print(f"Пул генерации отчетов сломан (погиб процесс), создан новый: перезапуск {self.restarts}")
+
+    async def _execute(self, job: _Job) -> Any:
+        """Выполняет задание в пуле; при сломанном пуле пересоздает его и повторяет задание один раз"""
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, job.func, *job.args)
+        except BrokenExecutor:
+            self._replace_executor(executor)
+            return await loop.run_in_executor(self._executor, job.func, *job.args)
+
+    def _ensure_started(self) -> None:
+        """Лениво запускает воркеры в текущем event loop"""
+        if self._workers:
+            return
+        if self._executor is None:
+            self._executor = self._create_executor()
+        self._wakeup = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"report-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def prewarm(self) -> None:
+        """Заранее запускает все воркеры пула, чтобы прогрев не ложился на первых пользователей"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, os.getpid) for _ in range(self.max_workers)
+        ))
+
+    async def submit(self, func: Callable, *args, on_position: Optional[PositionCallback] = None) -> Any:
+        """
+        Ставит задание в очередь и ждет результата
+
+        Args:
+            func: Функция генерации (для пула процессов должна быть picklable)
+            *args: Аргументы функции
+            on_position: Корутина, получающая место в очереди (1 - следующий),
+                         0 - задание начало выполняться
+
+        Returns:
+            Результат func(*args)
+
+        Raises:
+            ReportQueueFull: Очередь переполнена
+        """
+        self._ensure_started()
+        if len(self._pending) >= self.max_queue:
+            self.rejected += 1
+            raise ReportQueueFull(
+                f"Очередь генерации отчетов заполнена ({self.max_queue} заданий)"
+            )
+
+        job = _Job(func, args, on_position)
+        self._pending.append(job)
+        try:
+            if self.running >= self.max_workers:
+                await self._notify(job, len(self._pending))
+
+            async with self._wakeup:
+                self._wakeup.notify()
+            return await job.future
+        except asyncio.CancelledError:
+            # Вызывающий код отменен (таймаут, остановка обработчика): ожидающее
+            # задание не выполняется и освобождает место в очереди
+            if job in self._pending:
+                self._pending.remove(job)
+            raise
+
+    async def _notify(self, job: _Job, position: int) -> None:
+        if job.on_position is None:
+            return
+        try:
+            await job.on_position(position)
+        except Exception as e:
+            print(f"Ошибка уведомления о месте в очереди: {e}")
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: bool(self._pending))
+                job = self._pending.popleft()
+                if job.future.cancelled():
+                    continue
+                self.running += 1
+
+            self._wait_times.append(time.monotonic() - job.enqueued_at)
+            started = time.monotonic()
+            # Задание уходит в пул до уведомлений, чтобы не ждать отправки сообщений
+            execution = asyncio.ensure_future(self._execute(job))
+            try:
+                await self._notify(job, 0)
+                # Остальным ожидающим сообщаем, что очередь сдвинулась
+                for position, waiting in enumerate(list(self._pending), start=1):
+                    await self._notify(waiting, position)
+                result = await execution
+            except asyncio.CancelledError:
+                execution.cancel()
+                job.future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self.running -= 1
+                self._run_times.append(time.monotonic() - started)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Метрики очереди: глубина, занятость воркеров, время ожидания и выполнения (секунды)"""
+        waits = list(self._wait_times)
+        runs = list(self._run_times)
+        return {
+            "queue_depth": len(self._pending),
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "wait_avg": round(statistics.fmean(waits), 2) if waits else 0.0,
+            "wait_p95": round(_percentile(waits, 95), 2),
+            "wait_max": round(max(waits), 2) if waits else 0.0,
+            "run_avg": round(statistics.fmean(runs), 2) if runs else 0.0,
+        }
+
+    async def shutdown(self) -> None:
+        """Останавливает воркеры и пул"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job in self._pending:
+            if not job.future.done():
+                job.future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Перцентиль по методу ближайшего ранга"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Отрисовка PDF отчетов в отдельном процессе
+
+Диаграммы (matplotlib) и верстка (ReportLab) - CPU-bound код на чистом Python,
+который в потоке бота держит GIL и тормозит обработку ответов других
+пользователей. Поэтому бот готовит сериализуемое задание ReportJob (баллы,
+интерпретации, ответы, пути к PDF), а отрисовку выполняет render_report
+в процессе-воркере. Воркеры прогреваются заранее (warm_up_worker): matplotlib
+уже импортирован, шрифты зарегистрированы, фоны радаров нарисованы, вопросы
+из промптов разобраны.
+
+Диаграммы рисуются в память (PNG в BytesIO), а отчет пользователя без пути
+возвращается байтами - на диск пишется только архивный полный отчет.
+"""
+import os
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class ReportJob:
+    """Сериализуемое задание на отрисовку двух PDF отчетов одного пользователя"""
+    participant_name: str
+    test_date: str
+    paei_scores: Dict[str, float]          # баллы, нормализованные к шкале 0-10
+    disc_scores: Dict[str, float]
+    hexaco_scores: Dict[str, float]
+    soft_skills_scores: Dict[str, float]
+    interpretations: Dict[str, str]        # готовые интерпретации по разделам
+    pdf_path_user: Optional[str]           # отчет для пользователя (без вопросов), None - в память
+    pdf_path_full: str                     # полный отчет для Google Drive (с вопросами)
+    user_answers: Dict[str, Dict] = field(default_factory=dict)
+    upload_to_gdrive: bool = True
+    chart_backend: Optional[str] = None    # "raster"/"vector", None - PSYTEST_CHART_BACKEND
+
+
+@dataclass
+class ReportResult:
+    """Результат отрисовки"""
+    pdf_path_user: Optional[str]
+    pdf_path_full: str
+    gdrive_link: Optional[str] = None
+    pdf_user_bytes: Optional[bytes] = None  # отчет пользователя, если он рисовался в память
+
+
+# Раздел с вопросами разбирается из промптов один раз на процесс
+_qa_section = None
+
+
+def _get_qa_section():
+    global _qa_section
+    if _qa_section is None:
+        from questions_answers_section import QuestionAnswerSection
+        _qa_section = QuestionAnswerSection()
+    return _qa_section
+
+
+def warm_up_worker() -> None:
+    """Инициализатор воркера: импорт matplotlib/ReportLab, шрифты и вопросы до первого задания"""
+    from enhanced_pdf_report import EnhancedCharts, EnhancedPDFReportV2, default_chart_backend
+
+    raster = default_chart_backend() == "raster"
+    if raster:
+        import src.psytest.charts  # noqa: F401  matplotlib (Agg, без pyplot)
+
+    EnhancedPDFReportV2()  # регистрирует шрифты
+    if raster:
+        EnhancedCharts.prerender_backgrounds()  # фоны радаров для растровых диаграмм
+    _get_qa_section()
+    print(f"Воркер отчетов {os.getpid()} готов")
+
+
+def render_report(job: ReportJob) -> ReportResult:
+    """
+    Рисует диаграммы и оба PDF отчета по заданию
+
+    Args:
+        job: Задание на отрисовку
+
+    Returns:
+        ReportResult с путями к PDF, байтами отчета пользователя (если pdf_path_user
+        не задан) и ссылкой на Google Drive (если загружен)
+    """
+    from enhanced_pdf_report import EnhancedPDFReportV2
+    from src.psytest.chart_cache import get_chart_cache
+
+    # Диаграммы рисуются в память, без папки шаблонов: параллельные задания не пересекаются
+    pdf_generator_user = EnhancedPDFReportV2(
+        include_questions_section=False,
+        chart_backend=job.chart_backend
+    )
+    pdf_generator_full = EnhancedPDFReportV2(
+        include_questions_section=True,
+        qa_section=_get_qa_section(),
+        chart_backend=job.chart_backend
+    )
+
+    # Диаграммы одинаковы для обоих отчетов - рисуем их один раз
+    chart_paths = pdf_generator_user._create_all_charts(
+        job.paei_scores,
+        job.disc_scores,
+        job.hexaco_scores,
+        job.soft_skills_scores,
+        in_memory=True,
+    )
+    print(f"Кэш диаграмм: {get_chart_cache().stats()}")
+
+    user_buffer = BytesIO() if job.pdf_path_user is None else None
+    pdf_generator_user.generate_enhanced_report(
+        participant_name=job.participant_name,
+        test_date=job.test_date,
+        paei_scores=job.paei_scores,
+        disc_scores=job.disc_scores,
+        hexaco_scores=job.hexaco_scores,
+        soft_skills_scores=job.soft_skills_scores,
+        ai_interpretations=job.interpretations,
+        out_path=user_buffer if user_buffer is not None else Path(job.pdf_path_user),
+        user_answers=None,
+        chart_paths=chart_paths
+    )
+
+    _, gdrive_link = pdf_generator_full.generate_enhanced_report_with_gdrive(
+        participant_name=job.participant_name,
+        test_date=job.test_date,
+        paei_scores=job.paei_scores,
+        disc_scores=job.disc_scores,
+        hexaco_scores=job.hexaco_scores,
+        soft_skills_scores=job.soft_skills_scores,
+        ai_interpretations=job.interpretations,
+        out_path=Path(job.pdf_path_full),
+        upload_to_gdrive=job.upload_to_gdrive,
+        user_answers=job.user_answers,
+        chart_paths=chart_paths
+    )
+
+    return ReportResult(
+        job.pdf_path_user,
+        job.pdf_path_full,
+        gdrive_link,
+        pdf_user_bytes=user_buffer.getvalue() if user_buffer is not None else None,
+    )
@@ -3,7 +3,8 @@
 """
 Модуль нормализации шкал для психологических тестов
 """
-from typing import Dict, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 class ScaleNormalizer:
     """Нормализатор шкал с правильными максимальными значениями для каждого теста"""
@@ -16,6 +17,37 @@ class ScaleNormalizer:
         "SOFT_SKILLS": 5  # максимальная оценка 5 (по 5-балльной шкале)
     }
     
+    # Популяционные нормы (src/psytest/norms.NormIndex), загружаются load_norms
+    norm_index = None
+    
+    @staticmethod
+    def set_norm_index(index) -> None:
+        """Подключает индекс норм для перевода сырых баллов в процентили"""
+        ScaleNormalizer.norm_index = index
+    
+    @staticmethod
+    def load_norms(db_path: Path) -> None:
+        """Загружает уплотнённые нормы из базы SQLite (таблица norm_bins)"""
+        from src.psytest.norms import NormStore
+        ScaleNormalizer.set_norm_index(NormStore(db_path).load_index())
+    
+    @staticmethod
+    def percentile(test_type: str, scale: str, raw: float) -> Optional[float]:
+        """Процентиль сырого балла среди сохранённых результатов или None без норм"""
+        index = ScaleNormalizer.norm_index
+        if index is None:
+            return None
+        # Бот пишет test_id строчными (paei, disc), банк CSV - прописными
+        for test_id in (test_type, test_type.lower(), test_type.upper()):
+            if (test_id, scale) in index:
+                return index.percentile(test_id, scale, raw)
+        return None
+    
+    @staticmethod
+    def to_percentiles(test_type: str, scores: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """Процентили для всех шкал теста (None для шкал без норм)"""
+        return {scale: ScaleNormalizer.percentile(test_type, scale, raw) for scale, raw in scores.items()}
+    
     @staticmethod
     def get_max_scale(test_type: str) -> int:
         """Возвращает максимальное значение шкалы для типа теста"""
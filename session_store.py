@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хранилище сессий тестирования бота
+
+MemorySessionStore - словарь в памяти с вытеснением давно не использованных
+(LRU) и брошенных (idle TTL) сессий. SQLiteSessionStore дополнительно
+сохраняет сессии в SQLite по схеме data/schema.sql: ответы пишутся в таблицу
+responses, снимок состояния бота - в bot_sessions. Запись отложенная
+(write-behind): ответы копятся в памяти и сбрасываются фоновым потоком пачками,
+а чтение идет из памяти. После перезапуска бота незавершенные сессии
+подгружаются из базы, и пользователь продолжает тест с того же вопроса.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.psytest.init_db import init_db
+from src.psytest.user_hash import hash_user
+
+SCHEMA_PATH = Path(__file__).parent / "data" / "schema.sql"
+DEFAULT_DB_PATH = Path(__file__).parent / "data" / "psytest.sqlite3"
+
+# Порядок тестов в боте (для sessions.tests)
+BOT_TESTS = ["PAEI", "SOFT_SKILLS", "HEXACO", "DISC"]
+
+
+class MemorySessionStore(MutableMapping):
+    """Сессии в памяти: LRU с ограничением числа и вытеснение по простою"""
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl: float = 6 * 3600):
+        """
+        Args:
+            max_sessions: Максимум сессий в памяти
+            idle_ttl: Через сколько секунд без активности сессия вытесняется
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: "OrderedDict[int, Any]" = OrderedDict()
+        self._last_access: Dict[int, float] = {}
+        self.evictions = 0
+
+    # --- MutableMapping ---
+
+    def __getitem__(self, user_id: int) -> Any:
+        self.evict_idle()
+        if user_id not in self._sessions:
+            session = self._load(user_id)
+            if session is None:
+                raise KeyError(user_id)
+            self._remember(user_id, session)
+        self._sessions.move_to_end(user_id)
+        self._last_access[user_id] = time.monotonic()
+        return self._sessions[user_id]
+
+    def __setitem__(self, user_id: int, session: Any) -> None:
+        self._remember(user_id, session)
+        self._on_set(user_id, session)
+
+    def __delitem__(self, user_id: int) -> None:
+        found = self._sessions.pop(user_id, None) is not None
+        self._last_access.pop(user_id, None)
+        if not self._on_delete(user_id) and not found:
+            raise KeyError(user_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._sessions))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # --- Сохранение (в памяти - ничего не делает) ---
+
+    def save(self, user_id: int) -> None:
+        """Фиксирует текущее состояние сессии (вызывается после изменения)"""
+
+    def record_answer(self, user_id: int, test_id: str, item_id: int, answer: int) -> None:
+        """Записывает ответ на вопрос и фиксирует состояние сессии"""
+        self.save(user_id)
+
+    def flush(self) -> None:
+        """Сбрасывает отложенные записи"""
+
+    def close(self) -> None:
+        """Останавливает хранилище"""
+
+    # --- Вытеснение ---
+
+    def _remember(self, user_id: int, session: Any) -> None:
+        self._sessions[user_id] = session
+        self._sessions.move_to_end(user_id)
+        self._last_access[user_id] = time.monotonic()
+        while len(self._sessions) > self.max_sessions:
+            oldest = next(iter(self._sessions))
+            self._evict(oldest)
+
+    def evict_idle(self) -> int:
+        """Вытесняет сессии без активности дольше idle_ttl. Возвращает их число"""
+        deadline = time.monotonic() - self.idle_ttl
+        idle = [user_id for user_id, ts in self._last_access.items() if ts < deadline]
+        for user_id in idle:
+            self._evict(user_id)
+        return len(idle)
+
+    def _evict(self, user_id: int) -> None:
+        self._on_evict(user_id)
+        self._sessions.pop(user_id, None)
+        self._last_access.pop(user_id, None)
+        self.evictions += 1
+
+    # --- Точки расширения для постоянного хранилища ---
+
+    def _load(self, user_id: int) -> Optional[Any]:
+        return None
+
+    def _on_set(self, user_id: int, session: Any) -> None:
+        pass
+
+    def _on_delete(self, user_id: int) -> bool:
+        return False
+
+    def _on_evict(self, user_id: int) -> None:
+        pass
+
+
+class SQLiteSessionStore(MemorySessionStore):
+    """Сессии в памяти с отложенной записью в SQLite (таблицы sessions, responses, bot_sessions)"""
+
+    def __init__(self, from_dict: Callable[[Dict], Any], db_path: Optional[Path] = None,
+                 schema_path: Path = SCHEMA_PATH, flush_interval: float = 1.0, batch_size: int = 100,
+                 max_sessions: int = 1000, idle_ttl: float = 6 * 3600,
+                 resume_ttl: float = 7 * 24 * 3600):
+        """
+        Args:
+            from_dict: Восстанавливает сессию из снимка session.to_dict()
+            db_path: Файл базы SQLite
+            schema_path: Схема базы (data/schema.sql)
+            flush_interval: Период сброса отложенных записей (секунды)
+            batch_size: Сбросить досрочно, если накопилось столько ответов
+            max_sessions: Максимум сессий в памяти (остальные - только в базе)
+            idle_ttl: Простой, после которого сессия выгружается из памяти
+            resume_ttl: Сколько хранить незавершенные сессии для продолжения
+        """
+        super().__init__(max_sessions=max_sessions, idle_ttl=idle_ttl)
+        self.from_dict = from_dict
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.resume_ttl = resume_ttl
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        init_db(self.db_path, schema_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._db_lock = threading.Lock()
+
+        # Отложенные записи
+        self._pending_lock = threading.Lock()
+        self._new_sessions: List[Tuple] = []
+        self._responses: List[Tuple] = []
+        self._snapshots: Dict[int, Tuple[str, str, str]] = {}   # user_id -> (session_id, json, ts)
+        self._deleted: set = set()
+        self.flushes = 0
+        self.rows_written = 0
+
+        self._purge_stale()
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._writer = threading.Thread(target=self._writer_loop, name="session-writer", daemon=True)
+        self._writer.start()
+
+    # --- Запись ---
+
+    def _snapshot(self, user_id: int, session: Any) -> None:
+        state = json.dumps(session.to_dict(), ensure_ascii=False, default=str)
+        with self._pending_lock:
+            self._deleted.discard(user_id)
+            self._snapshots[user_id] = (session.session_id, state, datetime.now().isoformat())
+
+    def _on_set(self, user_id: int, session: Any) -> None:
+        user_hash = hash_user(user_id)
+        with self._pending_lock:
+            self._new_sessions.append(
+                (session.session_id, datetime.now().isoformat(), json.dumps(BOT_TESTS), user_hash)
+            )
+        self._snapshot(user_id, session)
+
+    def save(self, user_id: int) -> None:
+        session = self._sessions.get(user_id)
+        if session is not None:
+            self._snapshot(user_id, session)
+
+    def record_answer(self, user_id: int, test_id: str, item_id: int, answer: int) -> None:
+        session = self._sessions.get(user_id)
+        if session is None:
+            return
+        with self._pending_lock:
+            self._responses.append(
+                (session.session_id, test_id, int(item_id), int(answer), datetime.now().isoformat())
+            )
+            pending = len(self._responses)
+        self._snapshot(user_id, session)
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _on_delete(self, user_id: int) -> bool:
+        with self._pending_lock:
+            self._snapshots.pop(user_id, None)
+            self._deleted.add(user_id)
+        return True
+
+    def _on_evict(self, user_id: int) -> None:
+        # Из памяти выгружается, в базе остается для продолжения
+        self.save(user_id)
+
+    def flush(self) -> None:
+        """Записывает накопленные изменения одной транзакцией"""
+        with self._pending_lock:
+            new_sessions, self._new_sessions = self._new_sessions, []
+            responses, self._responses = self._responses, []
+            snapshots, self._snapshots = self._snapshots, {}
+            deleted, self._deleted = self._deleted, set()
+        if not (new_sessions or responses or snapshots or deleted):
+            return
+
+        with self._db_lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO sessions (session_id, created_at, tests, user_hash) "
+                        "VALUES (?, ?, ?, ?)", new_sessions)
+                    self._conn.executemany(
+                        "INSERT INTO responses (session_id, test_id, item_id, answer, ts) "
+                        "VALUES (?, ?, ?, ?, ?)", responses)
+                    self._conn.executemany(
+                        "DELETE FROM bot_sessions WHERE user_id = ?", [(u,) for u in deleted])
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO bot_sessions (session_id, user_id, state, updated_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(sid, uid, state, ts) for uid, (sid, state, ts) in snapshots.items()])
+            except sqlite3.Error as e:
+                print(f"Ошибка записи сессий в базу: {e}")
+                # Возвращаем записи в очередь, чтобы не потерять ответы
+                with self._pending_lock:
+                    self._new_sessions = new_sessions + self._new_sessions
+                    self._responses = responses + self._responses
+                    for uid, snapshot in snapshots.items():
+                        self._snapshots.setdefault(uid, snapshot)
+                    self._deleted |= deleted
+                return
+        self.flushes += 1
+        self.rows_written += len(new_sessions) + len(responses) + len(snapshots) + len(deleted)
+
+    def _writer_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    # --- Чтение ---
+
+    def _load(self, user_id: int) -> Optional[Any]:
+        with self._pending_lock:
+            if user_id in self._deleted:
+                return None
+            pending = self._snapshots.get(user_id)
+        if pending is not None:
+            state = pending[1]
+        else:
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT state FROM bot_sessions WHERE user_id = ? AND updated_at >= ?",
+                    (user_id, self._resume_cutoff())
+                ).fetchone()
+            if row is None:
+                return None
+            state = row[0]
+        try:
+            return self.from_dict(json.loads(state))
+        except Exception as e:
+            print(f"Не удалось восстановить сессию {user_id}: {e}")
+            return None
+
+    def _resume_cutoff(self) -> str:
+        return (datetime.now() - timedelta(seconds=self.resume_ttl)).isoformat()
+
+    def _purge_stale(self) -> None:
+        """Удаляет брошенные незавершенные сессии старше resume_ttl"""
+        with self._db_lock, self._conn:
+            self._conn.execute("DELETE FROM bot_sessions WHERE updated_at < ?", (self._resume_cutoff(),))
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+
+def create_session_store(from_dict: Callable[[Dict], Any]) -> MemorySessionStore:
+    """Создает хранилище сессий по настройкам из переменных окружения"""
+    max_sessions = int(os.getenv("SESSION_MAX_IN_MEMORY", "1000"))
+    idle_ttl = float(os.getenv("SESSION_IDLE_TTL_HOURS", "6")) * 3600
+    if os.getenv("SESSION_BACKEND", "sqlite").lower() == "memory":
+        return MemorySessionStore(max_sessions=max_sessions, idle_ttl=idle_ttl)
+    return SQLiteSessionStore(
+        from_dict,
+        db_path=os.getenv("SESSION_DB_PATH") or None,
+        flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", "1")),
+        max_sessions=max_sessions,
+        idle_ttl=idle_ttl,
+        resume_ttl=float(os.getenv("SESSION_RESUME_TTL_DAYS", "7")) * 24 * 3600,
+    )
@@ -2,12 +2,21 @@
 Модуль для интерпретации результатов психологических тестов с помощью OpenAI GPT-5.1
 """
 import os
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 import openai
 from openai import OpenAI
 
 from .prompts import load_prompt
+from .interpretation_cache import get_interpretation_cache
+
+# Разделы отчёта, которые интерпретируются AI (порядок = порядок в отчёте)
+INTERPRETATION_SECTIONS = ('paei', 'disc', 'hexaco', 'soft_skills', 'general')
+
+# Таймаут одного запроса и общий дедлайн параллельной интерпретации (секунды)
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "60"))
+DEFAULT_TOTAL_DEADLINE = float(os.getenv("AI_TOTAL_DEADLINE", "120"))
 
 
 class AIInterpreter:
@@ -32,6 +41,44 @@ class AIInterpreter:
         
         self.client = OpenAI(api_key=self.api_key)
     
+    def _request(self, system_prompt: str, user_prompt: str, temperature: float = 0.3,
+                 timeout: Optional[float] = None) -> str:
+        """
+        Выполняет запрос к OpenAI API, пробрасывая ошибки
+        
+        Args:
+            system_prompt: Системный промпт
+            user_prompt: Пользовательский промпт
+            temperature: Температура для генерации (0-1)
+            timeout: Таймаут запроса в секундах (None - настройки клиента)
+            
+        Returns:
+            Ответ от GPT
+        """
+        cache = get_interpretation_cache()
+        cache_key = None
+        if cache.enabled:
+            cache_key = cache.make_key(self.model, system_prompt, user_prompt, temperature)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        client = self.client.with_options(timeout=timeout) if timeout else self.client
+        response = client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature
+        )
+        content = response.choices[0].message.content
+        
+        # Ошибки пробрасываются выше и в кэш не попадают
+        if cache_key and content:
+            cache.put(cache_key, content)
+        return content
+
     def _make_request(self, system_prompt: str, user_prompt: str, temperature: float = 0.3) -> str:
         """
         Выполняет запрос к OpenAI API
@@ -45,18 +92,24 @@ class AIInterpreter:
             Ответ от GPT
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=temperature
-            )
-            return response.choices[0].message.content
+            return self._request(system_prompt, user_prompt, temperature)
         except Exception as e:
             # В случае ошибки возвращаем базовую интерпретацию
             return f"Интерпретация недоступна (ошибка AI): {str(e)}"
+
+    @staticmethod
+    def _scores_prompt(system_file: str, intro: str, scores: Dict[str, float],
+                       dialog_context: str = "") -> Tuple[str, str]:
+        """Собирает пару (системный, пользовательский) промпт для одного теста"""
+        system_prompt = load_prompt(system_file)
+        
+        scores_text = ", ".join([f"{k}: {v}" for k, v in scores.items()])
+        user_prompt = f"{intro}: {scores_text}"
+        
+        if dialog_context:
+            user_prompt += f"\n\nКонтекст диалога: {dialog_context}"
+        
+        return system_prompt, user_prompt
     
     def interpret_paei(self, scores: Dict[str, float], dialog_context: str = "") -> str:
         """
@@ -69,15 +122,11 @@ class AIInterpreter:
         Returns:
             Текст интерпретации
         """
-        system_prompt = load_prompt("adizes_system_res.txt")
-        
-        scores_text = ", ".join([f"{k}: {v}" for k, v in scores.items()])
-        user_prompt = f"Проанализируй результаты теста PAEI: {scores_text}"
-        
-        if dialog_context:
-            user_prompt += f"\n\nКонтекст диалога: {dialog_context}"
-        
-        return self._make_request(system_prompt, user_prompt)
+        return self._make_request(*self._paei_prompts(scores, dialog_context))
+
+    def _paei_prompts(self, scores: Dict[str, float], dialog_context: str = "") -> Tuple[str, str]:
+        return self._scores_prompt("adizes_system_res.txt", "Проанализируй результаты теста PAEI",
+                                   scores, dialog_context)
     
     def interpret_adizes(self, choices: list, dialog_context: str = "") -> str:
         """
@@ -111,15 +160,11 @@ class AIInterpreter:
         Returns:
             Текст интерпретации
         """
-        system_prompt = load_prompt("disk_system_res.txt")
-        
-        scores_text = ", ".join([f"{k}: {v}" for k, v in scores.items()])
-        user_prompt = f"Проанализируй результаты теста DISC: {scores_text}"
-        
-        if dialog_context:
-            user_prompt += f"\n\nКонтекст диалога: {dialog_context}"
-        
-        return self._make_request(system_prompt, user_prompt)
+        return self._make_request(*self._disc_prompts(scores, dialog_context))
+
+    def _disc_prompts(self, scores: Dict[str, float], dialog_context: str = "") -> Tuple[str, str]:
+        return self._scores_prompt("disk_system_res.txt", "Проанализируй результаты теста DISC",
+                                   scores, dialog_context)
     
     def interpret_hexaco(self, scores: Dict[str, float], dialog_context: str = "") -> str:
         """
@@ -132,15 +177,11 @@ class AIInterpreter:
         Returns:
             Текст интерпретации
         """
-        system_prompt = load_prompt("hexaco_system_res.txt")
-        
-        scores_text = ", ".join([f"{k}: {v}" for k, v in scores.items()])
-        user_prompt = f"Проанализируй результаты теста HEXACO: {scores_text}"
-        
-        if dialog_context:
-            user_prompt += f"\n\nКонтекст диалога: {dialog_context}"
-        
-        return self._make_request(system_prompt, user_prompt)
+        return self._make_request(*self._hexaco_prompts(scores, dialog_context))
+
+    def _hexaco_prompts(self, scores: Dict[str, float], dialog_context: str = "") -> Tuple[str, str]:
+        return self._scores_prompt("hexaco_system_res.txt", "Проанализируй результаты теста HEXACO",
+                                   scores, dialog_context)
     
     def interpret_soft_skills(self, scores: Dict[str, float], dialog_context: str = "") -> str:
         """
@@ -153,15 +194,11 @@ class AIInterpreter:
         Returns:
             Текст интерпретации
         """
-        system_prompt = load_prompt("soft_system_res.txt")
-        
-        scores_text = ", ".join([f"{k}: {v}" for k, v in scores.items()])
-        user_prompt = f"Проанализируй результаты по soft skills: {scores_text}"
-        
-        if dialog_context:
-            user_prompt += f"\n\nКонтекст диалога: {dialog_context}"
-        
-        return self._make_request(system_prompt, user_prompt)
+        return self._make_request(*self._soft_skills_prompts(scores, dialog_context))
+
+    def _soft_skills_prompts(self, scores: Dict[str, float], dialog_context: str = "") -> Tuple[str, str]:
+        return self._scores_prompt("soft_system_res.txt", "Проанализируй результаты по soft skills",
+                                   scores, dialog_context)
 
     def interpret_general_conclusion(self, all_scores: Dict, dialog_context: str = "") -> str:
         """
@@ -180,6 +217,9 @@ class AIInterpreter:
         Returns:
             Текст общего заключения
         """
+        return self._make_request(*self._general_prompts(all_scores, dialog_context))
+
+    def _general_prompts(self, all_scores: Dict, dialog_context: str = "") -> Tuple[str, str]:
         system_prompt = load_prompt("general_system_res.txt")
         
         # Формируем текст с результатами всех тестов
@@ -206,7 +246,74 @@ class AIInterpreter:
         if dialog_context:
             user_prompt += f"\nКонтекст диалога: {dialog_context}"
         
-        return self._make_request(system_prompt, user_prompt)
+        return system_prompt, user_prompt
+
+    def interpret_all(self,
+                      paei_scores: Dict[str, float],
+                      disc_scores: Dict[str, float],
+                      hexaco_scores: Dict[str, float],
+                      soft_skills_scores: Dict[str, float],
+                      dialog_contexts: Optional[Dict[str, str]] = None,
+                      request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                      deadline: float = DEFAULT_TOTAL_DEADLINE) -> Dict[str, str]:
+        """
+        Параллельно запрашивает все пять интерпретаций (PAEI, DISC, HEXACO, Soft Skills, общее заключение)
+        
+        Запросы отправляются одновременно, поэтому общее время ≈ самый медленный
+        запрос, а не сумма всех пяти.
+        
+        Args:
+            *_scores: Баллы по каждому тесту
+            dialog_contexts: Контекст диалога по разделам {'paei': '...', ...}
+            request_timeout: Таймаут одного запроса к API (секунды)
+            deadline: Общий дедлайн на все запросы (секунды)
+            
+        Returns:
+            Словарь {раздел: текст} только для успешно полученных разделов.
+            Упавшие или не успевшие к дедлайну разделы отсутствуют - вызывающий
+            код подставляет для них статические интерпретации.
+        """
+        contexts = dialog_contexts or {}
+        all_scores = {
+            'paei': paei_scores,
+            'disc': disc_scores,
+            'hexaco': hexaco_scores,
+            'soft_skills': soft_skills_scores
+        }
+        prompts = {
+            'paei': self._paei_prompts(paei_scores, contexts.get('paei', "")),
+            'disc': self._disc_prompts(disc_scores, contexts.get('disc', "")),
+            'hexaco': self._hexaco_prompts(hexaco_scores, contexts.get('hexaco', "")),
+            'soft_skills': self._soft_skills_prompts(soft_skills_scores, contexts.get('soft_skills', "")),
+            'general': self._general_prompts(all_scores, contexts.get('general', "")),
+        }
+        
+        results: Dict[str, str] = {}
+        executor = ThreadPoolExecutor(max_workers=len(prompts), thread_name_prefix="ai-interpret")
+        try:
+            futures = {
+                executor.submit(self._request, system_prompt, user_prompt, timeout=request_timeout): section
+                for section, (system_prompt, user_prompt) in prompts.items()
+            }
+            done, not_done = wait(futures, timeout=deadline)
+            
+            for future in done:
+                section = futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    print(f"Ошибка AI интерпретации раздела {section}: {e}")
+                    continue
+                if text:
+                    results[section] = text
+            
+            for future in not_done:
+                print(f"AI интерпретация раздела {futures[future]} не успела к дедлайну {deadline} с")
+        finally:
+            # Не ждём зависшие запросы - их разделы получат статическую интерпретацию
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return results
 
 
 def get_ai_interpreter(api_key: Optional[str] = None) -> Optional[AIInterpreter]:
@@ -1,5 +1,17 @@
 from pathlib import Path
+from typing import Dict, Tuple
 import pandas as pd
 
+# Разобранные CSV банка вопросов: путь -> (mtime, DataFrame)
+_items_cache: Dict[Path, Tuple[float, pd.DataFrame]] = {}
+
 def load_items(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path)
+    """Читает CSV банка вопросов один раз (перечитывает при изменении файла)"""
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime
+    cached = _items_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_csv(path))
+        _items_cache[path] = cached
+    # Копия, чтобы вызывающий код не менял общий кэш
+    return cached[1].copy()
@@ -0,0 +1,255 @@
+"""
+Контентно-адресуемый кэш PNG диаграмм
+
+Набор баллов повторяется часто (PAEI - всего 5 вопросов, DISC/HEXACO округлены
+до 0.1), поэтому одинаковые диаграммы не перерисовываются: ключ строится из
+(тип диаграммы, метки, значения, параметры, размер, dpi), а при попадании
+готовый PNG копируется из кэша без вызова matplotlib. Диаграммы, которые
+рисуются в память (out_path=None или поток), берутся из кэша байтами.
+"""
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import threading
+from functools import wraps
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Версия формата ключа: увеличивать при изменении оформления диаграмм
+CHART_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "charts"
+
+
+class ChartCache:
+    """Дисковый LRU-кэш PNG диаграмм с ограничением по размеру и числу файлов"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = 200 * 1024 * 1024,
+                 max_entries: int = 5000, enabled: bool = True):
+        """
+        Args:
+            cache_dir: Папка кэша
+            max_bytes: Максимальный суммарный размер PNG в кэше
+            max_entries: Максимальное число файлов в кэше
+            enabled: Включён ли кэш
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[Path, int]] = None  # путь -> размер, лениво читается с диска
+
+    @staticmethod
+    def make_key(chart_type: str, labels, values, params: Dict[str, Any]) -> str:
+        """Строит ключ кэша по содержимому диаграммы"""
+        payload = {
+            "v": CHART_CACHE_VERSION,
+            "type": chart_type,
+            "labels": [str(label) for label in labels],
+            # Тип значения влияет на подписи (3 и 3.0 выводятся по-разному)
+            "values": [[type(v).__name__, round(float(v), 4)] for v in values],
+            "params": {k: params[k] for k in sorted(params)},
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def _load_index(self) -> Dict[Path, int]:
+        if self._index is None:
+            self._index = {}
+            if self.cache_dir.exists():
+                for png in self.cache_dir.glob("*/*.png"):
+                    try:
+                        self._index[png] = png.stat().st_size
+                    except OSError:
+                        pass
+        return self._index
+
+    def fetch(self, key: str, out_path: Path) -> bool:
+        """Копирует диаграмму из кэша в out_path. Возвращает True при попадании"""
+        cached = self._path_for(key)
+        try:
+            shutil.copyfile(cached, out_path)
+            os.utime(cached)  # отметка для LRU
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        """PNG из кэша байтами или None при промахе"""
+        cached = self._path_for(key)
+        try:
+            data = cached.read_bytes()
+            os.utime(cached)  # отметка для LRU
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def store(self, key: str, src_path: Path) -> None:
+        """Кладёт готовый PNG в кэш (атомарно) и вытесняет старые записи"""
+        self._save(key, lambda tmp_name: shutil.copyfile(src_path, tmp_name))
+
+    def put(self, key: str, data: bytes) -> None:
+        """Кладёт PNG из памяти в кэш"""
+        self._save(key, lambda tmp_name: Path(tmp_name).write_bytes(data))
+
+    def _save(self, key: str, write: Callable[[str], Any]) -> None:
+        cached = self._path_for(key)
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cached.parent, suffix=".tmp")
+            os.close(fd)
+            write(tmp_name)
+            os.replace(tmp_name, cached)
+            size = cached.stat().st_size
+        except OSError as e:
+            print(f"Не удалось сохранить диаграмму в кэш: {e}")
+            return
+        with self._lock:
+            self.stores += 1
+            index = self._load_index()
+            index[cached] = size
+            self._evict(index)
+
+    def _evict(self, index: Dict[Path, int]) -> None:
+        """Удаляет давно не использованные диаграммы при превышении лимитов"""
+        total = sum(index.values())
+        if total <= self.max_bytes and len(index) <= self.max_entries:
+            return
+
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        # Освобождаем с запасом, чтобы не вытеснять на каждой записи
+        target_bytes = int(self.max_bytes * 0.9)
+        target_entries = int(self.max_entries * 0.9)
+        for path in sorted(index, key=last_used):
+            if total <= target_bytes and len(index) <= target_entries:
+                break
+            total -= index.pop(path)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики"""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._index = None
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики попаданий/промахов кэша"""
+        with self._lock:
+            index = self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(index),
+                "size_bytes": sum(index.values()),
+                "cache_dir": str(self.cache_dir),
+            }
+
+
+_chart_cache: Optional[ChartCache] = None
+
+
+def get_chart_cache() -> ChartCache:
+    """Возвращает общий для процесса кэш диаграмм (настройки из переменных окружения)"""
+    global _chart_cache
+    if _chart_cache is None:
+        _chart_cache = ChartCache(
+            cache_dir=os.getenv("PSYTEST_CHART_CACHE_DIR") or None,
+            max_bytes=int(float(os.getenv("PSYTEST_CHART_CACHE_MAX_MB", "200")) * 1024 * 1024),
+            max_entries=int(os.getenv("PSYTEST_CHART_CACHE_MAX_ENTRIES", "5000")),
+            enabled=os.getenv("PSYTEST_CHART_CACHE", "true").lower() not in ("0", "false", "no"),
+        )
+    return _chart_cache
+
+
+def set_chart_cache(cache: Optional[ChartCache]) -> None:
+    """Подменяет общий кэш (например, в тестах)"""
+    global _chart_cache
+    _chart_cache = cache
+
+
+def cached_chart(chart_type: str, geometry: Dict[str, Any]) -> Callable:
+    """
+    Декоратор для функций вида make_*(labels, values, out_path=None, title="", ...)
+
+    out_path - путь к PNG или поток/None для диаграммы в памяти (см. charts._save_figure).
+
+    Args:
+        chart_type: Тип диаграммы (часть ключа)
+        geometry: Размер фигуры и dpi, с которыми рисует функция (часть ключа)
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_chart_cache()
+            if not cache.enabled:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            out_path = params.pop("out_path")
+            labels = params.pop("labels")
+            values = params.pop("values")
+            key = cache.make_key(chart_type, labels, values, {**params, **geometry})
+
+            if out_path is None or hasattr(out_path, "write"):
+                data = cache.get(key)
+                if data is not None:
+                    target = BytesIO() if out_path is None else out_path
+                    start = target.tell()
+                    target.write(data)
+                    target.seek(start)
+                    return target
+                result = func(*args, **kwargs)
+                start = result.tell()
+                cache.put(key, result.read())
+                result.seek(start)
+                return result
+
+            out_path = Path(out_path)
+            if cache.fetch(key, out_path):
+                return out_path
+
+            result = func(*args, **kwargs)
+            cache.store(key, out_path)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,60 @@
+"""
+Цветовые палитры диаграмм
+
+Вынесены из charts.py, чтобы векторные диаграммы (vector_charts.py) рисовались
+теми же цветами без импорта matplotlib.
+"""
+
+# Сбалансированная цветовая палитра для печати
+PRINT_COLORS = {
+    'primary': '#2C3E50',      # Глубокий синий-серый
+    'secondary': '#34495E',     # Средний серый
+    'light': '#BDC3C7',        # Светло-серый для сетки
+    'accent': '#3498DB',        # Яркий синий для акцентов
+    'fill': '#ECF0F1',          # Очень светлый для заливки
+    'background': '#FFFFFF'     # Белый фон
+}
+
+# Профессиональная палитра для психологических тестов
+# Основана на принципах психологии цвета и читаемости при печати
+PSYCH_COLORS = {
+    # PAEI цвета - спокойные профессиональные тона
+    'PAEI': {
+        'P': '#2E4A66',      # Глубокий синий (Производитель - стабильность, надежность)
+        'A': '#5B9BD5',      # Средний синий (Администратор - организованность, порядок)  
+        'E': '#4F81BD',      # Яркий синий (Предприниматель - инновации, динамика)
+        'I': '#8FAADC'       # Светлый синий (Интегратор - гармония, объединение)
+    },
+    
+    # DISC цвета - спокойная палитра в стиле PAEI (оттенки синего)
+    'DISC': {
+        'D': '#2E4A66',      # Глубокий синий (Доминирование - сила, решительность)
+        'I': '#4F81BD',      # Средний синий (Влияние - общительность, энтузиазм)
+        'S': '#5B9BD5',      # Яркий синий (Постоянство - стабильность, поддержка)
+        'C': '#8FAADC'       # Светлый синий (Соответствие - точность, анализ)
+    },
+    
+    # HEXACO цвета - гармоничная градация
+    'HEXACO': {
+        'H': '#8064A2',      # Фиолетовый (Честность-Скромность)
+        'E': '#C55A5A',      # Кораллово-красный (Эмоциональность)
+        'X': '#4F81BD',      # Синий (Экстраверсия)
+        'A': '#70AD47',      # Зеленый (Доброжелательность)
+        'C': '#E5B845',      # Желтый (Добросовестность)
+        'O': '#9BBB59'       # Оливковый (Открытость опыту)
+    },
+    
+    # Soft Skills цвета - мягкие тона
+    'SOFT_SKILLS': [
+        '#4F81BD',  # Синий
+        '#70AD47',  # Зеленый
+        '#E5B845',  # Желтый
+        '#C55A5A',  # Красный
+        '#8064A2',  # Фиолетовый
+        '#5B9BD5',  # Голубой
+        '#9BBB59',  # Оливковый
+        '#2E4A66',  # Темно-синий
+        '#8FAADC',  # Светло-синий
+        '#B85450'   # Темно-красный
+    ]
+}
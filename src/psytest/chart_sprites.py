@@ -0,0 +1,205 @@
+"""
+Готовые фоны радарных диаграмм ("спрайты") и быстрая отрисовка слоя данных
+
+Сетка, подписи осей, деления и заголовок радара одинаковы у всех пользователей -
+меняется только многоугольник значений. Поэтому фон рисуется matplotlib один раз
+на (тип диаграммы, метки, заголовок, шкала, размер, dpi), а для каждого отчёта
+на копию фона Pillow дорисовывает заливку, линию и маркеры. Сглаживание - через
+отрисовку слоя данных в увеличенном масштабе и уменьшение.
+"""
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageChops, ImageColor, ImageDraw
+
+# Во сколько раз слой данных рисуется крупнее (сглаживание линий и маркеров)
+SUPERSAMPLE = 3
+
+Point = Tuple[float, float]
+
+
+class RadarSprite:
+    """Фон радара в PNG-пикселях и положение концов осей на нём"""
+
+    def __init__(self, background: Image.Image, center: Point, axis_ends: Sequence[Point],
+                 max_value: float, dpi: float):
+        """
+        Args:
+            background: Фон (RGB) в том виде, в каком его сохранил бы savefig
+            center: Центр радара в пикселях фона
+            axis_ends: Концы осей (значение max_value) в пикселях фона, по порядку меток
+            max_value: Максимум радиальной шкалы
+            dpi: Разрешение фона (для перевода пунктов matplotlib в пиксели)
+        """
+        self.background = background
+        self.center = center
+        self.axis_ends = list(axis_ends)
+        self.max_value = max_value
+        self.dpi = dpi
+
+    @classmethod
+    def from_figure(cls, fig, ax, angles: Sequence[float], max_value: float,
+                    **savefig_kwargs) -> "RadarSprite":
+        """
+        Сохраняет фигуру (без данных) как фон и запоминает геометрию полярных осей
+
+        savefig_kwargs - те же параметры, с которыми сохраняется обычная диаграмма
+        (bbox_inches='tight' и pad_inches учитываются при пересчёте координат).
+        """
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        dpi = savefig_kwargs.get('dpi') or fig.dpi
+        if savefig_kwargs.get('bbox_inches') == 'tight':
+            bbox = fig.get_tightbbox(renderer).padded(savefig_kwargs.get('pad_inches', 0.1))
+            x0, y1 = bbox.x0 * dpi, bbox.y1 * dpi
+        else:
+            x0, y1 = 0.0, fig.get_figheight() * dpi
+        scale = dpi / fig.dpi
+
+        def to_pixels(theta: float, r: float) -> Point:
+            x, y = ax.transData.transform((theta, r))
+            return x * scale - x0, y1 - y * scale
+
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', **savefig_kwargs)
+        buffer.seek(0)
+        background = Image.open(buffer).convert('RGB')
+        return cls(background, to_pixels(0.0, 0.0), [to_pixels(a, max_value) for a in angles],
+                   max_value, dpi)
+
+    @property
+    def radius(self) -> float:
+        """Радиус внешнего круга шкалы в пикселях"""
+        (cx, cy), (ex, ey) = self.center, self.axis_ends[0]
+        return ((ex - cx) ** 2 + (ey - cy) ** 2) ** 0.5
+
+    def points(self, values: Sequence[float]) -> List[Point]:
+        """Вершины многоугольника значений (значения выше шкалы - за кругом, см. render)"""
+        cx, cy = self.center
+        result = []
+        for value, (ex, ey) in zip(values, self.axis_ends):
+            share = max(0.0, float(value)) / self.max_value
+            result.append((cx + (ex - cx) * share, cy + (ey - cy) * share))
+        return result
+
+    def render(self, values: Sequence[float], color: str, linewidth: float = 2.5,
+               markersize: float = 6, markeredgewidth: float = 2, fill_alpha: float = 0.15,
+               edge_color: str = '#FFFFFF') -> Image.Image:
+        """
+        Рисует значения на копии фона (размеры - в пунктах, как у ax.plot)
+
+        Returns:
+            Готовая диаграмма RGB
+        """
+        to_px = self.dpi / 72.0
+        points = self.points(values)
+        outer = (markersize / 2 + markeredgewidth / 2) * to_px
+        margin = max(outer, linewidth * to_px / 2) + 2
+
+        # Слой данных рисуется только в области многоугольника внутри круга шкалы:
+        # как и polar-оси matplotlib, всё за кругом обрезается
+        (cx, cy), radius = self.center, self.radius
+        left = max(0, int(max(min(x for x, _ in points) - margin, cx - radius - 1)))
+        top = max(0, int(max(min(y for _, y in points) - margin, cy - radius - 1)))
+        right = min(self.background.width, int(min(max(x for x, _ in points) + margin, cx + radius + 1)) + 1)
+        bottom = min(self.background.height, int(min(max(y for _, y in points) + margin, cy + radius + 1)) + 1)
+
+        s = SUPERSAMPLE
+        layer = Image.new('RGBA', ((right - left) * s, (bottom - top) * s), (0, 0, 0, 0))
+        scaled = [((x - left) * s, (y - top) * s) for x, y in points]
+        rgb = ImageColor.getrgb(color)[:3]
+
+        # Порядок как у matplotlib: заливка (zorder 1), линия, маркеры. Слой прозрачный,
+        # поэтому полупрозрачную заливку можно рисовать без смешивания, а непрозрачные
+        # линия и маркеры просто замещают её пиксели
+        draw = ImageDraw.Draw(layer)
+        draw.polygon(scaled, fill=rgb + (round(255 * fill_alpha),))
+        draw.line(scaled + scaled[:1], fill=rgb + (255,), width=max(1, round(linewidth * to_px * s)),
+                  joint='curve')
+        inner = (markersize / 2 - markeredgewidth / 2) * to_px * s
+        edge_rgb = ImageColor.getrgb(edge_color)[:3]
+        for x, y in scaled:
+            r = outer * s
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=edge_rgb + (255,))
+            draw.ellipse((x - inner, y - inner, x + inner, y + inner), fill=rgb + (255,))
+
+        clip = Image.new('L', layer.size, 0)
+        ccx, ccy, cr = (cx - left) * s, (cy - top) * s, radius * s
+        ImageDraw.Draw(clip).ellipse((ccx - cr, ccy - cr, ccx + cr, ccy + cr), fill=255)
+        layer.putalpha(ImageChops.multiply(layer.getchannel('A'), clip))
+
+        data = layer.reduce(s)
+        image = self.background.copy()
+        image.paste(data, (left, top), data)
+        return image
+
+
+class SpriteCache:
+    """Ограниченный LRU-кэш фонов в памяти процесса"""
+
+    def __init__(self, max_entries: int = 32, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.builds = 0
+        self._sprites: "OrderedDict[Hashable, RadarSprite]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], RadarSprite]) -> RadarSprite:
+        """Фон по ключу; при промахе рисуется build() (вне блокировки) и запоминается"""
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                return sprite
+        sprite = build()
+        with self._lock:
+            self.builds += 1
+            self._sprites[key] = sprite
+            while len(self._sprites) > self.max_entries:
+                self._sprites.popitem(last=False)
+        return sprite
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sprites.clear()
+            self.builds = 0
+
+
+_sprite_cache: Optional[SpriteCache] = None
+
+
+def get_sprite_cache() -> SpriteCache:
+    """Общий для процесса кэш фонов (PSYTEST_CHART_SPRITES=false - рисовать радары целиком)"""
+    global _sprite_cache
+    if _sprite_cache is None:
+        _sprite_cache = SpriteCache(
+            enabled=os.getenv("PSYTEST_CHART_SPRITES", "true").lower() not in ("0", "false", "no"),
+        )
+    return _sprite_cache
+
+
+def set_sprite_cache(cache: Optional[SpriteCache]) -> None:
+    """Подменяет общий кэш фонов (например, в тестах)"""
+    global _sprite_cache
+    _sprite_cache = cache
+
+
+def save_image(image: Image.Image, out_path):
+    """
+    Сохраняет диаграмму как _save_figure: путь, поток или None (новый BytesIO)
+
+    Быстрое сжатие (compress_level=1) почти вдвое дешевле стандартного при чуть
+    большем файле - кодирование PNG остаётся самой дорогой частью диаграммы.
+    """
+    target = BytesIO() if out_path is None else out_path
+    start = target.tell() if hasattr(target, 'write') else None
+    image.save(target, format='PNG', compress_level=1)
+    if start is not None:
+        target.seek(start)
+    return target
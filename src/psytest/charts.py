@@ -1,64 +1,59 @@
 
+from io import BytesIO
 from math import pi, log, sqrt
 from pathlib import Path
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-# Сбалансированная цветовая палитра для печати
-PRINT_COLORS = {
-    'primary': '#2C3E50',      # Глубокий синий-серый
-    'secondary': '#34495E',     # Средний серый
-    'light': '#BDC3C7',        # Светло-серый для сетки
-    'accent': '#3498DB',        # Яркий синий для акцентов
-    'fill': '#ECF0F1',          # Очень светлый для заливки
-    'background': '#FFFFFF'     # Белый фон
-}
+from .chart_cache import cached_chart
+from .chart_palette import PRINT_COLORS, PSYCH_COLORS
+from .chart_sprites import RadarSprite, get_sprite_cache, save_image
 
-# Профессиональная палитра для психологических тестов
-# Основана на принципах психологии цвета и читаемости при печати
-PSYCH_COLORS = {
-    # PAEI цвета - спокойные профессиональные тона
-    'PAEI': {
-        'P': '#2E4A66',      # Глубокий синий (Производитель - стабильность, надежность)
-        'A': '#5B9BD5',      # Средний синий (Администратор - организованность, порядок)  
-        'E': '#4F81BD',      # Яркий синий (Предприниматель - инновации, динамика)
-        'I': '#8FAADC'       # Светлый синий (Интегратор - гармония, объединение)
-    },
-    
-    # DISC цвета - спокойная палитра в стиле PAEI (оттенки синего)
-    'DISC': {
-        'D': '#2E4A66',      # Глубокий синий (Доминирование - сила, решительность)
-        'I': '#4F81BD',      # Средний синий (Влияние - общительность, энтузиазм)
-        'S': '#5B9BD5',      # Яркий синий (Постоянство - стабильность, поддержка)
-        'C': '#8FAADC'       # Светлый синий (Соответствие - точность, анализ)
-    },
-    
-    # HEXACO цвета - гармоничная градация
-    'HEXACO': {
-        'H': '#8064A2',      # Фиолетовый (Честность-Скромность)
-        'E': '#C55A5A',      # Кораллово-красный (Эмоциональность)
-        'X': '#4F81BD',      # Синий (Экстраверсия)
-        'A': '#70AD47',      # Зеленый (Доброжелательность)
-        'C': '#E5B845',      # Желтый (Добросовестность)
-        'O': '#9BBB59'       # Оливковый (Открытость опыту)
-    },
-    
-    # Soft Skills цвета - мягкие тона
-    'SOFT_SKILLS': [
-        '#4F81BD',  # Синий
-        '#70AD47',  # Зеленый
-        '#E5B845',  # Желтый
-        '#C55A5A',  # Красный
-        '#8064A2',  # Фиолетовый
-        '#5B9BD5',  # Голубой
-        '#9BBB59',  # Оливковый
-        '#2E4A66',  # Темно-синий
-        '#8FAADC',  # Светло-синий
-        '#B85450'   # Темно-красный
-    ]
+# Размеры фигур и dpi диаграмм отчёта (входят в ключ кэша диаграмм)
+CHART_GEOMETRY = {
+    'radar': {'figsize': (2, 2), 'dpi': 300},
+    'hexaco_radar': {'figsize': (2.5, 2.5), 'dpi': 300},
+    'paei_combined': {'figsize': (6, 6), 'dpi': 150},
+    'disc_combined': {'figsize': (5, 6), 'dpi': 150},
 }
 
+# Отступ tight_layout задаётся в долях базового шрифта (10 пт). Эти диаграммы
+# раньше рисовались с базовым шрифтом 12 пт, поэтому стандартный отступ 1.08 масштабирован
+TIGHT_LAYOUT_PAD = 1.08 * 12 / 10
+
+def _new_figure(figsize, dpi: int, facecolor: str = PRINT_COLORS['background']) -> Figure:
+    """
+    Создаёт фигуру с собственной Agg-канвой, без pyplot
+
+    Фигура не регистрируется в глобальном менеджере pyplot, а оформление задаётся
+    явно в каждом вызове (а не через общий rcParams), поэтому диаграммы можно
+    рисовать одновременно из нескольких потоков.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _set_spines_width(ax, width: float) -> None:
+    """Толщина рамки осей (вместо общего rcParams['axes.linewidth'])"""
+    for spine in ax.spines.values():
+        spine.set_linewidth(width)
+
+def _save_figure(fig, out_path, **savefig_kwargs):
+    """
+    Сохраняет фигуру в PNG
+
+    out_path - путь к файлу, открытый бинарный поток или None (PNG в новом
+    BytesIO). Поток возвращается установленным на начало PNG.
+    """
+    target = BytesIO() if out_path is None else out_path
+    start = target.tell() if hasattr(target, 'write') else None
+    fig.savefig(target, format='png', **savefig_kwargs)
+    if start is not None:
+        target.seek(start)
+    return target
+
 def normalize_chart_values(values: List[float], method: str = "adaptive") -> Tuple[List[float], float, str]:
     """
     Нормализует значения для сбалансированных диаграмм
@@ -118,63 +113,29 @@ def normalize_chart_values(values: List[float], method: str = "adaptive") -> Tup
     # По умолчанию возвращаем исходные значения
     return values, max(max_val, 10), "исходные"
 
-def make_radar(labels, values, out_path: Path, title: str = "", max_value: int = 100, 
-               normalize: bool = True, normalize_method: str = "adaptive"):
+def _radar_background(labels, actual_max: float, title: str, geometry, label_fontsize: float,
+                      title_pad: float, title_fontsize: float):
     """
-    Создает сбалансированную радарную диаграмму, оптимизированную для печати
-    
-    Args:
-        labels: Названия осей
-        values: Значения для каждой оси
-        out_path: Путь для сохранения файла
-        title: Заголовок диаграммы
-        max_value: Максимальное значение шкалы (игнорируется при normalize=True)
-        normalize: Применять ли нормализацию для баланса
-        normalize_method: Метод нормализации
+    Рисует неизменную часть радара: полярные оси, сетку, подписи и заголовок
+
+    Returns:
+        (fig, ax, angles) - фигура, полярные оси и углы осей (без замыкающего)
     """
-    # Нормализуем значения если требуется
-    if normalize:
-        norm_values, max_norm, method_used = normalize_chart_values(values, normalize_method)
-        actual_max = max_norm * 1.1
-        display_values = norm_values
-        
-        # Добавляем информацию о нормализации в заголовок
-        if method_used not in ["без_нормализации", "исходные"] and title:
-            title = f"{title} (норм: {method_used})"
-    else:
-        display_values = values
-        actual_max = max_value
-        method_used = "отключена"
-    
-    # Настройка matplotlib для качественной печати
-    plt.rcParams.update({
-        'font.size': 10,
-        'font.family': 'sans-serif',
-        'axes.linewidth': 1.0,
-        'grid.linewidth': 0.6,
-        'lines.linewidth': 2.0,
-        'figure.dpi': 300,
-        'savefig.dpi': 300,
-        'savefig.bbox': 'tight',
-        'savefig.pad_inches': 0.15
-    })
-    
     N = len(labels)
     angles = [n / float(N) * 2 * pi for n in range(N)]
-    angles += angles[:1]
-    vals = list(display_values) + display_values[:1]
     
     # Создание фигуры
-    fig = plt.figure(figsize=(2, 2), facecolor=PRINT_COLORS['background'])
-    ax = plt.subplot(111, polar=True)
+    fig = _new_figure(geometry['figsize'], geometry['dpi'])
+    ax = fig.add_subplot(111, polar=True)
+    _set_spines_width(ax, 1.0)
     
     # Настройка полярных осей
     ax.set_theta_offset(pi / 2)
     ax.set_theta_direction(-1)
     
     # Установка меток осей
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels, fontsize=8, color=PRINT_COLORS['primary'])
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, fontsize=label_fontsize, color=PRINT_COLORS['primary'])
     
     # Улучшенная радиальная сетка
     if actual_max <= 5:
@@ -194,27 +155,107 @@ def make_radar(labels, values, out_path: Path, title: str = "", max_value: int =
     ax.grid(True, color=PRINT_COLORS['light'], linewidth=0.6, alpha=0.8)
     ax.set_facecolor(PRINT_COLORS['background'])
     
+    # Заголовок
+    if title:
+        ax.set_title(title, pad=title_pad, fontsize=title_fontsize, fontweight='bold', 
+                     color=PRINT_COLORS['primary'])
+    return fig, ax, angles
+
+def _render_radar(chart_type: str, labels, values, out_path, title: str, actual_max: float,
+                  geometry, color: str, label_fontsize: float, title_pad: float,
+                  title_fontsize: float, pad_inches: float):
+    """
+    Рисует радар: по готовому фону (chart_sprites) или целиком через matplotlib
+
+    Фон зависит только от меток, заголовка, шкалы и геометрии, поэтому при
+    включённых спрайтах matplotlib вызывается один раз на такой набор.
+    """
+    background = (labels, actual_max, title, geometry, label_fontsize, title_pad, title_fontsize)
+    save_kwargs = {'bbox_inches': 'tight', 'pad_inches': pad_inches, 'dpi': geometry['dpi'],
+                   'facecolor': PRINT_COLORS['background'], 'edgecolor': 'none'}
+    
+    sprites = get_sprite_cache()
+    if sprites.enabled:
+        key = (chart_type, tuple(labels), title, float(actual_max), tuple(geometry['figsize']),
+               geometry['dpi'], pad_inches)
+        
+        def build_sprite() -> RadarSprite:
+            fig, ax, angles = _radar_background(*background)
+            return RadarSprite.from_figure(fig, ax, angles, actual_max, **save_kwargs)
+        
+        sprite = sprites.get(key, build_sprite)
+        return save_image(sprite.render(values, color), out_path)
+    
+    fig, ax, angles = _radar_background(*background)
+    angles = angles + angles[:1]
+    vals = list(values) + list(values)[:1]
+    
     # Рисование диаграммы с улучшенным стилем
-    line = ax.plot(angles, vals, color=PRINT_COLORS['accent'], linewidth=2.5, 
-                  marker='o', markersize=6, markerfacecolor=PRINT_COLORS['accent'], 
-                  markeredgecolor=PRINT_COLORS['background'], markeredgewidth=2)
+    ax.plot(angles, vals, color=color, linewidth=2.5, 
+            marker='o', markersize=6, markerfacecolor=color, 
+            markeredgecolor=PRINT_COLORS['background'], markeredgewidth=2)
     
     # Заливка области
-    ax.fill(angles, vals, color=PRINT_COLORS['accent'], alpha=0.15)
-    
-    # Заголовок
-    if title:
-        plt.title(title, pad=20, fontsize=9, fontweight='bold', 
-                 color=PRINT_COLORS['primary'])
+    ax.fill(angles, vals, color=color, alpha=0.15)
     
     # Сохранение
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.15, facecolor=PRINT_COLORS['background'], 
-                edgecolor='none')
-    plt.close(fig)
-    return out_path
+    return _save_figure(fig, out_path, **save_kwargs)
+
+def prerender_radar_backgrounds(radars) -> int:
+    """
+    Рисует фоны радаров отчёта заранее (прогрев воркера)
 
-def make_bar_chart(labels, values, out_path: Path, title: str = "", 
+    Args:
+        radars: Пары (функция make_radar/make_hexaco_radar, kwargs вызова без values)
+
+    Returns:
+        Число нарисованных фонов
+    """
+    sprites = get_sprite_cache()
+    if not sprites.enabled:
+        return 0
+    builds = sprites.builds
+    for make_chart, kwargs in radars:
+        labels = kwargs['labels']
+        # Диаграмма в память мимо кэша PNG: нужен только побочный эффект - фон в кэше спрайтов
+        getattr(make_chart, '__wrapped__', make_chart)(values=[0] * len(labels), out_path=None, **kwargs)
+    return sprites.builds - builds
+
+@cached_chart('radar', CHART_GEOMETRY['radar'])
+def make_radar(labels, values, out_path: Optional[Path] = None, title: str = "", max_value: int = 100, 
+               normalize: bool = True, normalize_method: str = "adaptive"):
+    """
+    Создает сбалансированную радарную диаграмму, оптимизированную для печати
+    
+    Args:
+        labels: Названия осей
+        values: Значения для каждой оси
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
+        title: Заголовок диаграммы
+        max_value: Максимальное значение шкалы (игнорируется при normalize=True)
+        normalize: Применять ли нормализацию для баланса
+        normalize_method: Метод нормализации
+    """
+    # Нормализуем значения если требуется
+    if normalize:
+        norm_values, max_norm, method_used = normalize_chart_values(values, normalize_method)
+        actual_max = max_norm * 1.1
+        display_values = norm_values
+        
+        # Добавляем информацию о нормализации в заголовок
+        if method_used not in ["без_нормализации", "исходные"] and title:
+            title = f"{title} (норм: {method_used})"
+    else:
+        display_values = values
+        actual_max = max_value
+        method_used = "отключена"
+    
+    geometry = CHART_GEOMETRY['radar']
+    return _render_radar('radar', labels, display_values, out_path, title, actual_max, geometry,
+                         color=PRINT_COLORS['accent'], label_fontsize=8,
+                         title_pad=20, title_fontsize=9, pad_inches=0.15)
+
+def make_bar_chart(labels, values, out_path: Optional[Path] = None, title: str = "", 
                    max_value: int = 100, horizontal: bool = False,
                    normalize: bool = True, normalize_method: str = "adaptive"):
     """
@@ -223,7 +264,7 @@ def make_bar_chart(labels, values, out_path: Path, title: str = "",
     Args:
         labels: Названия категорий
         values: Значения для каждой категории
-        out_path: Путь для сохранения файла
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
         title: Заголовок диаграммы
         max_value: Максимальное значение шкалы (игнорируется при normalize=True)
         horizontal: Горизонтальная ориентация
@@ -244,21 +285,10 @@ def make_bar_chart(labels, values, out_path: Path, title: str = "",
         actual_max = max_value * 1.15
         method_used = "отключена"
     
-    plt.rcParams.update({
-        'font.size': 10,
-        'font.family': 'sans-serif',
-        'axes.linewidth': 1.0,
-        'figure.dpi': 300,
-        'savefig.dpi': 300,
-        'savefig.bbox': 'tight',
-        'savefig.pad_inches': 0.2
-    })
-    
     # Создание фигуры
-    if horizontal:
-        fig, ax = plt.subplots(figsize=(7, 5), facecolor=PRINT_COLORS['background'])
-    else:
-        fig, ax = plt.subplots(figsize=(8, 6), facecolor=PRINT_COLORS['background'])
+    fig = _new_figure((7, 5) if horizontal else (8, 6), 300)
+    ax = fig.add_subplot()
+    _set_spines_width(ax, 1.0)
     
     if horizontal:
         bars = ax.barh(labels, display_values, color=PRINT_COLORS['accent'], 
@@ -313,25 +343,23 @@ def make_bar_chart(labels, values, out_path: Path, title: str = "",
     
     # Настройка размещения
     try:
-        plt.tight_layout(pad=1.5)
+        fig.tight_layout(pad=1.5)
     except:
-        plt.subplots_adjust(bottom=0.15, left=0.12, right=0.95, top=0.9)
+        fig.subplots_adjust(bottom=0.15, left=0.12, right=0.95, top=0.9)
     
     # Сохранение
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.25, facecolor=PRINT_COLORS['background'], 
-                edgecolor='none')
-    plt.close(fig)
-    return out_path
+    return _save_figure(fig, out_path, bbox_inches='tight', 
+                        pad_inches=0.25, facecolor=PRINT_COLORS['background'], 
+                        edgecolor='none', dpi=300)
 
-def make_pie_chart(labels, values, out_path: Path, title: str = "") -> Path:
+def make_pie_chart(labels, values, out_path: Optional[Path] = None, title: str = "") -> Path:
     """
     Создает круговую диаграмму для печати
     
     Args:
         labels: Названия категорий
         values: Значения для каждой категории (без нормализации)
-        out_path: Путь для сохранения файла
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
         title: Заголовок диаграммы
     """
     # Подготовка данных
@@ -342,18 +370,8 @@ def make_pie_chart(labels, values, out_path: Path, title: str = "") -> Path:
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
     
     # Создание диаграммы
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Настройка matplotlib для качественной печати
-    plt.rcParams.update({
-        'font.size': 12,
-        'axes.titlesize': 14,
-        'axes.labelsize': 12,
-        'xtick.labelsize': 11,
-        'ytick.labelsize': 11,
-        'legend.fontsize': 11,
-        'figure.titlesize': 16
-    })
+    fig = _new_figure((10, 8), 300)
+    ax = fig.add_subplot()
     
     # Создание круговой диаграммы с отключенными автоподписями
     wedges, texts, autotexts = ax.pie(
@@ -395,21 +413,20 @@ def make_pie_chart(labels, values, out_path: Path, title: str = "") -> Path:
     ax.set_facecolor(PRINT_COLORS['background'])
     
     # Сохранение
-    plt.tight_layout()
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.25, facecolor=PRINT_COLORS['background'], 
-                edgecolor='none', dpi=300)
-    plt.close(fig)
-    return out_path
+    fig.tight_layout(pad=TIGHT_LAYOUT_PAD)
+    return _save_figure(fig, out_path, bbox_inches='tight', 
+                        pad_inches=0.25, facecolor=PRINT_COLORS['background'], 
+                        edgecolor='none', dpi=300)
 
-def make_paei_combined_chart(labels, values, out_path: Path, title: str = "") -> Path:
+@cached_chart('paei_combined', CHART_GEOMETRY['paei_combined'])
+def make_paei_combined_chart(labels, values, out_path: Optional[Path] = None, title: str = "") -> Path:
     """
     Создает круговую диаграмму для PAEI (убрана столбиковая)
     
     Args:
         labels: Названия категорий PAEI
         values: Значения для каждой категории
-        out_path: Путь для сохранения файла
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
         title: Заголовок диаграммы
     """
     # Сбалансированная цветовая схема PAEI
@@ -429,20 +446,11 @@ def make_paei_combined_chart(labels, values, out_path: Path, title: str = "") ->
     
     russian_labels = [label_mapping.get(label, label) for label in labels]
     chart_colors = [colors.get(label, '#4F81BD') for label in labels]
-    
-    # Настройка matplotlib для качественной печати
-    plt.rcParams.update({
-        'font.size': 12,
-        'font.family': 'sans-serif',
-        'axes.linewidth': 1.2,
-        'figure.dpi': 150,
-        'savefig.dpi': 150,
-        'savefig.bbox': 'tight',
-        'savefig.pad_inches': 0.3
-    })
+    geometry = CHART_GEOMETRY['paei_combined']
     
     # Создание фигуры только с круговой диаграммой
-    fig, ax = plt.subplots(1, 1, figsize=(6, 6), facecolor='white')
+    fig = _new_figure(geometry['figsize'], geometry['dpi'], 'white')
+    ax = fig.add_subplot()
     
     # === КРУГОВАЯ ДИАГРАММА ===
     wedges, texts = ax.pie(values, labels=None, colors=chart_colors,
@@ -474,23 +482,22 @@ def make_paei_combined_chart(labels, values, out_path: Path, title: str = "") ->
     fig.suptitle(title, fontsize=18, fontweight='bold', color='#2C3E50', y=0.95)
     
     # Настройка размещения
-    plt.tight_layout()
+    fig.tight_layout(pad=TIGHT_LAYOUT_PAD)
     
     # Сохранение
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.3, facecolor='white', 
-                edgecolor='none', dpi=150)
-    plt.close(fig)
-    return out_path
+    return _save_figure(fig, out_path, bbox_inches='tight', 
+                        pad_inches=0.3, facecolor='white', 
+                        edgecolor='none', dpi=geometry['dpi'])
 
-def make_disc_combined_chart(labels, values, out_path: Path, title: str = "") -> Path:
+@cached_chart('disc_combined', CHART_GEOMETRY['disc_combined'])
+def make_disc_combined_chart(labels, values, out_path: Optional[Path] = None, title: str = "") -> Path:
     """
     Создает столбиковую диаграмму для DISC (убрана круговая)
     
     Args:
         labels: Названия категорий DISC
         values: Значения для каждой категории
-        out_path: Путь для сохранения файла
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
         title: Заголовок диаграммы
     """
     # Сбалансированная цветовая схема DISC
@@ -506,20 +513,12 @@ def make_disc_combined_chart(labels, values, out_path: Path, title: str = "") ->
     
     russian_labels = [label_mapping.get(label, label) for label in labels]
     chart_colors = [colors.get(label, '#3498DB') for label in labels]
-    
-    # Настройка matplotlib для качественной печати
-    plt.rcParams.update({
-        'font.size': 12,
-        'font.family': 'sans-serif',
-        'axes.linewidth': 1.2,
-        'figure.dpi': 150,
-        'savefig.dpi': 150,
-        'savefig.bbox': 'tight',
-        'savefig.pad_inches': 0.3
-    })
+    geometry = CHART_GEOMETRY['disc_combined']
     
     # Создание фигуры только со столбиковой диаграммой
-    fig, ax = plt.subplots(1, 1, figsize=(5, 6), facecolor='white')
+    fig = _new_figure(geometry['figsize'], geometry['dpi'], 'white')
+    ax = fig.add_subplot()
+    _set_spines_width(ax, 1.2)
     
     # === СТОЛБИКОВАЯ ДИАГРАММА ===
     bars = ax.bar(labels, values, color=chart_colors, 
@@ -551,16 +550,15 @@ def make_disc_combined_chart(labels, values, out_path: Path, title: str = "") ->
     fig.suptitle(title, fontsize=18, fontweight='bold', color='#2C3E50', y=0.95)
     
     # Настройка размещения
-    plt.tight_layout()
+    fig.tight_layout(pad=TIGHT_LAYOUT_PAD)
     
     # Сохранение
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.3, facecolor='white', 
-                edgecolor='none', dpi=150)
-    plt.close(fig)
-    return out_path
+    return _save_figure(fig, out_path, bbox_inches='tight', 
+                        pad_inches=0.3, facecolor='white', 
+                        edgecolor='none', dpi=geometry['dpi'])
 
-def make_hexaco_radar(labels, values, out_path: Path, title: str = "", max_value: int = 100, 
+@cached_chart('hexaco_radar', CHART_GEOMETRY['hexaco_radar'])
+def make_hexaco_radar(labels, values, out_path: Optional[Path] = None, title: str = "", max_value: int = 100, 
                      normalize: bool = True, normalize_method: str = "adaptive"):
     """
     Создает радарную диаграмму HEXACO с расшифровками аббревиатур
@@ -568,7 +566,7 @@ def make_hexaco_radar(labels, values, out_path: Path, title: str = "", max_value
     Args:
         labels: Аббревиатуры HEXACO (H, E, X, A, C, O)
         values: Значения для каждой оси
-        out_path: Путь для сохранения файла
+        out_path: Путь для сохранения файла (None - PNG в памяти, BytesIO)
         title: Заголовок диаграммы
         max_value: Максимальное значение шкалы (игнорируется при normalize=True)
         normalize: Применять ли нормализацию для баланса
@@ -599,60 +597,9 @@ def make_hexaco_radar(labels, values, out_path: Path, title: str = "", max_value
         display_values = values
         actual_max = max_value
         method_used = "отключена"
-    # Настройка matplotlib для качественной печати
-    plt.rcParams.update({
-        'font.size': 10,
-        'font.family': 'sans-serif',
-        'axes.linewidth': 1.0,
-        'grid.linewidth': 0.6,
-        'lines.linewidth': 2.0,
-        'figure.dpi': 300,
-        'savefig.dpi': 300,
-        'savefig.bbox': 'tight',
-        'savefig.pad_inches': 0.15
-    })
-    N = len(extended_labels)
-    angles = [n / float(N) * 2 * pi for n in range(N)]
-    angles += angles[:1]
-    vals = list(display_values) + display_values[:1]
-    # Создание фигуры с увеличенным размером для длинных лейблов
-    fig = plt.figure(figsize=(2.5, 2.5), facecolor=PRINT_COLORS['background'])
-    ax = plt.subplot(111, polar=True)
-    # Настройка полярных осей
-    ax.set_theta_offset(pi / 2)
-    ax.set_theta_direction(-1)
-    # Установка меток осей с расширенными названиями
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(extended_labels, fontsize=9, color=PRINT_COLORS['primary'])
-    # Улучшенная радиальная сетка
-    if actual_max <= 5:
-        tick_step = 1
-    elif actual_max <= 8:
-        tick_step = 2
-    else:
-        tick_step = max(1, int(actual_max / 4))
-    ax.set_ylim(0, actual_max)
-    ticks = np.arange(0, actual_max, tick_step)
-    ax.set_yticks(ticks)
-    ax.set_yticklabels([f'{t:.1f}' for t in ticks], 
-                      fontsize=8, color=PRINT_COLORS['secondary'])
-    # Улучшенная стилизация сетки
-    ax.grid(True, color=PRINT_COLORS['light'], linewidth=0.6, alpha=0.8)
-    ax.set_facecolor(PRINT_COLORS['background'])
-    # Рисование диаграммы с цветом HEXACO
+    geometry = CHART_GEOMETRY['hexaco_radar']
     hexaco_color = PSYCH_COLORS['HEXACO'].get('H', PRINT_COLORS['accent'])  # Используем цвет H как основной
-    line = ax.plot(angles, vals, color=hexaco_color, linewidth=2.5, 
-                  marker='o', markersize=6, markerfacecolor=hexaco_color, 
-                  markeredgecolor=PRINT_COLORS['background'], markeredgewidth=2)
-    # Заливка области
-    ax.fill(angles, vals, color=hexaco_color, alpha=0.15)
-    # Заголовок
-    if title:
-        plt.title(title, pad=25, fontsize=11, fontweight='bold', 
-                 color=PRINT_COLORS['primary'])
-    # Сохранение
-    fig.savefig(out_path, format='png', bbox_inches='tight', 
-                pad_inches=0.2, facecolor=PRINT_COLORS['background'], 
-                edgecolor='none')
-    plt.close(fig)
-    return out_path
+    # Увеличенный размер фигуры и отступы - для длинных лейблов
+    return _render_radar('hexaco_radar', extended_labels, display_values, out_path, title, actual_max,
+                         geometry, color=hexaco_color, label_fontsize=9,
+                         title_pad=25, title_fontsize=11, pad_inches=0.2)
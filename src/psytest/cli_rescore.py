@@ -0,0 +1,203 @@
+"""
+Пересчёт баллов прошлых сессий по таблице responses
+
+Нужен после изменения ключей в data/bank/*_items.csv, вопросов в
+data/prompts. Ответы читаются из SQLite частями (fetchmany), считаются
+векторизованным ScoringEngine и записываются в scores пачками (executemany)
+в одной транзакции на часть. Память ограничена размером части: сессия,
+разрезанная границей части, переносится в следующую. После пересчёта нормы
+(src/psytest/norms.py) строятся заново и scores.norm заполняется процентилями.
+
+Запуск из корня репозитория:
+    python -m src.psytest.cli_rescore --db data/psytest.sqlite3
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bank import load_items
+from .norms import NormStore
+from .question_bank import PAEI_CODES, QuestionBank, get_question_bank
+from .scoring import ScoringEngine
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB = ROOT / "data" / "psytest.sqlite3"
+BANK_DIR = ROOT / "data" / "bank"
+
+RESPONSE_COLUMNS = ["session_id", "test_id", "item_id", "answer"]
+
+
+@dataclass(frozen=True)
+class TestDefinition:
+    """Как считать один test_id из responses"""
+    test_id: str
+    engine: Optional[ScoringEngine] = None     # Likert: сумма по шкалам с учётом reverse
+    choices: Tuple[str, ...] = ()              # выбор варианта: ответ N -> шкала choices[N - 1]
+
+
+def _bot_engine(question_set) -> ScoringEngine:
+    """Вопросы бота адресуются порядковым номером (item_id = индекс вопроса)"""
+    items = pd.DataFrame({
+        'item_id': [q.index for q in question_set],
+        'scale': [q.scale for q in question_set],
+        'reverse': 0,
+    })
+    return ScoringEngine(items)
+
+
+def build_definitions(question_bank: Optional[QuestionBank] = None,
+                      bank_dir: Path = BANK_DIR) -> Dict[str, TestDefinition]:
+    """Тесты бота (paei, disc, ...) и банка CSV (PAEI, DISC, HEXACO)"""
+    question_bank = question_bank or get_question_bank()
+    definitions = {
+        'paei': TestDefinition('paei', choices=PAEI_CODES),
+        'disc': TestDefinition('disc', _bot_engine(question_bank.disc)),
+        'hexaco': TestDefinition('hexaco', _bot_engine(question_bank.hexaco)),
+        'soft_skills': TestDefinition('soft_skills', _bot_engine(question_bank.soft_skills)),
+    }
+    for test_id in ("PAEI", "DISC", "HEXACO"):
+        path = Path(bank_dir) / f"{test_id.lower()}_items.csv"
+        if path.exists():
+            definitions[test_id] = TestDefinition(test_id, ScoringEngine(load_items(path)))
+    return definitions
+
+
+def score_chunk(df: pd.DataFrame, definition: TestDefinition) -> pd.DataFrame:
+    """Сырые баллы всех сессий части по одному тесту: session_id, scale, raw"""
+    if definition.engine is not None:
+        scores = definition.engine.score_many(df)
+    else:
+        codes, sessions = pd.factorize(df['session_id'].to_numpy())
+        answers = df['answer'].to_numpy()
+        valid = (answers >= 1) & (answers <= len(definition.choices))
+        counts = np.zeros((len(sessions), len(definition.choices)))
+        np.add.at(counts, (codes[valid], answers[valid] - 1), 1)
+        rows, cols = np.indices(counts.shape).reshape(2, -1)
+        scores = pd.DataFrame({
+            'session_id': sessions[rows],
+            'scale': np.asarray(definition.choices)[cols],
+            'raw': counts[rows, cols],
+        })
+    return scores[['session_id', 'scale', 'raw']]
+
+
+def iter_session_chunks(conn: sqlite3.Connection, chunk_size: int,
+                        tests: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """Ответы частями по ~chunk_size строк; сессия целиком попадает в одну часть"""
+    query = "SELECT session_id, test_id, item_id, answer FROM responses"
+    params: List = []
+    if tests:
+        query += f" WHERE test_id IN ({', '.join('?' * len(tests))})"
+        params.extend(tests)
+    query += " ORDER BY session_id, test_id"
+
+    cursor = conn.execute(query, params)
+    carry: List[tuple] = []
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        rows = carry + rows
+        # Последняя сессия может продолжиться в следующей части
+        last_session = rows[-1][0]
+        split = len(rows)
+        while split > 0 and rows[split - 1][0] == last_session:
+            split -= 1
+        if split == 0:
+            carry = rows    # одна сессия больше части - читаем дальше
+            continue
+        rows, carry = rows[:split], rows[split:]
+        yield pd.DataFrame.from_records(rows, columns=RESPONSE_COLUMNS)
+    if carry:
+        yield pd.DataFrame.from_records(carry, columns=RESPONSE_COLUMNS)
+
+
+def rescore(db_path: Path, chunk_size: int = 50000, tests: Optional[Sequence[str]] = None,
+            definitions: Optional[Dict[str, TestDefinition]] = None,
+            update_norms: bool = True) -> Dict[str, float]:
+    """
+    Пересчитывает scores для всех сессий с ответами
+
+    Прежние баллы пересчитанных (session_id, test_id) удаляются в той же
+    транзакции, поэтому повторный запуск не создаёт дублей. Новые баллы
+    получают новые id, поэтому нормы строятся заново, а не дополняются.
+
+    Returns:
+        Статистика: строк ответов, сессий, записано баллов, пропущено строк,
+        заполнено процентилей, секунд, строк/с
+    """
+    definitions = definitions or build_definitions()
+    stats = {'responses': 0, 'sessions': 0, 'scores': 0, 'skipped': 0}
+    started = time.perf_counter()
+
+    # Одно соединение: чтение responses и запись scores не блокируют друг друга
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for chunk in iter_session_chunks(conn, chunk_size, tests):
+            ts = datetime.now().isoformat()
+            stats['responses'] += len(chunk)
+            stats['sessions'] += chunk['session_id'].nunique()
+
+            replaced: List[Tuple[str, str]] = []
+            inserts: List[tuple] = []
+            for test_id, df_test in chunk.groupby('test_id', sort=False):
+                definition = definitions.get(test_id)
+                if definition is None:
+                    stats['skipped'] += len(df_test)
+                    continue
+                scores = score_chunk(df_test, definition)
+                replaced.extend((session_id, test_id) for session_id in df_test['session_id'].unique())
+                inserts.extend(
+                    (session_id, test_id, scale, float(raw), None, ts)
+                    for session_id, scale, raw in scores.itertuples(index=False)
+                )
+
+            with conn:
+                conn.executemany("DELETE FROM scores WHERE session_id = ? AND test_id = ?", replaced)
+                conn.executemany(
+                    "INSERT INTO scores (session_id, test_id, scale, raw, norm, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                    inserts
+                )
+            stats['scores'] += len(inserts)
+    finally:
+        conn.close()
+
+    if update_norms:
+        store = NormStore(db_path, chunk_size=chunk_size)
+        store.rebuild()
+        stats['norms'] = store.fill_norms(only_missing=False)
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_second'] = stats['responses'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пересчёт баллов по таблице responses")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="база SQLite (data/schema.sql)")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="строк ответов за одно чтение")
+    parser.add_argument("--tests", nargs="*", help="только эти test_id (по умолчанию все известные)")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"База не найдена: {args.db}")
+        return 1
+
+    stats = rescore(args.db, chunk_size=args.chunk_size, tests=args.tests)
+    print(f"Ответов: {stats['responses']}, сессий: {stats['sessions']}, "
+          f"записано баллов: {stats['scores']}, пропущено строк: {stats['skipped']}, "
+          f"процентилей: {stats['norms']}")
+    print(f"Время: {stats['seconds']:.2f} с, {stats['rows_per_second']:.0f} строк/с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
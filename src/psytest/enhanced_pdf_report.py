@@ -14,12 +14,11 @@ from reportlab.lib.colors import Color, black, white
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.platypus import PageBreak, KeepTogether
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
 import numpy as np
 
 from .charts import make_radar, make_bar_chart
+from .fonts import get_font_set
 
 # Константы для минималистичного дизайна
 class DesignConfig:
@@ -79,28 +78,11 @@ class EnhancedPDFReport:
         self._setup_fonts()
         
     def _setup_fonts(self):
-        """Настраивает шрифты с поддержкой кириллицы (DejaVuSans)"""
-        import os
-        from reportlab.pdfbase.ttfonts import TTFont
-        from reportlab.pdfbase import pdfmetrics
-        font_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'fonts', 'DejaVuSans.ttf')
-        if os.path.exists(font_path):
-            try:
-                pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
-                DesignConfig.TITLE_FONT = "DejaVuSans"
-                DesignConfig.BODY_FONT = "DejaVuSans"
-                DesignConfig.SMALL_FONT = "DejaVuSans"
-                print("✅ Используется шрифт DejaVuSans для всех текстов PDF")
-            except Exception as e:
-                print(f"⚠️ Ошибка регистрации DejaVuSans: {e}")
-                DesignConfig.TITLE_FONT = "Times-Bold"
-                DesignConfig.BODY_FONT = "Times-Roman"
-                DesignConfig.SMALL_FONT = "Times-Roman"
-        else:
-            print(f"⚠️ Не найден файл шрифта: {font_path}")
-            DesignConfig.TITLE_FONT = "Times-Bold"
-            DesignConfig.BODY_FONT = "Times-Roman"
-            DesignConfig.SMALL_FONT = "Times-Roman"
+        """Настраивает шрифты с поддержкой кириллицы (регистрируются один раз на процесс)"""
+        font_set = get_font_set()
+        DesignConfig.TITLE_FONT = font_set.bold
+        DesignConfig.BODY_FONT = font_set.regular
+        DesignConfig.SMALL_FONT = font_set.regular
         
     def create_visual_bar(self, value: float, max_value: float = 10, 
                          width: int = 100) -> str:
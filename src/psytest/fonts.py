@@ -0,0 +1,115 @@
+"""
+Реестр шрифтов PDF с поддержкой кириллицы (один раз на процесс)
+
+Шрифты ищутся по списку кандидатов: сначала DejaVu из папки fonts/ репозитория,
+затем системные. Первый найденный регистрируется в ReportLab вместе с
+семейством (<b>, <i> в Paragraph), разобранные TTFont кэшируются, поэтому
+создание отчёта больше не тратит время на настройку шрифтов.
+
+Список кандидатов можно переопределить переменной окружения PSYTEST_FONTS:
+варианты через запятую, файлы варианта (обычный|жирный|курсив|жирный курсив)
+через "|". Относительные пути считаются от папки fonts/.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+FONTS_DIR = Path(__file__).resolve().parents[2] / "fonts"
+
+DEJAVU_DIR = "dejavu-fonts-ttf-2.37/ttf"
+
+# (обычный, жирный, курсив, жирный курсив) - пробуются по порядку
+DEFAULT_FONT_CANDIDATES: List[Sequence[str]] = [
+    (f"{DEJAVU_DIR}/DejaVuSans.ttf", f"{DEJAVU_DIR}/DejaVuSans-Bold.ttf",
+     f"{DEJAVU_DIR}/DejaVuSans-Oblique.ttf", f"{DEJAVU_DIR}/DejaVuSans-BoldOblique.ttf"),
+    ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("C:/Windows/Fonts/arial.ttf", "C:/Windows/Fonts/arialbd.ttf",
+     "C:/Windows/Fonts/ariali.ttf", "C:/Windows/Fonts/arialbi.ttf"),
+]
+
+
+@dataclass(frozen=True)
+class FontSet:
+    """Имена зарегистрированных шрифтов для стилей отчёта"""
+    regular: str
+    bold: str
+    source: str
+
+
+# Встроенные шрифты ReportLab (без кириллицы) - последний вариант
+BUILTIN_FONT_SET = FontSet(regular="Times-Roman", bold="Times-Bold", source="builtin")
+
+_lock = threading.Lock()
+_font_set: Optional[FontSet] = None
+_ttf_cache: Dict[Path, TTFont] = {}
+
+
+def _resolve(path: str) -> Path:
+    candidate = Path(path)
+    return candidate if candidate.is_absolute() or path.startswith(("C:", "c:")) else FONTS_DIR / candidate
+
+
+def _candidates_from_env() -> Optional[List[Sequence[str]]]:
+    raw = os.getenv("PSYTEST_FONTS")
+    if not raw:
+        return None
+    return [tuple(part.strip() for part in entry.split("|")) for entry in raw.split(",") if entry.strip()]
+
+
+def _load_ttf(path: Path) -> TTFont:
+    """Разбирает TTF один раз и регистрирует его под именем файла"""
+    font = _ttf_cache.get(path)
+    if font is None:
+        font = TTFont(path.stem, str(path))
+        pdfmetrics.registerFont(font)
+        _ttf_cache[path] = font
+    return font
+
+
+def load_font_set(candidates: Sequence[Sequence[str]]) -> FontSet:
+    """
+    Регистрирует первый доступный вариант шрифтов
+
+    Args:
+        candidates: Варианты (обычный[, жирный[, курсив[, жирный курсив]]])
+
+    Returns:
+        FontSet с именами шрифтов (встроенные Times, если ничего не найдено)
+    """
+    for files in candidates:
+        paths = [_resolve(f) for f in files if f]
+        if not paths or not paths[0].exists():
+            continue
+        try:
+            regular = _load_ttf(paths[0]).fontName
+            styles = [regular]
+            for extra in paths[1:4]:
+                styles.append(_load_ttf(extra).fontName if extra.exists() else None)
+            styles += [None] * (4 - len(styles))
+            bold = styles[1] or regular
+            italic = styles[2] or regular
+            bold_italic = styles[3] or bold
+            pdfmetrics.registerFontFamily(regular, normal=regular, bold=bold,
+                                          italic=italic, boldItalic=bold_italic)
+            return FontSet(regular=regular, bold=bold, source=str(paths[0]))
+        except Exception as e:
+            print(f"Ошибка регистрации шрифта {paths[0]}: {e}")
+    print("Шрифты с кириллицей не найдены - используются встроенные Times")
+    return BUILTIN_FONT_SET
+
+
+def get_font_set() -> FontSet:
+    """Возвращает шрифты отчёта, регистрируя их при первом вызове в процессе"""
+    global _font_set
+    if _font_set is None:
+        with _lock:
+            if _font_set is None:
+                _font_set = load_font_set(_candidates_from_env() or DEFAULT_FONT_CANDIDATES)
+                print(f"Шрифты отчёта: {_font_set.regular} / {_font_set.bold} ({_font_set.source})")
+    return _font_set
@@ -0,0 +1,181 @@
+"""
+Локальный кэш AI интерпретаций
+
+Пространство баллов маленькое и дискретное, поэтому многие пользователи дают
+побайтно одинаковые запросы к OpenAI. Ответ хранится в SQLite по ключу
+(модель, хэш системного промпта, пользовательский промпт, температура).
+В ключ входит хэш текста системного промпта, а не имя файла, поэтому правка
+data/prompts/*_system_res.txt автоматически делает старые записи недостижимыми.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "interpretations.sqlite3"
+
+
+class InterpretationCache:
+    """SQLite-кэш ответов AI с TTL и вытеснением по числу записей (LRU)"""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_seconds: float = 30 * 24 * 3600,
+                 max_entries: int = 20000, enabled: bool = True):
+        """
+        Args:
+            db_path: Путь к файлу SQLite
+            ttl_seconds: Время жизни записи в секундах
+            max_entries: Максимальное число записей
+            enabled: Включён ли кэш
+        """
+        self.db_path = Path(db_path or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float) -> str:
+        """Строит ключ кэша запроса"""
+        payload = {
+            "model": model,
+            "system": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+            "user": user_prompt,
+            "temperature": round(float(temperature), 3),
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Кэш используется из потоков interpret_all, доступ сериализуется через _lock
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS interpretations (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_interpretations_last_used ON interpretations(last_used)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Возвращает сохранённый ответ или None (промах или запись устарела)"""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT response FROM interpretations WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE interpretations SET last_used = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Ошибка чтения кэша интерпретаций: {e}")
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Сохраняет ответ и вытесняет устаревшие/давно не использованные записи"""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO interpretations (key, response, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                self.stores += 1
+                self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Не удалось сохранить интерпретацию в кэш: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Удаляет устаревшие записи и лишние записи сверх max_entries"""
+        removed = conn.execute(
+            "DELETE FROM interpretations WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM interpretations").fetchone()[0]
+        if count > self.max_entries:
+            # Освобождаем с запасом, чтобы не вытеснять на каждой записи
+            excess = count - int(self.max_entries * 0.9)
+            removed += conn.execute(
+                "DELETE FROM interpretations WHERE key IN "
+                "(SELECT key FROM interpretations ORDER BY last_used LIMIT ?)",
+                (excess,)
+            ).rowcount
+        self.evictions += max(removed, 0)
+
+    def clear(self) -> None:
+        """Очищает кэш и счётчики"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM interpretations")
+            conn.commit()
+            self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Счётчики попаданий/промахов кэша"""
+        with self._lock:
+            try:
+                entries = self._connect().execute("SELECT COUNT(*) FROM interpretations").fetchone()[0]
+            except sqlite3.Error:
+                entries = 0
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": entries,
+                "db_path": str(self.db_path),
+            }
+
+
+_interpretation_cache: Optional[InterpretationCache] = None
+_interpretation_cache_lock = threading.Lock()
+
+
+def get_interpretation_cache() -> InterpretationCache:
+    """Возвращает общий для процесса кэш интерпретаций (настройки из переменных окружения)"""
+    global _interpretation_cache
+    if _interpretation_cache is None:
+        # interpret_all обращается к кэшу из нескольких потоков одновременно
+        with _interpretation_cache_lock:
+            if _interpretation_cache is None:
+                _interpretation_cache = InterpretationCache(
+                    db_path=os.getenv("AI_CACHE_PATH") or None,
+                    ttl_seconds=float(os.getenv("AI_CACHE_TTL_DAYS", "30")) * 24 * 3600,
+                    max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "20000")),
+                    enabled=os.getenv("AI_CACHE", "true").lower() not in ("0", "false", "no"),
+                )
+    return _interpretation_cache
+
+
+def set_interpretation_cache(cache: Optional[InterpretationCache]) -> None:
+    """Подменяет общий кэш (например, в тестах)"""
+    global _interpretation_cache
+    _interpretation_cache = cache
@@ -0,0 +1,270 @@
+"""
+Популяционные нормы: распределения сырых баллов и перевод в процентили
+
+Распределения строятся по таблице scores инкрементально. Новые строки
+(id больше сохранённой отметки) сворачиваются в гистограмму по значению
+(с округлением до resolution) и дописываются в norm_delta. Периодическое
+уплотнение (compact) переносит дельты в norm_bins одним GROUP BY, поэтому
+обновление норм не сканирует всю таблицу scores. NormIndex держит
+отсортированные значения и накопленные частоты и отвечает на вопрос
+«какой процентиль у сырого балла» бинарным поиском за O(log n).
+
+Запуск из корня репозитория:
+    python -m src.psytest.norms --db data/psytest.sqlite3 --fill
+
+Периодическое обновление (например, из cron раз в час): новые баллы попадают
+в дельты, уплотнение - только когда дельт накопилось больше --max-delta-rows,
+процентили дописываются только в строки без scores.norm:
+    python -m src.psytest.norms --update --fill
+"""
+import argparse
+import bisect
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB = ROOT / "data" / "psytest.sqlite3"
+
+# Точность корзин гистограммы (знаков после запятой)
+DEFAULT_RESOLUTION = 2
+
+Key = Tuple[str, str]   # (test_id, scale)
+
+
+class NormIndex:
+    """Распределения сырых баллов по (test_id, scale) с поиском процентиля"""
+
+    def __init__(self, bins: Dict[Key, Tuple[np.ndarray, np.ndarray]],
+                 resolution: int = DEFAULT_RESOLUTION):
+        """
+        Args:
+            bins: (test_id, scale) -> (значения, частоты)
+            resolution: Округление сырого балла до корзины (как при построении норм)
+        """
+        self.resolution = resolution
+        self._values: Dict[Key, np.ndarray] = {}
+        self._counts: Dict[Key, np.ndarray] = {}
+        self._below: Dict[Key, np.ndarray] = {}
+        self._totals: Dict[Key, int] = {}
+        for key, (values, counts) in bins.items():
+            order = np.argsort(values)
+            values = np.asarray(values, dtype=float)[order]
+            counts = np.asarray(counts, dtype=float)[order]
+            self._values[key] = values
+            self._counts[key] = counts
+            self._below[key] = np.concatenate(([0.0], np.cumsum(counts)[:-1]))
+            self._totals[key] = int(counts.sum())
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._totals
+
+    def size(self, test_id: str, scale: str) -> int:
+        """Число баллов в распределении"""
+        return self._totals.get((test_id, scale), 0)
+
+    def percentile(self, test_id: str, scale: str, raw: float) -> Optional[float]:
+        """Процентиль (0-100, середина ранга при равных значениях) или None без норм"""
+        key = (test_id, scale)
+        total = self._totals.get(key)
+        if not total:
+            return None
+        values = self._values[key]
+        raw = round(float(raw), self.resolution)
+        i = bisect.bisect_left(values, raw)
+        rank = self._below[key][i] if i < len(values) else total
+        if i < len(values) and values[i] == raw:
+            rank += self._counts[key][i] / 2
+        return round(100.0 * rank / total, 1)
+
+    def percentiles(self, test_id: str, scale: str, raws: np.ndarray) -> np.ndarray:
+        """Процентили для массива сырых баллов (NaN без норм)"""
+        raws = np.round(np.asarray(raws, dtype=float), self.resolution)
+        key = (test_id, scale)
+        total = self._totals.get(key)
+        if not total:
+            return np.full(len(raws), np.nan)
+        values, counts, below = self._values[key], self._counts[key], self._below[key]
+        i = np.searchsorted(values, raws, side='left')
+        inside = i < len(values)
+        clipped = np.minimum(i, len(values) - 1)
+        rank = np.where(inside, below[clipped], total)
+        exact = inside & (values[clipped] == raws)
+        rank = rank + np.where(exact, counts[clipped] / 2, 0.0)
+        return np.round(100.0 * rank / total, 1)
+
+
+class NormStore:
+    """Нормы в SQLite (таблицы norm_bins, norm_delta, norm_state из data/schema.sql)"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, resolution: int = DEFAULT_RESOLUTION,
+                 chunk_size: int = 50000):
+        self.db_path = Path(db_path)
+        self.resolution = resolution
+        self.chunk_size = chunk_size
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    @staticmethod
+    def _watermark(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM norm_state WHERE key = 'last_score_id'").fetchone()
+        return row[0] if row else 0
+
+    def ingest(self) -> int:
+        """Добавляет в дельты баллы, появившиеся после прошлого вызова. Возвращает их число"""
+        ingested = 0
+        conn = self._connect()
+        try:
+            last_id = self._watermark(conn)
+            while True:
+                rows = conn.execute(
+                    "SELECT id, test_id, scale, raw FROM scores WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, self.chunk_size)
+                ).fetchall()
+                if not rows:
+                    break
+                df = pd.DataFrame.from_records(rows, columns=['id', 'test_id', 'scale', 'raw'])
+                df['value'] = df['raw'].round(self.resolution)
+                histogram = df.groupby(['test_id', 'scale', 'value']).size().reset_index(name='count')
+                last_id = int(df['id'].iloc[-1])
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO norm_delta (test_id, scale, value, count) VALUES (?, ?, ?, ?)",
+                        [(t, s, float(v), int(c)) for t, s, v, c in histogram.itertuples(index=False)]
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO norm_state (key, value) VALUES ('last_score_id', ?)", (last_id,)
+                    )
+                ingested += len(df)
+        finally:
+            conn.close()
+        return ingested
+
+    def compact(self) -> int:
+        """Переносит дельты в norm_bins. Возвращает число свёрнутых строк дельт"""
+        conn = self._connect()
+        try:
+            with conn:
+                pending = conn.execute("SELECT COUNT(*) FROM norm_delta").fetchone()[0]
+                if pending:
+                    conn.execute(
+                        "INSERT INTO norm_bins (test_id, scale, value, count) "
+                        "SELECT test_id, scale, value, SUM(count) FROM norm_delta WHERE true "
+                        "GROUP BY test_id, scale, value "
+                        "ON CONFLICT(test_id, scale, value) DO UPDATE SET count = count + excluded.count"
+                    )
+                    conn.execute("DELETE FROM norm_delta")
+        finally:
+            conn.close()
+        return pending
+
+    def update(self, max_delta_rows: int = 10000) -> int:
+        """Добавляет новые баллы и уплотняет, когда дельт накопилось больше max_delta_rows"""
+        ingested = self.ingest()
+        conn = self._connect()
+        try:
+            pending = conn.execute("SELECT COUNT(*) FROM norm_delta").fetchone()[0]
+        finally:
+            conn.close()
+        if pending > max_delta_rows:
+            self.compact()
+        return ingested
+
+    def rebuild(self) -> int:
+        """Строит нормы заново по всей таблице scores (после пакетного пересчёта)"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM norm_bins")
+                conn.execute("DELETE FROM norm_delta")
+                conn.execute("DELETE FROM norm_state WHERE key = 'last_score_id'")
+        finally:
+            conn.close()
+        ingested = self.ingest()
+        self.compact()
+        return ingested
+
+    def load_index(self) -> NormIndex:
+        """Индекс процентилей по уплотнённым нормам"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT test_id, scale, value, count FROM norm_bins ORDER BY test_id, scale, value"
+            ).fetchall()
+        finally:
+            conn.close()
+        grouped: Dict[Key, Tuple[List[float], List[int]]] = {}
+        for test_id, scale, value, count in rows:
+            values, counts = grouped.setdefault((test_id, scale), ([], []))
+            values.append(value)
+            counts.append(count)
+        return NormIndex({key: (np.array(v), np.array(c)) for key, (v, c) in grouped.items()},
+                         resolution=self.resolution)
+
+    def fill_norms(self, index: Optional[NormIndex] = None, only_missing: bool = True) -> int:
+        """Записывает процентили в scores.norm частями по id. Возвращает число обновлённых строк"""
+        index = index or self.load_index()
+        updated = 0
+        conn = self._connect()
+        try:
+            last_id = 0
+            condition = "AND norm IS NULL" if only_missing else ""
+            while True:
+                rows = conn.execute(
+                    f"SELECT id, test_id, scale, raw FROM scores WHERE id > ? {condition} ORDER BY id LIMIT ?",
+                    (last_id, self.chunk_size)
+                ).fetchall()
+                if not rows:
+                    break
+                df = pd.DataFrame.from_records(rows, columns=['id', 'test_id', 'scale', 'raw'])
+                last_id = int(df['id'].iloc[-1])
+                df['norm'] = np.nan
+                for (test_id, scale), group in df.groupby(['test_id', 'scale']):
+                    df.loc[group.index, 'norm'] = index.percentiles(test_id, scale, group['raw'])
+                known = df.dropna(subset=['norm'])
+                with conn:
+                    conn.executemany(
+                        "UPDATE scores SET norm = ? WHERE id = ?",
+                        [(float(norm), int(score_id)) for score_id, norm in zip(known['id'], known['norm'])]
+                    )
+                updated += len(known)
+        finally:
+            conn.close()
+        return updated
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Популяционные нормы по таблице scores")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="база SQLite (data/schema.sql)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rebuild", action="store_true", help="построить нормы заново по всем баллам")
+    mode.add_argument("--update", action="store_true",
+                      help="добавить новые баллы, уплотнить при превышении --max-delta-rows (для cron)")
+    parser.add_argument("--max-delta-rows", type=int, default=10000,
+                        help="порог строк дельт для уплотнения в режиме --update")
+    parser.add_argument("--fill", action="store_true", help="записать процентили в scores.norm")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"База не найдена: {args.db}")
+        return 1
+
+    store = NormStore(args.db)
+    if args.rebuild:
+        print(f"Нормы построены заново: {store.rebuild()} баллов")
+    elif args.update:
+        print(f"Добавлено баллов: {store.update(max_delta_rows=args.max_delta_rows)}")
+    else:
+        print(f"Добавлено баллов: {store.ingest()}, уплотнено дельт: {store.compact()}")
+    if args.fill:
+        print(f"Заполнено scores.norm: {store.fill_norms(only_missing=not args.rebuild)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
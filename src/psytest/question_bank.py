@@ -0,0 +1,291 @@
+"""
+Единый банк вопросов из data/prompts/*_user.txt
+
+Каждый файл вопросов разбирается один раз в неизменяемые структуры (frozen
+dataclass + tuple), которые можно адресовать по индексу и безопасно делить
+между ботом, приложением PDF отчёта и процессами-воркерами. При изменении
+файла (mtime) вопросы перечитываются автоматически, без перезапуска.
+"""
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .prompts import BASE as PROMPTS_DIR
+
+# Файлы вопросов по тестам
+QUESTION_FILES = {
+    'paei': "adizes_user.txt",
+    'disc': "disc_user.txt",
+    'hexaco': "hexaco_user.txt",
+    'soft_skills': "soft_user.txt",
+}
+
+PAEI_CODES = ("P", "A", "E", "I")
+
+# Номер блока DISC -> тип поведения
+DISC_CATEGORIES = {
+    1: "D",  # Доминирование
+    2: "I",  # Влияние
+    3: "S",  # Устойчивость (Steadiness)
+    4: "C",  # Подчинение правилам (Compliance)
+}
+
+# Порядок факторов HEXACO (по одному вопросу на фактор)
+HEXACO_DIMENSIONS = ("H", "E", "X", "A", "C", "O")
+
+HEXACO_DIMENSION_NAMES = {
+    'H': 'Честность-Скромность (Honesty-Humility)',
+    'E': 'Эмоциональность (Emotionality)',
+    'X': 'Экстраверсия (eXtraversion)',
+    'A': 'Доброжелательность (Agreeableness)',
+    'C': 'Добросовестность (Conscientiousness)',
+    'O': 'Открытость опыту (Openness to experience)',
+}
+
+# Навык по номеру вопроса Soft Skills (порядок совпадает с диаграммой отчёта)
+SOFT_SKILLS = (
+    "Коммуникация",
+    "Работа в команде",
+    "Лидерство",
+    "Критическое мышление",
+    "Управление временем",
+    "Стрессоустойчивость",
+    "Восприимчивость к критике",
+    "Адаптивность",
+    "Решение проблем",
+    "Креативность",
+)
+
+
+@dataclass(frozen=True)
+class AnswerOption:
+    """Вариант ответа: код (P/A/E/I или балл 1-5) и текст"""
+    code: str
+    text: str
+
+
+@dataclass(frozen=True)
+class Question:
+    """Вопрос теста"""
+    index: int                  # порядковый номер в тесте (с 0)
+    text: str
+    scale: str = ""             # шкала: тип DISC, фактор HEXACO, навык Soft Skills
+    scale_name: str = ""        # читаемое название шкалы
+    options: Tuple[AnswerOption, ...] = ()
+
+    def option_text(self, code) -> Optional[str]:
+        """Текст варианта ответа по коду (None, если такого варианта нет)"""
+        code = str(code)
+        for option in self.options:
+            if option.code == code:
+                return option.text
+        return None
+
+
+@dataclass(frozen=True)
+class QuestionSet:
+    """Вопросы одного теста"""
+    test_id: str
+    questions: Tuple[Question, ...]
+    source: str = ""
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __getitem__(self, index: int) -> Question:
+        return self.questions[index]
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self.questions)
+
+    def scale_counts(self) -> Dict[str, int]:
+        """Число вопросов по каждой шкале"""
+        counts: Dict[str, int] = {}
+        for question in self.questions:
+            counts[question.scale] = counts.get(question.scale, 0) + 1
+        return counts
+
+
+# === ПАРСЕРЫ ===
+
+def parse_paei(content: str) -> Tuple[Question, ...]:
+    """Вопросы PAEI: "N. текст" и четыре варианта "P./A./E./I. текст" """
+    questions = []
+    for block in re.split(r'\n(?=\d+\.)', content):
+        block = block.strip()
+        if not block or not re.match(r'^\d+\.', block):
+            continue
+
+        lines = block.split('\n')
+        text = re.sub(r'^\d+\.\s*', '', lines[0].strip())
+        options = []
+        for line in lines[1:]:
+            line = line.strip()
+            if re.match(r'^[PAEI]\.', line):
+                options.append(AnswerOption(line[0], re.sub(r'^[PAEI]\.\s*', '', line)))
+
+        if text and len(options) == 4:  # Должно быть 4 ответа
+            questions.append(Question(index=len(questions), text=text, options=tuple(options)))
+    return tuple(questions)
+
+
+def parse_disc(content: str) -> Tuple[Question, ...]:
+    """Вопросы DISC: блоки "N. Категория:" с подвопросами "N.M текст" """
+    questions = []
+    for block in re.split(r'\n(?=\d+\.)', content):
+        lines = block.strip().split('\n')
+        category_match = re.match(r'^(\d+)\.\s*(.+?):', lines[0].strip())
+        if not category_match:
+            continue
+
+        code = DISC_CATEGORIES.get(int(category_match.group(1)))
+        if code is None:
+            continue
+        category_name = category_match.group(2)
+
+        for line in lines[1:]:
+            line = line.strip()
+            if re.match(r'^\d+\.\d+', line):
+                text = re.sub(r'^\d+\.\d+\s*', '', line)
+                if text:
+                    questions.append(Question(index=len(questions), text=text,
+                                              scale=code, scale_name=category_name))
+    return tuple(questions)
+
+
+def parse_hexaco(content: str) -> Tuple[Question, ...]:
+    """Вопросы HEXACO: "N. текст", фактор по порядку H, E, X, A, C, O"""
+    questions = []
+    for line in content.split('\n'):
+        match = re.match(r'^(\d+)\.\s+(.+)$', line.strip())
+        if not match:
+            continue
+        number = int(match.group(1))
+        if not 1 <= number <= len(HEXACO_DIMENSIONS):
+            continue
+        dimension = HEXACO_DIMENSIONS[number - 1]
+        questions.append(Question(index=len(questions), text=match.group(2).strip(),
+                                  scale=dimension, scale_name=HEXACO_DIMENSION_NAMES[dimension]))
+    return tuple(questions)
+
+
+def parse_soft_skills(content: str) -> Tuple[Question, ...]:
+    """Вопросы Soft Skills: "N. текст" без отступа и варианты "  M. текст" с отступом"""
+    questions = []
+    current_text = None
+    options = []
+
+    def flush():
+        if current_text and options:
+            number = len(questions)
+            skill = SOFT_SKILLS[number] if number < len(SOFT_SKILLS) else "Общие навыки"
+            questions.append(Question(index=number, text=current_text, scale=skill,
+                                      scale_name=skill, options=tuple(options)))
+
+    for line in content.strip().split('\n'):
+        if not line.strip():
+            continue
+        if not line.startswith('  '):
+            match = re.match(r'^(\d+)\.\s+(.+)$', line.strip())
+            if match:
+                flush()
+                current_text = match.group(2).strip()
+                options = []
+        elif current_text:
+            match = re.match(r'^(\d+)\.\s+(.+)$', line[2:])
+            if match:
+                options.append(AnswerOption(match.group(1), match.group(2).strip()))
+    flush()
+    return tuple(questions)
+
+
+PARSERS: Dict[str, Callable[[str], Tuple[Question, ...]]] = {
+    'paei': parse_paei,
+    'disc': parse_disc,
+    'hexaco': parse_hexaco,
+    'soft_skills': parse_soft_skills,
+}
+
+
+class QuestionBank:
+    """Кэш разобранных вопросов с перечитыванием изменённых файлов"""
+
+    def __init__(self, prompts_dir: Optional[Path] = None, check_interval: float = 2.0):
+        """
+        Args:
+            prompts_dir: Папка с файлами *_user.txt
+            check_interval: Как часто (секунды) проверять mtime файлов
+        """
+        self.prompts_dir = Path(prompts_dir or PROMPTS_DIR)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._sets: Dict[str, QuestionSet] = {}
+        self._mtimes: Dict[str, Optional[float]] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    def _mtime(self, path: Path) -> Optional[float]:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
+    def get(self, test_id: str) -> QuestionSet:
+        """Вопросы теста (перечитываются, если файл изменился)"""
+        now = time.monotonic()
+        cached = self._sets.get(test_id)
+        if cached is not None and now - self._checked_at.get(test_id, 0.0) < self.check_interval:
+            return cached
+
+        with self._lock:
+            path = self.prompts_dir / QUESTION_FILES[test_id]
+            mtime = self._mtime(path)
+            self._checked_at[test_id] = now
+            cached = self._sets.get(test_id)
+            if cached is not None and self._mtimes.get(test_id) == mtime:
+                return cached
+
+            try:
+                content = path.read_text(encoding="utf-8-sig")  # utf-8-sig убирает BOM
+                questions = PARSERS[test_id](content)
+            except OSError as e:
+                print(f"Ошибка загрузки вопросов {test_id} из {path}: {e}")
+                questions = ()
+            if not questions:
+                print(f"Не удалось разобрать вопросы {test_id} из {path}")
+            elif cached is not None:
+                print(f"Вопросы {test_id} перечитаны из {path}: {len(questions)}")
+
+            question_set = QuestionSet(test_id=test_id, questions=questions, source=str(path))
+            self._sets[test_id] = question_set
+            self._mtimes[test_id] = mtime
+            return question_set
+
+    @property
+    def paei(self) -> QuestionSet:
+        return self.get('paei')
+
+    @property
+    def disc(self) -> QuestionSet:
+        return self.get('disc')
+
+    @property
+    def hexaco(self) -> QuestionSet:
+        return self.get('hexaco')
+
+    @property
+    def soft_skills(self) -> QuestionSet:
+        return self.get('soft_skills')
+
+
+_question_bank: Optional[QuestionBank] = None
+
+
+def get_question_bank() -> QuestionBank:
+    """Возвращает общий для процесса банк вопросов"""
+    global _question_bank
+    if _question_bank is None:
+        _question_bank = QuestionBank()
+    return _question_bank
@@ -0,0 +1,56 @@
+"""
+Рабочее место отрисовки одного отчёта
+
+Диаграммы отчёта имеют фиксированные имена (paei_combined.png, hexaco_radar.png, ...),
+поэтому общая папка вроде temp_charts годится только для одного отчёта за раз: два
+параллельных отчёта перезаписывают диаграммы друг друга. Рабочее место выдаёт каждому
+заданию собственную временную папку (или держит диаграммы в памяти) и удаляет её,
+когда отчёт собран.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+class RenderWorkspace:
+    """Папка или память для диаграмм одного задания; используется как контекстный менеджер"""
+
+    def __init__(self, directory: Optional[Path] = None, in_memory: bool = False,
+                 prefix: str = "psytest_charts_"):
+        """
+        Args:
+            directory: Готовая папка (не удаляется). Если не задана, при первой
+                диаграмме создаётся уникальная временная папка и удаляется в close()
+            in_memory: Диаграммы рисуются в BytesIO, файлы не создаются
+            prefix: Префикс имени временной папки
+        """
+        self.in_memory = in_memory
+        self.prefix = prefix
+        self._directory = Path(directory) if directory is not None else None
+        self._owned = directory is None
+
+    @property
+    def directory(self) -> Path:
+        """Папка для диаграмм (временная создаётся при первом обращении)"""
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix=self.prefix))
+        return self._directory
+
+    def target(self, file_name: str) -> Optional[Path]:
+        """Куда рисовать диаграмму: путь в папке или None (в память)"""
+        if self.in_memory:
+            return None
+        return self.directory / file_name
+
+    def close(self) -> None:
+        """Удаляет временную папку (свою папку вызывающего не трогает)"""
+        if self._owned and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def __enter__(self) -> "RenderWorkspace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -1,18 +1,94 @@
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import numpy as np
 import pandas as pd
 
+from .bank import load_items
+
 def reverse_code(series: pd.Series, max_val: int = 5):
     return max_val + 1 - series
 
+class ScoringEngine:
+    """
+    Векторизованный подсчёт сырых баллов по шкалам.
+
+    Для банка вопросов один раз вычисляются позиция каждого item_id, индекс его
+    шкалы и маска обратных (reverse) вопросов. Дальше ответы одного респондента
+    или матрица N респондентов × M вопросов считаются операциями NumPy, без
+    построчного DataFrame.apply. Шкалы упорядочены как в groupby('scale').
+    """
+
+    def __init__(self, df_items: pd.DataFrame, max_val: int = 5):
+        self.max_val = max_val
+        self.item_ids = df_items['item_id'].to_numpy()
+        self.scales, self.scale_index = np.unique(df_items['scale'].astype(str).to_numpy(), return_inverse=True)
+        self.reverse = (df_items['reverse'] == 1).to_numpy()
+        self._positions = pd.Index(self.item_ids)
+        # M × S: единица в столбце шкалы вопроса
+        self.scale_matrix = np.zeros((len(self.item_ids), len(self.scales)))
+        self.scale_matrix[np.arange(len(self.item_ids)), self.scale_index] = 1.0
+
+    @classmethod
+    def from_csv(cls, path: Path, max_val: int = 5) -> "ScoringEngine":
+        return cls(load_items(path), max_val=max_val)
+
+    def positions(self, item_ids: Iterable) -> np.ndarray:
+        """Столбец матрицы для каждого item_id (-1 для вопросов не из банка)"""
+        return self._positions.get_indexer(np.asarray(item_ids))
+
+    def adjust(self, answers: np.ndarray, reverse: np.ndarray) -> np.ndarray:
+        """Обратное кодирование: max_val + 1 - ответ для reverse вопросов"""
+        return np.where(reverse, self.max_val + 1 - answers, answers)
+
+    def score_responses(self, df_resp: pd.DataFrame) -> pd.DataFrame:
+        """Баллы одного респондента из ответов item_id/answer (как score_likert)"""
+        pos = self.positions(df_resp['item_id'])
+        answers = df_resp['answer'].to_numpy()
+        known = (pos >= 0) & ~pd.isna(answers)
+        pos, answers = pos[known], answers[known]
+
+        adj = self.adjust(answers, self.reverse[pos])
+        scale_idx = self.scale_index[pos]
+        raw = np.bincount(scale_idx, weights=adj, minlength=len(self.scales))
+        present = np.bincount(scale_idx, minlength=len(self.scales)) > 0
+        if np.issubdtype(answers.dtype, np.integer):
+            raw = raw.astype(np.int64)
+        return pd.DataFrame({'scale': self.scales[present], 'raw': raw[present]})
+
+    def score_matrix(self, answers: np.ndarray) -> np.ndarray:
+        """
+        Баллы для матрицы ответов N × M (столбцы в порядке item_ids, NaN - нет ответа).
+
+        Возвращает матрицу N × S в порядке self.scales.
+        """
+        answers = np.asarray(answers, dtype=float)
+        adj = self.adjust(answers, self.reverse)
+        return np.nan_to_num(adj) @ self.scale_matrix
+
+    def answer_matrix(self, df_resp: pd.DataFrame, by: str = 'session_id') -> Tuple[pd.Index, np.ndarray]:
+        """Длинная таблица ответов (by, item_id, answer) -> (респонденты, матрица N × M)"""
+        pos = self.positions(df_resp['item_id'])
+        known = pos >= 0
+        codes, respondents = pd.factorize(df_resp[by].to_numpy()[known])
+        matrix = np.full((len(respondents), len(self.item_ids)), np.nan)
+        matrix[codes, pos[known]] = df_resp['answer'].to_numpy(dtype=float)[known]
+        return pd.Index(respondents, name=by), matrix
+
+    def score_many(self, df_resp: pd.DataFrame, by: str = 'session_id') -> pd.DataFrame:
+        """Баллы всех респондентов длинной таблицей (by, scale, raw)"""
+        respondents, matrix = self.answer_matrix(df_resp, by)
+        raw = self.score_matrix(matrix)
+        answered = (~np.isnan(matrix)).astype(float) @ self.scale_matrix > 0
+        rows, cols = np.nonzero(answered)
+        return pd.DataFrame({by: respondents[rows], 'scale': self.scales[cols], 'raw': raw[rows, cols]})
+
 def score_paei(df_items: pd.DataFrame, df_resp: pd.DataFrame) -> pd.DataFrame:
-    df = df_resp.merge(df_items[['item_id','scale','reverse']], on='item_id', how='left')
-    df['adj'] = df.apply(lambda r: (6 - r['answer']) if r['reverse']==1 else r['answer'], axis=1)
-    return df.groupby('scale')['adj'].sum().reset_index(name='raw')
+    return ScoringEngine(df_items, max_val=5).score_responses(df_resp)
 
 def score_likert(df_items: pd.DataFrame, df_resp: pd.DataFrame, max_val: int = 5) -> pd.DataFrame:
     """Универсальный подсчёт для DISC/HEXACO: сумма по шкалам с учётом reverse."""
-    df = df_resp.merge(df_items[['item_id','scale','reverse']], on='item_id', how='left')
-    df['adj'] = df.apply(lambda r: (max_val + 1 - r['answer']) if r['reverse']==1 else r['answer'], axis=1)
-    return df.groupby('scale')['adj'].sum().reset_index(name='raw')
+    return ScoringEngine(df_items, max_val=max_val).score_responses(df_resp)
 
 def score_disc(df_items: pd.DataFrame, df_resp: pd.DataFrame) -> pd.DataFrame:
     return score_likert(df_items, df_resp, max_val=5)
@@ -0,0 +1,62 @@
+"""
+Анонимный идентификатор пользователя (sessions.user_hash, каталог архива отчетов)
+
+HMAC-SHA256 идентификатора с секретной солью: простой хэш Telegram ID
+обращается перебором всех ID. Соль берется из USER_HASH_SALT; если она не
+задана, генерируется один раз и хранится в data/user_hash_salt, чтобы хэши
+одного пользователя совпадали между перезапусками.
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_SALT_PATH = Path(__file__).resolve().parents[2] / "data" / "user_hash_salt"
+
+_salt: Optional[bytes] = None
+_salt_lock = threading.Lock()
+
+
+def _read_or_create_salt(path: Path) -> bytes:
+    """Соль из файла; при отсутствии файла - новая случайная (создается атомарно)"""
+    try:
+        return path.read_text(encoding="utf-8").strip().encode("utf-8")
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    salt = secrets.token_hex(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Соль одновременно создал другой процесс
+        return path.read_text(encoding="utf-8").strip().encode("utf-8")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(salt)
+    print(f"Создана соль для анонимных идентификаторов: {path}")
+    return salt.encode("utf-8")
+
+
+def get_user_hash_salt() -> bytes:
+    """Соль для hash_user (USER_HASH_SALT или data/user_hash_salt)"""
+    global _salt
+    if _salt is None:
+        with _salt_lock:
+            if _salt is None:
+                configured = os.getenv("USER_HASH_SALT", "").strip()
+                _salt = configured.encode("utf-8") if configured else _read_or_create_salt(DEFAULT_SALT_PATH)
+    return _salt
+
+
+def set_user_hash_salt(salt: Optional[str]) -> None:
+    """Подменяет соль (например, в тестах); None - перечитать из настроек"""
+    global _salt
+    _salt = salt.encode("utf-8") if salt is not None else None
+
+
+def hash_user(identifier: Any) -> str:
+    """Анонимный идентификатор пользователя: 16 hex-символов HMAC-SHA256 с солью"""
+    digest = hmac.new(get_user_hash_salt(), str(identifier).encode("utf-8"), hashlib.sha256)
+    return digest.hexdigest()[:16]
@@ -0,0 +1,282 @@
+"""
+Векторные диаграммы отчёта на reportlab.graphics
+
+Альтернатива charts.py: те же диаграммы (круговая PAEI, столбики DISC, радары
+HEXACO и Soft Skills) рисуются как Drawing - flowable ReportLab, который
+встраивается в PDF векторными командами. Нет matplotlib, растеризации в PNG
+и декодирования PNG при вёрстке, а PDF получается меньше и печатается чётче.
+
+Размеры передаются в пунктах PDF (как у Image в отчёте), цвета берутся из
+тех же палитр (chart_palette), что и у растровых диаграмм.
+"""
+from math import cos, pi, sin
+from typing import List, Optional, Tuple
+
+from reportlab.graphics.shapes import Circle, Drawing, Group, Line, Polygon, Rect, String, Wedge
+from reportlab.lib.colors import Color, HexColor
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .chart_palette import PRINT_COLORS, PSYCH_COLORS
+from .fonts import get_font_set
+
+PAEI_NAMES = {
+    'P': 'Производитель',
+    'A': 'Администратор',
+    'E': 'Предприниматель',
+    'I': 'Интегратор'
+}
+
+HEXACO_NAMES = {
+    'H': 'H - Честность',
+    'E': 'E - Эмоциональность',
+    'X': 'X - Экстраверсия',
+    'A': 'A - Доброжелательность',
+    'C': 'C - Добросовестность',
+    'O': 'O - Открытость'
+}
+
+
+def _color(hex_color: str, alpha: float = 1.0) -> Color:
+    color = HexColor(hex_color)
+    return Color(color.red, color.green, color.blue, alpha=alpha)
+
+
+def _fonts() -> Tuple[str, str]:
+    """Обычный и жирный шрифт с кириллицей (зарегистрированы один раз на процесс)"""
+    font_set = get_font_set()
+    return font_set.regular, font_set.bold
+
+
+def _tick_step(max_value: float) -> float:
+    """Шаг радиальной сетки - как в charts.make_radar"""
+    if max_value <= 5:
+        return 1
+    if max_value <= 8:
+        return 2
+    return max(1, int(max_value / 4))
+
+
+def _wrap_label(label: str, font: str, size: float, max_width: float) -> List[str]:
+    """Делит длинную подпись оси на две строки по ближайшему к середине пробелу"""
+    # Короткие хвосты ("E -") не отрываются от слова
+    spaces = [i for i, char in enumerate(label) if char == ' ' and 4 <= i <= len(label) - 5]
+    if stringWidth(label, font, size) <= max_width or not spaces:
+        return [label]
+    split = min(spaces, key=lambda i: abs(i - len(label) / 2))
+    return [label[:split], label[split + 1:]]
+
+
+def _anchor(dx: float) -> str:
+    if dx > 0.1:
+        return 'start'
+    if dx < -0.1:
+        return 'end'
+    return 'middle'
+
+
+def draw_radar(labels: List[str], values: List[float], width: float, height: float,
+               title: str = "", max_value: float = 5, color: Optional[str] = None,
+               label_size: float = 6, title_size: float = 8) -> Drawing:
+    """
+    Радарная диаграмма (Soft Skills и основа для HEXACO)
+
+    Args:
+        labels: Названия осей
+        values: Значения для каждой оси (выше max_value обрезаются, как ylim в matplotlib)
+        width, height: Размер рисунка в пунктах
+        title: Заголовок над диаграммой
+        max_value: Максимум радиальной шкалы
+        color: Цвет линии и заливки (по умолчанию PRINT_COLORS['accent'])
+        label_size, title_size: Размеры шрифтов подписей осей и заголовка
+    """
+    font, bold_font = _fonts()
+    line_color = _color(color or PRINT_COLORS['accent'])
+    drawing = Drawing(width, height)
+
+    title_space = title_size * 2 if title else 0
+    cx = width / 2
+    cy = (height - title_space) / 2
+    pad = label_size * 0.8
+
+    n = len(labels)
+    # Первая ось сверху, обход по часовой стрелке (theta_offset=pi/2, direction=-1)
+    angles = [pi / 2 - 2 * pi * i / n for i in range(n)]
+    label_lines = [_wrap_label(str(label), font, label_size, width * 0.3) for label in labels]
+
+    # Радиус подбирается так, чтобы подписи осей помещались в рисунок
+    radius = min(width * 0.38, cy - label_size * 2.5)
+    for lines, angle in zip(label_lines, angles):
+        dx = cos(angle)
+        text_width = max(stringWidth(line, font, label_size) for line in lines)
+        if abs(dx) > 0.1:
+            radius = min(radius, ((cx if dx < 0 else width - cx) - text_width - 1) / abs(dx) - pad)
+
+    grid = _color(PRINT_COLORS['light'], 0.8)
+    step = _tick_step(max_value)
+    tick = step
+    while tick < max_value:
+        r = radius * tick / max_value
+        drawing.add(Circle(cx, cy, r, fillColor=None, strokeColor=grid, strokeWidth=0.4))
+        drawing.add(String(cx + 2, cy + r + 1, f"{tick:.1f}", fontName=font,
+                           fontSize=label_size - 1, fillColor=_color(PRINT_COLORS['secondary'])))
+        tick += step
+    drawing.add(Circle(cx, cy, radius, fillColor=None, strokeColor=_color(PRINT_COLORS['secondary']),
+                       strokeWidth=0.6))
+
+    for lines, angle in zip(label_lines, angles):
+        dx, dy = cos(angle), sin(angle)
+        drawing.add(Line(cx, cy, cx + radius * dx, cy + radius * dy, strokeColor=grid, strokeWidth=0.4))
+        lx = cx + (radius + pad) * dx
+        # Блок строк центрируется по вертикали на конце оси, сверху и снизу - отступает от круга
+        block = label_size * len(lines)
+        ly = cy + (radius + pad) * dy + block / 2 - label_size * 0.8
+        if dy > 0.9:
+            ly += block / 2
+        elif dy < -0.9:
+            ly -= block / 2
+        for i, line in enumerate(lines):
+            drawing.add(String(lx, ly - i * label_size, line, fontName=font, fontSize=label_size,
+                               fillColor=_color(PRINT_COLORS['primary']), textAnchor=_anchor(dx)))
+
+    points = []
+    for value, angle in zip(values, angles):
+        r = radius * max(0.0, min(float(value), max_value)) / max_value
+        points.append((cx + r * cos(angle), cy + r * sin(angle)))
+
+    drawing.add(Polygon([coord for point in points for coord in point],
+                        fillColor=_color(color or PRINT_COLORS['accent'], 0.15),
+                        strokeColor=line_color, strokeWidth=1.5))
+    for x, y in points:
+        drawing.add(Circle(x, y, 2, fillColor=line_color,
+                           strokeColor=_color(PRINT_COLORS['background']), strokeWidth=0.8))
+
+    if title:
+        drawing.add(String(width / 2, height - title_size * 1.2, title, fontName=bold_font,
+                           fontSize=title_size, fillColor=_color(PRINT_COLORS['primary']),
+                           textAnchor='middle'))
+    return drawing
+
+
+def draw_hexaco_radar(labels: List[str], values: List[float], width: float, height: float,
+                      title: str = "", max_value: float = 5) -> Drawing:
+    """Радарная диаграмма HEXACO с расшифровками аббревиатур и цветом фактора H"""
+    return draw_radar(
+        [HEXACO_NAMES.get(label, label) for label in labels], values, width, height,
+        title=title, max_value=max_value,
+        color=PSYCH_COLORS['HEXACO'].get('H', PRINT_COLORS['accent']),
+    )
+
+
+def draw_paei_pie(labels: List[str], values: List[float], width: float, height: float,
+                  title: str = "") -> Drawing:
+    """
+    Круговая диаграмма PAEI с подписями ролей и процентами внутри сегментов
+
+    Args:
+        labels: Коды ролей PAEI
+        values: Значения для каждой роли
+        width, height: Размер рисунка в пунктах
+        title: Общий заголовок
+    """
+    font, bold_font = _fonts()
+    drawing = Drawing(width, height)
+    primary = _color(PRINT_COLORS['primary'])
+
+    top = height
+    if title:
+        top -= 16
+        drawing.add(String(width / 2, top, title, fontName=bold_font, fontSize=12,
+                           fillColor=primary, textAnchor='middle'))
+    top -= 16
+    drawing.add(String(width / 2, top, 'PAEI - Распределение ролей', fontName=bold_font,
+                       fontSize=10, fillColor=primary, textAnchor='middle'))
+
+    radius = min(width, top - 8) / 2 - 4
+    cx, cy = width / 2, (top - 8) / 2
+    total = float(sum(values)) or 1.0
+
+    # Как ax.pie(startangle=90): против часовой стрелки от вертикали
+    start = 90.0
+    for label, value in zip(labels, values):
+        sweep = 360.0 * value / total
+        percentage = 100.0 * value / total
+        if sweep > 0:
+            drawing.add(Wedge(cx, cy, radius, start, start + sweep,
+                              fillColor=_color(PSYCH_COLORS['PAEI'].get(label, '#4F81BD')),
+                              strokeColor=_color('#FFFFFF'), strokeWidth=1.5))
+        if percentage > 8:  # Только для достаточно больших сегментов
+            middle = (start + sweep / 2) * pi / 180
+            factor = 0.7 if percentage > 15 else 0.8
+            x = cx + factor * radius * cos(middle)
+            y = cy + factor * radius * sin(middle)
+            text_color = _color('#FFFFFF' if label == 'E' else '#000000')
+            lines = [PAEI_NAMES.get(label, label), f"{label} - {value}", f"{percentage:.1f}%"]
+            for i, line in enumerate(lines):
+                drawing.add(String(x, y + 9 - i * 9 - 3, line, fontName=bold_font, fontSize=7.5,
+                                   fillColor=text_color, textAnchor='middle'))
+        start += sweep
+    return drawing
+
+
+def draw_disc_bars(labels: List[str], values: List[float], width: float, height: float,
+                   title: str = "") -> Drawing:
+    """
+    Столбиковая диаграмма DISC со значениями над столбцами
+
+    Args:
+        labels: Коды стилей DISC
+        values: Значения для каждого стиля
+        width, height: Размер рисунка в пунктах
+        title: Общий заголовок
+    """
+    font, bold_font = _fonts()
+    drawing = Drawing(width, height)
+    primary = _color(PRINT_COLORS['primary'])
+    grid = _color(PRINT_COLORS['light'])
+
+    top = height
+    if title:
+        top -= 12
+        drawing.add(String(width / 2, top, title, fontName=bold_font, fontSize=10,
+                           fillColor=primary, textAnchor='middle'))
+    top -= 13
+    drawing.add(String(width / 2, top, 'DISC - Уровни по типам', fontName=bold_font,
+                       fontSize=9, fillColor=primary, textAnchor='middle'))
+
+    left, bottom = 40.0, 16.0
+    plot_width = width - left - 10
+    plot_height = top - 10 - bottom
+    y_max = (max(values) if values and max(values) > 0 else 1) * 1.2
+
+    # Горизонтальная сетка с подписями шкалы
+    step = _tick_step(y_max)
+    tick = 0.0
+    while tick <= y_max:
+        y = bottom + plot_height * tick / y_max
+        drawing.add(Line(left, y, left + plot_width, y, strokeColor=_color(PRINT_COLORS['light'], 0.5),
+                         strokeWidth=0.4))
+        drawing.add(String(left - 3, y - 2.5, f"{tick:g}", fontName=font, fontSize=7,
+                           fillColor=_color(PRINT_COLORS['secondary']), textAnchor='end'))
+        tick += step
+    drawing.add(Line(left, bottom, left, bottom + plot_height, strokeColor=grid, strokeWidth=0.8))
+    drawing.add(Line(left, bottom, left + plot_width, bottom, strokeColor=grid, strokeWidth=0.8))
+
+    y_label = Group(String(0, 0, 'Средний балл (1-5)', fontName=bold_font, fontSize=8,
+                           fillColor=primary, textAnchor='middle'))
+    y_label.translate(10, bottom + plot_height / 2)
+    y_label.rotate(90)
+    drawing.add(y_label)
+
+    slot = plot_width / max(len(labels), 1)
+    bar_width = slot * 0.8
+    for i, (label, value) in enumerate(zip(labels, values)):
+        x = left + slot * i + (slot - bar_width) / 2
+        bar_height = plot_height * max(float(value), 0.0) / y_max
+        drawing.add(Rect(x, bottom, bar_width, bar_height,
+                         fillColor=_color(PSYCH_COLORS['DISC'].get(label, '#3498DB'), 0.9),
+                         strokeColor=_color('#FFFFFF'), strokeWidth=1))
+        drawing.add(String(x + bar_width / 2, bottom + bar_height + 2, f"{value}", fontName=bold_font,
+                           fontSize=8, fillColor=primary, textAnchor='middle'))
+        drawing.add(String(x + bar_width / 2, bottom - 10, str(label), fontName=font, fontSize=8,
+                           fillColor=_color(PRINT_COLORS['secondary']), textAnchor='middle'))
+    return drawing
@@ -12,25 +12,30 @@ Telegram бот для психологического тестирования
 
 import logging
 import asyncio
-import tempfile
-import shutil
 import os
-import re
+import uuid
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
-from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, InputFile
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ConversationHandler, CallbackQueryHandler
 
 # Загружаем переменные окружения
 load_dotenv()
 
 # Импорты наших модулей
-from enhanced_pdf_report import EnhancedPDFReportV2
 from interpretation_utils import generate_interpretations_from_prompt
-from src.psytest.ai_interpreter import get_ai_interpreter
+from src.psytest.ai_interpreter import get_ai_interpreter, INTERPRETATION_SECTIONS
+from src.psytest.interpretation_cache import get_interpretation_cache
+from src.psytest.question_bank import get_question_bank, QUESTION_FILES
 from report_archiver import save_report_copy
+from report_scheduler import ReportScheduler, ReportQueueFull
+from report_worker import ReportJob, ReportResult, render_report, warm_up_worker
 from scale_normalizer import ScaleNormalizer
+from session_store import MemorySessionStore, create_session_store
+from upload_outbox import UploadOutbox, create_upload_outbox
 
 # === НАСТРОЙКИ ===
 # Загружаем токен бота из переменной окружения
@@ -39,7 +44,16 @@ if not BOT_TOKEN:
     raise ValueError("BOT_TOKEN не найден в переменных окружения. Проверьте файл .env")
 
 # Состояния диалога
-(WAITING_START, WAITING_NAME, PAEI_TESTING, DISC_TESTING, HEXACO_TESTING, SOFT_SKILLS_TESTING) = range(6)
+(WAITING_START, WAITING_NAME, PAEI_TESTING, DISC_TESTING, HEXACO_TESTING, SOFT_SKILLS_TESTING,
+ WAITING_REPORT_RETRY) = range(7)
+
+# Очередь генерации отчетов: REPORT_WORKERS параллельных генераций, REPORT_QUEUE_SIZE ожидающих
+# Отрисовка выполняется в прогретых процессах-воркерах (report_worker)
+report_scheduler = ReportScheduler.from_env(initializer=warm_up_worker)
+
+# Полные отчеты загружаются в Google Drive фоновой очередью (data/outbox), не задерживая пользователя.
+# Очередь создает папку и базу, поэтому открывается при старте бота (post_init), а не при импорте
+upload_outbox: Optional[UploadOutbox] = None
 
 # === НАСТРОЙКА ЛОГИРОВАНИЯ ===
 logging.basicConfig(
@@ -49,8 +63,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # === ХРАНИЛИЩЕ ПОЛЬЗОВАТЕЛЕЙ ===
-user_sessions = {}
-
 class UserSession:
     """Класс для хранения данных пользователя"""
     
@@ -73,126 +85,47 @@ class UserSession:
             'hexaco': {},
             'soft_skills': {}
         }
-
-# === ФУНКЦИИ ПАРСИНГА ВОПРОСОВ ===
-
-def parse_adizes_questions(filepath="data/prompts/adizes_user.txt"):
-    """Парсит вопросы PAEI/Adizes из файла"""
-    try:
-        questions = []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Разбиваем на блоки вопросов (ищем паттерн с номером)
-        question_blocks = re.split(r'\n(?=\d+\.)', content)
-        
-        for block in question_blocks:
-            if not block.strip() or not re.match(r'^\d+\.', block.strip()):
-                continue
-                
-            lines = block.strip().split('\n')
-            question_text = lines[0].strip()
-            
-            # Извлекаем сам вопрос (убираем номер)
-            question_text = re.sub(r'^\d+\.\s*', '', question_text)
-            
-            answers = {}
-            for line in lines[1:]:
-                line = line.strip()
-                if re.match(r'^[PAEI]\.', line):
-                    code = line[0]  # P, A, E, или I
-                    answer_text = re.sub(r'^[PAEI]\.\s*', '', line)
-                    answers[code] = answer_text
-            
-            if question_text and len(answers) == 4:  # Должно быть 4 ответа
-                questions.append({
-                    "question": question_text,
-                    "answers": answers
-                })
-        
-        logger.info(f"📊 Загружено {len(questions)} PAEI вопросов из {filepath}")
-        return questions
-        
-    except Exception as e:
-        logger.error(f"❌ Ошибка при загрузке PAEI вопросов: {e}")
-        return []
-
-def parse_disc_questions(filepath="data/prompts/disc_user.txt"):
-    """Парсит вопросы DISC из файла"""
-    try:
-        questions = []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Разбиваем на блоки по категориям (Доминирование, Влияние, Устойчивость, Подчинение правилам)
-        category_blocks = re.split(r'\n(?=\d+\.)', content)
-        
-        disc_categories = {
-            1: "D",  # Доминирование
-            2: "I",  # Влияние  
-            3: "S",  # Устойчивость (Steadiness)
-            4: "C"   # Подчинение правилам (Compliance)
-        }
-        
-        for block in category_blocks:
-            if not block.strip():
-                continue
-                
-            lines = block.strip().split('\n')
-            if not lines:
-                continue
-                
-            # Извлекаем название категории и номер
-            first_line = lines[0].strip()
-            category_match = re.match(r'^(\d+)\.\s*(.+?):', first_line)
-            if not category_match:
-                continue
-                
-            category_num = int(category_match.group(1))
-            category_name = category_match.group(2)
-            
-            if category_num not in disc_categories:
-                continue
-                
-            disc_code = disc_categories[category_num]
-            
-            # Извлекаем подвопросы
-            for line in lines[1:]:
-                line = line.strip()
-                if re.match(r'^\d+\.\d+', line):  # Формат 1.1, 1.2 и т.д.
-                    # Убираем номер и создаем вопрос
-                    question_text = re.sub(r'^\d+\.\d+\s*', '', line)
-                    
-                    if question_text:
-                        # Создаем вопрос в формате шкалы 1-5 вместо D/I/S/C
-                        questions.append({
-                            "question": question_text,
-                            "category": disc_code,
-                            "category_name": category_name
-                        })
-        
-        logger.info(f"📊 Загружено {len(questions)} DISC вопросов из {filepath}")
-        return questions
-        
-    except Exception as e:
-        logger.error(f"❌ Ошибка при загрузке DISC вопросов: {e}")
-        return []
+        # Идентификатор прохождения (sessions.session_id в базе): без Telegram ID,
+        # пользователь в базе виден только как sessions.user_hash
+        self.session_id = uuid.uuid4().hex
+
+    def to_dict(self) -> dict:
+        """Снимок состояния для хранилища сессий"""
+        data = dict(self.__dict__)
+        data['started_at'] = self.started_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserSession":
+        """Восстанавливает сессию из снимка to_dict()"""
+        session = cls(data['user_id'])
+        session.__dict__.update(data)
+        session.started_at = datetime.fromisoformat(data['started_at'])
+        return session
+
+# Сессии в памяти с записью в SQLite (SESSION_BACKEND): незавершенные тесты
+# можно продолжить после перезапуска бота. Хранилище открывает базу и запускает
+# поток записи, поэтому создается при старте бота (post_init), а не при импорте
+user_sessions: Optional[MemorySessionStore] = None
+
+# Ответы PAEI хранятся в базе числами
+PAEI_ANSWER_CODES = {"P": 1, "A": 2, "E": 3, "I": 4}
+
+# === ВОПРОСЫ ТЕСТОВ ===
+# Вопросы разбираются из data/prompts/*_user.txt один раз (и перечитываются при изменении файлов)
+question_bank = get_question_bank()
+for _test_id in QUESTION_FILES:
+    logger.info(f"📊 Загружено {len(question_bank.get(_test_id))} вопросов {_test_id}")
 
 def convert_disc_to_average(session):
     """Конвертирует DISC баллы из суммы в среднее значение (1-5)"""
     try:
-        # Подсчитываем количество вопросов по каждой категории
-        category_count = {"D": 0, "I": 0, "S": 0, "C": 0}
-        
-        for question in DISC_QUESTIONS:
-            if 'category' in question:
-                category = question['category']
-                if category in category_count:
-                    category_count[category] += 1
+        # Количество вопросов по каждой категории
+        category_count = question_bank.disc.scale_counts()
         
         # Конвертируем сумму в среднее значение
         for category in ["D", "I", "S", "C"]:
-            if category_count[category] > 0:
+            if category_count.get(category, 0) > 0:
                 # Среднее = сумма / количество вопросов
                 average = session.disc_scores[category] / category_count[category]
                 session.disc_scores[category] = round(average, 1)
@@ -205,198 +138,19 @@ def convert_disc_to_average(session):
     except Exception as e:
         logger.error(f"❌ Ошибка конвертации DISC: {e}")
 
-def parse_soft_skills_questions(filepath="data/prompts/soft_user.txt"):
-    """Парсинг вопросов Soft Skills из файла промптов"""
-    try:
-        with open(filepath, 'r', encoding='utf-8-sig') as file:  # utf-8-sig убирает BOM
-            content = file.read()
-    except FileNotFoundError:
-        logger.error(f"❌ Файл {filepath} не найден")
-        return []
-    
-    lines = content.strip().split('\n')
-    questions = []
-    current_question = None
-    collecting_answers = False
-    answers = []
-    
-    # Новый mapping навыков на номера вопросов (уникальные soft skills)
-    skills_mapping = {
-        1: "Коммуникация",
-        2: "Работа в команде",
-        3: "Лидерство",
-        4: "Критическое мышление",
-        5: "Управление временем",
-        6: "Стрессоустойчивость",
-        7: "Восприимчивость к критике",
-        8: "Адаптивность",
-        9: "Решение проблем",
-        10: "Креативность"
-    }
-    
-    for i, line in enumerate(lines):
-        original_line = line
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Пропускаем инструкции в начале файла
-        if (line.startswith('Вот список') or line.startswith('1 =') or line.startswith('2 =') or 
-            line.startswith('3 =') or line.startswith('4 =') or line.startswith('5 =') or 
-            line.startswith('Задавай') or line.startswith('где:') or line.endswith('где:')):
-            continue
-            
-        # Ищем начало нового ОСНОВНОГО вопроса (без отступа в начале строки)
-        if (not original_line.startswith('  ') and  # НЕТ отступа в 2 пробела
-            line and line[0].isdigit() and '. ' in line):
-            
-            # Сохраняем предыдущий вопрос
-            if current_question and answers:
-                question_num = len(questions) + 1
-                skill = skills_mapping.get(question_num, "Общие навыки")
-                questions.append({
-                    'question': current_question,
-                    'scale': "1-5",
-                    'skill': skill,
-                    'answers': answers.copy()
-                })
-                answers = []
-            
-            # Начинаем новый вопрос
-            parts = line.split('. ', 1)
-            if len(parts) == 2:
-                current_question = parts[1]
-                collecting_answers = True
-        
-        # Собираем варианты ответов (начинаются с "  1.", "  2." и т.д.)
-        elif (collecting_answers and 
-              original_line.startswith('  ') and  # ЕСТЬ отступ в 2 пробела
-              len(original_line) > 2):
-            
-            clean_line = original_line[2:]  # Убираем два пробела
-            if clean_line and clean_line[0].isdigit() and '. ' in clean_line:
-                answer_parts = clean_line.split('. ', 1)
-                if len(answer_parts) == 2:
-                    try:
-                        answer_num = int(answer_parts[0])
-                        answer_text = answer_parts[1]
-                        answers.append({'value': answer_num, 'text': answer_text})
-                    except ValueError:
-                        continue
-    
-    # Добавляем последний вопрос
-    if current_question and answers:
-        question_num = len(questions) + 1
-        skill = skills_mapping.get(question_num, "Общие навыки")
-        questions.append({
-            'question': current_question,
-            'scale': "1-5",
-            'skill': skill,
-            'answers': answers.copy()
-        })
-    
-    if questions:
-        logger.info(f"📊 Загружено {len(questions)} Soft Skills вопросов из {filepath}")
-    else:
-        logger.error(f"❌ Не удалось загрузить Soft Skills вопросы из {filepath}")
-    
-    return questions
-
-# === ТЕСТОВЫЕ ДАННЫЕ ===
-# Загружаем PAEI вопросы из файла или используем резервные
-PAEI_QUESTIONS = parse_adizes_questions()
-if not PAEI_QUESTIONS:
-    # Резервные вопросы на случай ошибки загрузки
-    PAEI_QUESTIONS = [
-        {
-            "question": "В работе вы больше склонны:",
-            "answers": {
-                "A": "Планировать и контролировать процессы",
-                "P": "Достигать конкретных результатов", 
-                "E": "Искать новые возможности",
-                "I": "Объединять людей для совместной работы"
-            }
-        }
-    ]
-
-# Загружаем DISC вопросы из файла
-DISC_QUESTIONS = parse_disc_questions()
-if not DISC_QUESTIONS:
-    logger.error("❌ Не удалось загрузить DISC вопросы из файла!")
-    # Резервные DISC вопросы на случай ошибки загрузки
-    DISC_QUESTIONS = [
-        {
-            "question": "В сложной ситуации вы:",
-            "answers": {
-                "D": "Берете инициативу и действуете решительно",
-                "I": "Вдохновляете других на совместные действия",
-                "S": "Сохраняете спокойствие и поддерживаете команду",
-                "C": "Тщательно анализируете ситуацию"
-            }
-        }
-    ]
+def get_resumable_session(user_id: int):
+    """Незавершенная сессия пользователя, которую можно продолжить (или None)"""
+    session = user_sessions.get(user_id)
+    if session is None or session.current_test not in RESUME_TESTS:
+        return None
+    test_id, _ = RESUME_TESTS[session.current_test]
+    if session.current_question >= len(question_bank.get(test_id)):
+        return None  # тест пройден, отчет уже генерировался
+    return session
 
-HEXACO_QUESTIONS = [
-    {
-        "question": "Я предпочитаю говорить правду, даже если это неудобно",
-        "scale": "1-5",
-        "dimension": "H"  # Honesty-Humility
-    },
-    {
-        "question": "Я часто чувствую беспокойство о будущем",
-        "scale": "1-5", 
-        "dimension": "E"  # Emotionality
-    },
-    {
-        "question": "Я люблю быть в центре внимания",
-        "scale": "1-5",
-        "dimension": "X"  # eXtraversion
-    },
-    {
-        "question": "Я стараюсь следовать своим планам, даже если они сложные",
-        "scale": "1-5",
-        "dimension": "A"  # Agreeableness
-    },
-    {
-        "question": "Мне легко найти общий язык с другими людьми",
-        "scale": "1-5",
-        "dimension": "C"  # Conscientiousness
-    },
-    {
-        "question": "Я наслаждаюсь изучением новых идей и концепций",
-        "scale": "1-5",
-        "dimension": "O"  # Openness to experience
-    }
-]
-
-# Загружаем Soft Skills вопросы из файла
 def get_soft_skills_names() -> list[str]:
-    """Извлекает названия навыков из SOFT_SKILLS_QUESTIONS"""
-    try:
-        return [question.get("skill", f"Навык {i+1}") for i, question in enumerate(SOFT_SKILLS_QUESTIONS)]
-    except Exception as e:
-        logger.warning(f"Ошибка при извлечении названий навыков: {e}")
-        # Fallback на базовые названия
-        return ["Коммуникация", "Лидерство", "Работа в команде", "Критическое мышление",
-                "Решение проблем", "Адаптивность", "Управление временем", "Восприимчивость к критике",
-                "Креативность", "Стрессоустойчивость"]
-
-SOFT_SKILLS_QUESTIONS = parse_soft_skills_questions()
-if not SOFT_SKILLS_QUESTIONS:
-    logger.error("❌ Не удалось загрузить Soft Skills вопросы из файла!")
-    # Резервные Soft Skills вопросы на случай ошибки загрузки
-    SOFT_SKILLS_QUESTIONS = [
-        {
-            "question": "Насколько эффективно вы можете объяснить сложные идеи другим?",
-            "scale": "1-5",
-            "skill": "Коммуникация"
-        },
-        {
-            "question": "Как часто вы берете на себя инициативу в групповых проектах?",
-            "scale": "1-5",
-            "skill": "Лидерство"
-        }
-    ]
+    """Названия навыков Soft Skills в порядке вопросов"""
+    return [question.scale for question in question_bank.soft_skills]
 
 # === ОБРАБОТЧИКИ БОТА ===
 
@@ -432,6 +186,15 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         [InlineKeyboardButton("❌ Нет, не сейчас", callback_data="start_no")],
         [InlineKeyboardButton("❌ Отменить текущую операцию", callback_data="cancel")]
     ]
+
+    # Незавершенное тестирование (в том числе до перезапуска бота) можно продолжить
+    session = get_resumable_session(user_id)
+    if session:
+        welcome_text += (
+            f"\n⏸ У вас есть незавершенное тестирование ({session.current_test}, "
+            f"вопрос {session.current_question + 1}). Можно продолжить с того же места."
+        )
+        keyboard.insert(0, [InlineKeyboardButton("▶️ Продолжить тестирование", callback_data="resume")])
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     await update.message.reply_text(
@@ -454,6 +217,13 @@ async def handle_start_confirmation(update: Update, context: ContextTypes.DEFAUL
             parse_mode='HTML'
         )
         return WAITING_NAME
+    elif query.data == "resume" and get_resumable_session(update.effective_user.id):
+        session = user_sessions[update.effective_user.id]
+        _, ask_question = RESUME_TESTS[session.current_test]
+        await query.edit_message_text(
+            f"▶️ Продолжаем тест {session.current_test} с вопроса {session.current_question + 1}"
+        )
+        return await ask_question(update, context)
     else:
         await query.edit_message_text(
             "Хорошо! Когда будете готовы, напишите /start"
@@ -466,9 +236,10 @@ async def handle_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     name = update.message.text.strip()
     
     # Создаем сессию пользователя
-    user_sessions[user_id] = UserSession(user_id)
-    user_sessions[user_id].name = name
-    user_sessions[user_id].phone = ""  # Пустой телефон по умолчанию
+    session = UserSession(user_id)
+    session.name = name
+    session.phone = ""  # Пустой телефон по умолчанию
+    user_sessions[user_id] = session
 
     await update.message.reply_text(
         f"👋 Приветствую, <b>{name}</b>! Сейчас начнём тестирование.\n",
@@ -482,6 +253,7 @@ async def start_paei_test(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     session = user_sessions[user_id]
     session.current_test = "PAEI"
     session.current_question = 0
+    user_sessions.save(user_id)
     
     return await ask_paei_question(update, context)
 
@@ -490,22 +262,22 @@ async def ask_paei_question(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     session = user_sessions[user_id]
     
-    if session.current_question >= len(PAEI_QUESTIONS):
+    paei_questions = question_bank.paei
+    if session.current_question >= len(paei_questions):
         return await start_soft_skills_test(update, context)
     
-    question_data = PAEI_QUESTIONS[session.current_question]
+    question_data = paei_questions[session.current_question]
     
     # Формируем inline клавиатуру с вариантами ответов (текст на кнопках)
     keyboard = []
-    for key in ["P", "A", "E", "I"]:
-        if key in question_data["answers"]:
-            btn_text = f"{key}. {question_data['answers'][key]}"
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"paei_{key}")])
+    for option in question_data.options:
+        btn_text = f"{option.code}. {option.text}"
+        keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"paei_{option.code}")])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
     # Формируем текст вопроса
-    question_text = f"📊 <b>PAEI - Вопрос {session.current_question + 1}/{len(PAEI_QUESTIONS)}</b>\n\n"
-    question_text += f"<b>{question_data['question']}</b>"
+    question_text = f"📊 <b>PAEI - Вопрос {session.current_question + 1}/{len(paei_questions)}</b>\n\n"
+    question_text += f"<b>{question_data.text}</b>"
     
     # Определяем откуда пришел запрос
     if hasattr(update, 'message') and update.message:
@@ -547,13 +319,14 @@ async def handle_paei_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
             # Получаем текст вопроса и ответа
             q_idx = session.current_question
-            if q_idx < len(PAEI_QUESTIONS):
-                question_data = PAEI_QUESTIONS[q_idx]
-                answer_text = question_data["answers"].get(answer_code, answer_code)
+            if q_idx < len(question_bank.paei):
+                question_data = question_bank.paei[q_idx]
+                answer_text = question_data.option_text(answer_code) or answer_code
                 msg = f"Вы выбрали: {answer_code}. {answer_text}"
                 await query.message.reply_text(msg, parse_mode='HTML')
 
             session.current_question += 1
+            user_sessions.record_answer(user_id, 'paei', q_idx, PAEI_ANSWER_CODES[answer_code])
 
             # Удаляем кнопки у предыдущего сообщения
             await query.edit_message_reply_markup(reply_markup=None)
@@ -569,6 +342,7 @@ async def start_disc_test(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     session = user_sessions[user_id]
     session.current_test = "DISC"
     session.current_question = 0
+    user_sessions.save(user_id)
     
     # Определяем откуда пришел запрос и отправляем сообщение
     if hasattr(update, 'message') and update.message:
@@ -576,7 +350,7 @@ async def start_disc_test(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text(
             f"✅ <b>PAEI завершен!</b>\n\n"
             f"🎭 Переходим к тесту DISC (поведенческие стили)\n"
-            f"Вопрос 1 из {len(DISC_QUESTIONS)}:",
+            f"Вопрос 1 из {len(question_bank.disc)}:",
             parse_mode='HTML'
         )
     else:
@@ -585,7 +359,7 @@ async def start_disc_test(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             chat_id=user_id,
             text=f"✅ <b>PAEI завершен!</b>\n\n"
                  f"🎭 Переходим к тесту DISC (поведенческие стили)\n"
-                 f"Вопрос 1 из {len(DISC_QUESTIONS)}:",
+                 f"Вопрос 1 из {len(question_bank.disc)}:",
             parse_mode='HTML'
         )
     
@@ -596,9 +370,10 @@ async def ask_disc_question(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = update.effective_user.id
     session = user_sessions[user_id]
     
-    logger.info(f"📋 ask_disc_question: current_question={session.current_question}, len={len(DISC_QUESTIONS)}")
+    disc_questions = question_bank.disc
+    logger.info(f"📋 ask_disc_question: current_question={session.current_question}, len={len(disc_questions)}")
     
-    if session.current_question >= len(DISC_QUESTIONS):
+    if session.current_question >= len(disc_questions):
         logger.info(f"🎯 DISC завершен! Конвертируем баллы в среднее значение")
         
         # Конвертируем DISC баллы из суммы в среднее значение (1-5)
@@ -607,7 +382,7 @@ async def ask_disc_question(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.info(f"🎯 DISC завершен! Завершаем тестирование")
         return await complete_testing(update, context)
     
-    question_data = DISC_QUESTIONS[session.current_question]
+    question_data = disc_questions[session.current_question]
     
     # Создаем inline клавиатуру для шкалы 1-5
     keyboard = [
@@ -620,9 +395,9 @@ async def ask_disc_question(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    logger.info(f"❓ Отправляем DISC вопрос {session.current_question + 1}/{len(DISC_QUESTIONS)}")
+    logger.info(f"❓ Отправляем DISC вопрос {session.current_question + 1}/{len(disc_questions)}")
     
-    question_text = f"💼 <b>DISC - Вопрос {session.current_question + 1}/{len(DISC_QUESTIONS)}</b>\n\n{question_data['question']}"
+    question_text = f"💼 <b>DISC - Вопрос {session.current_question + 1}/{len(disc_questions)}</b>\n\n{question_data.text}"
     if hasattr(update, 'message') and update.message:
         await update.message.reply_text(
             question_text,
@@ -653,8 +428,8 @@ async def handle_disc_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
             if 1 <= score <= 5:
                 # Получаем данные текущего вопроса
-                question_data = DISC_QUESTIONS[session.current_question]
-                category = question_data['category']  # D, I, S, C
+                question_data = question_bank.disc[session.current_question]
+                category = question_data.scale  # D, I, S, C
 
                 # Обычная логика добавления баллов
                 session.disc_scores[category] += score
@@ -664,7 +439,7 @@ async def handle_disc_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
                 # Получаем текст вопроса и ответа
                 q_idx = session.current_question
-                if q_idx < len(DISC_QUESTIONS):
+                if q_idx < len(question_bank.disc):
                     scale_texts = [
                         "1 - Совсем не согласен",
                         "2 - Не согласен",
@@ -677,6 +452,7 @@ async def handle_disc_answer(update: Update, context: ContextTypes.DEFAULT_TYPE)
                     await query.message.reply_text(msg, parse_mode='HTML')
 
                 session.current_question += 1
+                user_sessions.record_answer(user_id, 'disc', q_idx, score)
 
                 logger.info(f"✅ DISC ответ принят. Категория: {category}, Балл: {score}")
                 logger.info(f"📈 Счет DISC: {session.disc_scores}")
@@ -701,6 +477,7 @@ async def start_hexaco_test(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     session.current_test = "HEXACO"
     session.current_question = 0
+    user_sessions.save(user_id)
     
     # Определяем откуда пришел запрос и отправляем сообщение
     if hasattr(update, 'message') and update.message:
@@ -726,10 +503,11 @@ async def ask_hexaco_question(update: Update, context: ContextTypes.DEFAULT_TYPE
     user_id = update.effective_user.id
     session = user_sessions[user_id]
     
-    if session.current_question >= len(HEXACO_QUESTIONS):
+    hexaco_questions = question_bank.hexaco
+    if session.current_question >= len(hexaco_questions):
         return await start_disc_test(update, context)
     
-    question_data = HEXACO_QUESTIONS[session.current_question]
+    question_data = hexaco_questions[session.current_question]
     
     # Формируем inline клавиатуру с вариантами ответов (текст на кнопках)
     scale_texts = [
@@ -745,7 +523,7 @@ async def ask_hexaco_question(update: Update, context: ContextTypes.DEFAULT_TYPE
     reply_markup = InlineKeyboardMarkup(keyboard)
 
     # Формируем текст вопроса
-    question_text = f"🧠 <b>HEXACO - Вопрос {session.current_question + 1}/{len(HEXACO_QUESTIONS)}</b>\n\n{question_data['question']}"
+    question_text = f"🧠 <b>HEXACO - Вопрос {session.current_question + 1}/{len(hexaco_questions)}</b>\n\n{question_data.text}"
 
     # Определяем откуда пришел запрос
     if hasattr(update, 'message') and update.message:
@@ -785,7 +563,7 @@ async def handle_hexaco_answer(update: Update, context: ContextTypes.DEFAULT_TYP
 
                 # Получаем текст вопроса и ответа
                 q_idx = session.current_question
-                if q_idx < len(HEXACO_QUESTIONS):
+                if q_idx < len(question_bank.hexaco):
                     scale_texts = [
                         "1 - Абсолютно не согласен",
                         "2 - Не согласен",
@@ -798,6 +576,7 @@ async def handle_hexaco_answer(update: Update, context: ContextTypes.DEFAULT_TYP
                     await query.message.reply_text(msg, parse_mode='HTML')
 
                 session.current_question += 1
+                user_sessions.record_answer(user_id, 'hexaco', q_idx, score)
 
                 # Удаляем кнопки у предыдущего сообщения
                 await query.edit_message_reply_markup(reply_markup=None)
@@ -815,6 +594,7 @@ async def start_soft_skills_test(update: Update, context: ContextTypes.DEFAULT_T
     session = user_sessions[user_id]
     session.current_test = "SOFT_SKILLS"
     session.current_question = 0
+    user_sessions.save(user_id)
     
     # Определяем откуда пришел запрос и отправляем сообщение
     if hasattr(update, 'message') and update.message:
@@ -840,17 +620,18 @@ async def ask_soft_skills_question(update: Update, context: ContextTypes.DEFAULT
     user_id = update.effective_user.id
     session = user_sessions[user_id]
     
-    if session.current_question >= len(SOFT_SKILLS_QUESTIONS):
+    soft_skills_questions = question_bank.soft_skills
+    if session.current_question >= len(soft_skills_questions):
         return await start_hexaco_test(update, context)
     
-    question_data = SOFT_SKILLS_QUESTIONS[session.current_question]
+    question_data = soft_skills_questions[session.current_question]
     
     # Формируем inline клавиатуру с вариантами ответов (текст на кнопках)
     keyboard = []
-    if 'answers' in question_data and question_data['answers']:
-        for answer in question_data['answers']:
-            btn_text = f"{answer['value']}. {answer['text']}"
-            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"soft_{answer['value']}" )])
+    if question_data.options:
+        for option in question_data.options:
+            btn_text = f"{option.code}. {option.text}"
+            keyboard.append([InlineKeyboardButton(btn_text, callback_data=f"soft_{option.code}")])
     else:
         scale_texts = [
             "1 - Совсем не согласен",
@@ -863,9 +644,9 @@ async def ask_soft_skills_question(update: Update, context: ContextTypes.DEFAULT
             keyboard.append([InlineKeyboardButton(text, callback_data=f"soft_{i}")])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
-    skill_info = f" ({question_data['skill']})" if 'skill' in question_data else ""
-    question_text = f"💪 <b>Soft Skills - Вопрос {session.current_question + 1}/{len(SOFT_SKILLS_QUESTIONS)}</b>{skill_info}\n\n"
-    question_text += f"<b>{question_data['question']}</b>"
+    skill_info = f" ({question_data.scale_name})" if question_data.scale_name else ""
+    question_text = f"💪 <b>Soft Skills - Вопрос {session.current_question + 1}/{len(soft_skills_questions)}</b>{skill_info}\n\n"
+    question_text += f"<b>{question_data.text}</b>"
 
     # Определяем откуда пришел запрос
     if hasattr(update, 'message') and update.message:
@@ -905,14 +686,12 @@ async def handle_soft_skills_answer(update: Update, context: ContextTypes.DEFAUL
 
                 # Получаем текст вопроса и ответа
                 q_idx = session.current_question
-                if q_idx < len(SOFT_SKILLS_QUESTIONS):
-                    question_data = SOFT_SKILLS_QUESTIONS[q_idx]
+                if q_idx < len(question_bank.soft_skills):
+                    question_data = question_bank.soft_skills[q_idx]
                     answer_text = None
-                    if 'answers' in question_data and question_data['answers']:
-                        for ans in question_data['answers']:
-                            if ans['value'] == score:
-                                answer_text = f"{ans['value']}. {ans['text']}"
-                                break
+                    option_text = question_data.option_text(score)
+                    if option_text:
+                        answer_text = f"{score}. {option_text}"
                     if not answer_text:
                         scale_texts = [
                             "1 - Совсем не согласен",
@@ -932,6 +711,7 @@ async def handle_soft_skills_answer(update: Update, context: ContextTypes.DEFAUL
                 logger.info(f"📊 Текущий счет: {session.soft_skills_scores}")
 
                 session.current_question += 1
+                user_sessions.record_answer(user_id, 'soft_skills', q_idx, score)
 
                 # Удаляем кнопки у предыдущего сообщения
                 await query.edit_message_reply_markup(reply_markup=None)
@@ -979,8 +759,11 @@ async def complete_testing(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         
         # HEXACO: преобразуем список ответов в средние баллы по измерениям
         # У нас 6 вопросов (по одному на каждое измерение HEXACO)
+        # (при повторной постановке в очередь баллы уже преобразованы)
         hexaco_dimensions = ["H", "E", "X", "A", "C", "O"]
-        if len(session.hexaco_scores) == 6:
+        if isinstance(session.hexaco_scores, dict):
+            pass
+        elif len(session.hexaco_scores) == 6:
             hexaco_dict = {}
             for i, dimension in enumerate(hexaco_dimensions):
                 score = session.hexaco_scores[i]  # Оценка 1-5
@@ -993,7 +776,9 @@ async def complete_testing(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         
         # Soft Skills: преобразуем список ответов в словарь навыков
         soft_skills_names = get_soft_skills_names()
-        if len(session.soft_skills_scores) == len(soft_skills_names):
+        if isinstance(session.soft_skills_scores, dict):
+            pass
+        elif len(session.soft_skills_scores) == len(soft_skills_names):
             soft_skills_dict = {}
             for i, skill_name in enumerate(soft_skills_names):
                 soft_skills_dict[skill_name] = session.soft_skills_scores[i]  # Уже в шкале 1-10
@@ -1002,46 +787,76 @@ async def complete_testing(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             # Если данных недостаточно, используем средние значения
             session.soft_skills_scores = {skill: 5.0 for skill in soft_skills_names}
         
-        # Генерируем два PDF отчета в отдельном потоке
+        # AI интерпретации (сетевые запросы) готовим в боте, отрисовку PDF - в пуле воркеров
         logger.info("🔄 Начинаем генерацию отчетов...")
-        pdf_path_user, pdf_path_gdrive = await asyncio.to_thread(generate_user_report, session)
-        logger.info(f"✅ Отчеты готовы: {pdf_path_user}, {pdf_path_gdrive}")
+        job = await asyncio.to_thread(prepare_report_job, session)
+        queue_message = None
         
-        # Отправляем пользователю ТОЛЬКО его отчет (без детализации вопросов)
-        logger.info("📤 Отправляем отчет пользователю...")
-        with open(pdf_path_user, 'rb') as pdf_file:
-            # Определяем способ отправки документа
-            if hasattr(update, 'message') and update.message:
-                # Обычное сообщение
-                await update.message.reply_document(
-                    document=pdf_file,
-                    filename=f"Отчет_{session.name.replace(' ', '_')}.pdf",
-                    caption=f"📊 <b>Ваш персональный отчет готов!</b>\n\n"
-                           f"👤 {session.name}\n"
-                           f"📅 {datetime.now().strftime('%d.%m.%Y %H:%M')}",
-                    parse_mode='HTML'
-                )
+        async def notify_queue_position(position: int) -> None:
+            """Сообщает пользователю место в очереди (одно сообщение, которое обновляется)"""
+            nonlocal queue_message
+            if position == 0:
+                text = "🔄 Ваш отчет генерируется..."
             else:
-                # Callback query или другой тип обновления
-                await context.bot.send_document(
-                    chat_id=user_id,
-                    document=pdf_file,
-                    filename=f"Отчет_{session.name.replace(' ', '_')}.pdf",
-                    caption=f"📊 <b>Ваш персональный отчет готов!</b>\n\n"
-                           f"👤 {session.name}\n"
-                           f"📅 {datetime.now().strftime('%d.%m.%Y %H:%M')}",
-                    parse_mode='HTML'
-                )
+                text = f"⏳ Много желающих! Ваше место в очереди на генерацию отчета: {position}"
+            if queue_message is None:
+                if position == 0:
+                    return
+                queue_message = await context.bot.send_message(chat_id=user_id, text=text)
+            else:
+                await queue_message.edit_text(text)
+        
+        try:
+            result = await report_scheduler.submit(
+                render_report, job, on_position=notify_queue_position
+            )
+        except ReportQueueFull:
+            logger.warning(f"⚠️ Очередь отчетов заполнена: {report_scheduler.metrics()}")
+            keyboard = [[InlineKeyboardButton("🔄 Повторить", callback_data="retry_report")]]
+            await context.bot.send_message(
+                chat_id=user_id,
+                text="⏳ Сейчас генерируется слишком много отчетов.\n"
+                     "Ваши ответы сохранены - нажмите «Повторить» через пару минут.",
+                reply_markup=InlineKeyboardMarkup(keyboard)
+            )
+            return WAITING_REPORT_RETRY
+        pdf_path_user, pdf_path_gdrive = result.pdf_path_user, result.pdf_path_full
+        log_report_result(result)
+        logger.info(f"✅ Отчеты готовы: {pdf_path_user or 'в памяти'}, {pdf_path_gdrive}")
+        logger.info(f"📈 Очередь отчетов: {report_scheduler.metrics()}")
+        
+        # Полный отчет (с вопросами) уходит в фоновую очередь загрузки в Google Drive
+        await asyncio.to_thread(upload_outbox.enqueue, pdf_path_gdrive)
+        logger.info(f"☁️ Очередь загрузки в Google Drive: {upload_outbox.stats()}")
+        
+        # Отправляем пользователю ТОЛЬКО его отчет (без детализации вопросов) прямо из памяти
+        logger.info("📤 Отправляем отчет пользователю...")
+        filename = f"Отчет_{session.name.replace(' ', '_')}.pdf"
+        pdf_file = InputFile(BytesIO(result.pdf_user_bytes), filename=filename)
+        # Определяем способ отправки документа
+        if hasattr(update, 'message') and update.message:
+            # Обычное сообщение
+            await update.message.reply_document(
+                document=pdf_file,
+                filename=filename,
+                caption=f"📊 <b>Ваш персональный отчет готов!</b>\n\n"
+                       f"👤 {session.name}\n"
+                       f"📅 {datetime.now().strftime('%d.%m.%Y %H:%M')}",
+                parse_mode='HTML'
+            )
+        else:
+            # Callback query или другой тип обновления
+            await context.bot.send_document(
+                chat_id=user_id,
+                document=pdf_file,
+                filename=filename,
+                caption=f"📊 <b>Ваш персональный отчет готов!</b>\n\n"
+                       f"👤 {session.name}\n"
+                       f"📅 {datetime.now().strftime('%d.%m.%Y %H:%M')}",
+                parse_mode='HTML'
+            )
         logger.info("✅ Отчет успешно отправлен пользователю!")
         
-        # Удаляем временные файлы безопасно
-        import os
-        for pdf_path in [pdf_path_user, pdf_path_gdrive]:
-            if os.path.exists(pdf_path):
-                try:
-                    os.unlink(pdf_path)
-                except Exception as del_err:
-                    logger.warning(f"⚠️ Не удалось удалить временный PDF-файл {pdf_path}: {del_err}")
         # Отправляем благодарность
         if hasattr(update, 'message') and update.message:
             # Обычное сообщение
@@ -1080,154 +895,116 @@ async def complete_testing(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         del user_sessions[user_id]
     return ConversationHandler.END
 
-def generate_user_report(session: UserSession) -> tuple[str, str]:
-    """Генерирует два PDF отчета: один для пользователя (без вопросов), другой для Google Drive (с вопросами)"""
+async def handle_report_retry(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Повторная постановка отчета в очередь после отказа из-за перегрузки"""
+    query = update.callback_query
+    await query.answer()
     
-    # Создаем временную папку для диаграмм
-    temp_dir = tempfile.mkdtemp()
-    temp_charts_dir = Path(temp_dir) / "charts"
-    temp_charts_dir.mkdir(exist_ok=True)
+    if query.data != "retry_report" or update.effective_user.id not in user_sessions:
+        return WAITING_REPORT_RETRY
     
-    try:
-        # Всегда собираем ответы пользователя для отчета в Google Drive
-        # Восстанавливаем рабочий код для раздела с вопросами
-        user_answers = session.user_answers
-        
-        # 🔍 ОТЛАДКА: Логируем собранные ответы
-        logger.info(f"🔍 Собранные ответы пользователя:")
-        for test_type, answers in user_answers.items():
-            logger.info(f"  {test_type.upper()}: {len(answers)} ответов - {dict(list(answers.items())[:3]) if answers else 'пусто'}{'...' if len(answers) > 3 else ''}")
-        
-        # Инициализируем генератор PDF БЕЗ раздела вопросов для пользователя
-        pdf_generator_user = EnhancedPDFReportV2(
-            template_dir=temp_charts_dir,
-            include_questions_section=False  # Пользователю отчет без вопросов
-        )
-        
-        # Инициализируем генератор PDF С разделом вопросов для Google Drive
-        pdf_generator_gdrive = EnhancedPDFReportV2(
-            template_dir=temp_charts_dir,
-            include_questions_section=True   # В Google Drive отчет с вопросами
-        )
+    await query.edit_message_reply_markup(reply_markup=None)
+    return await complete_testing(update, context)
+
+def prepare_report_job(session: UserSession, user_pdf_in_memory: bool = True) -> ReportJob:
+    """
+    Готовит задание на отрисовку: AI интерпретации, нормализация баллов и пути к PDF (выполняется в боте)
+
+    Args:
+        session: Сессия пользователя
+        user_pdf_in_memory: Отчет пользователя возвращается байтами (для отправки в Telegram), без файла в docs/
+    """
+    # Всегда собираем ответы пользователя для отчета в Google Drive
+    user_answers = session.user_answers
     
-        # Инициализируем AI интерпретатор
-        ai_interpreter = get_ai_interpreter()
-        
-        # Подготавливаем интерпретации с помощью AI или используем базовые
-        interpretations = {}
-        
-        if ai_interpreter:
-            # Используем AI для генерации интерпретаций
-            try:
-                interpretations["paei"] = ai_interpreter.interpret_paei(session.paei_scores)
-                interpretations["disc"] = ai_interpreter.interpret_disc(session.disc_scores)
-                interpretations["hexaco"] = ai_interpreter.interpret_hexaco(session.hexaco_scores)
-                interpretations["soft_skills"] = ai_interpreter.interpret_soft_skills(session.soft_skills_scores)
-                
-                # ✨ НОВОЕ: Генерируем общее заключение с рекомендациями по команде
-                all_scores = {
-                    'paei': session.paei_scores,
-                    'disc': session.disc_scores,
-                    'hexaco': session.hexaco_scores,
-                    'soft_skills': session.soft_skills_scores
-                }
-                interpretations["general"] = ai_interpreter.interpret_general_conclusion(all_scores)
-                
-            except Exception as e:
-                print(f"⚠️ Ошибка AI интерпретации: {e}")
-                # Fallback на интерпретации согласно формату general_system_res.txt
-                interpretations = generate_interpretations_from_prompt(
-                    session.paei_scores, session.disc_scores, 
-                    session.hexaco_scores, session.soft_skills_scores
-                )
-        else:
-            # Используем базовые интерпретации в правильном формате согласно general_system_res.txt
-            interpretations = generate_interpretations_from_prompt(
-                session.paei_scores, session.disc_scores, 
+    # 🔍 ОТЛАДКА: Логируем собранные ответы
+    logger.info(f"🔍 Собранные ответы пользователя:")
+    for test_type, answers in user_answers.items():
+        logger.info(f"  {test_type.upper()}: {len(answers)} ответов - {dict(list(answers.items())[:3]) if answers else 'пусто'}{'...' if len(answers) > 3 else ''}")
+    
+    # Инициализируем AI интерпретатор
+    ai_interpreter = get_ai_interpreter()
+    
+    # Подготавливаем интерпретации с помощью AI или используем базовые
+    interpretations = {}
+    
+    if ai_interpreter:
+        # Все пять разделов запрашиваются параллельно с общим дедлайном
+        try:
+            interpretations = ai_interpreter.interpret_all(
+                session.paei_scores, session.disc_scores,
                 session.hexaco_scores, session.soft_skills_scores
             )
-        
-        # Создаем папки для сохранения PDF
-        docs_dir = Path("docs")
-        docs_dir.mkdir(exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        user_name_part = session.name.replace(' ', '_') if session.name else 'TelegramUser'
-        
-        # Пути для двух отчетов
-        pdf_path_user = docs_dir / f"{timestamp}_{user_name_part}.pdf"                           # Для пользователя (чистое имя)
-        pdf_path_gdrive = docs_dir / f"{timestamp}_{user_name_part}_(tg_{session.user_id})_full.pdf"    # Для Google Drive (с ID)
-        
-        # Нормализуем баллы к единой шкале 0-10
-        paei_normalized, paei_method = ScaleNormalizer.auto_normalize("PAEI", session.paei_scores)
-        disc_normalized, disc_method = ScaleNormalizer.auto_normalize("DISC", session.disc_scores)
-        hexaco_normalized, hexaco_method = ScaleNormalizer.auto_normalize("HEXACO", session.hexaco_scores)
-        soft_skills_normalized, soft_skills_method = ScaleNormalizer.auto_normalize("SOFT_SKILLS", session.soft_skills_scores)
-        
-        logger.info(f"📏 Нормализация шкал:")
-        logger.info(f"  {paei_method}")
-        logger.info(f"  {disc_method}")
-        logger.info(f"  {hexaco_method}")
-        logger.info(f"  {soft_skills_method}")
-        
-        test_date = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        # 1. Генерируем отчет БЕЗ вопросов для пользователя
-        logger.info("📄 Генерируем отчет для пользователя (без детализации вопросов)...")
-        pdf_generator_user.generate_enhanced_report(
-            participant_name=session.name,
-            test_date=test_date,
-            paei_scores=paei_normalized,
-            disc_scores=disc_normalized,
-            hexaco_scores=hexaco_normalized,
-            soft_skills_scores=soft_skills_normalized,
-            ai_interpretations=interpretations,
-            out_path=pdf_path_user,
-            user_answers=None  # Не передаем ответы для пользовательского отчета
-        )
-        
-        # 2. Генерируем отчет С вопросами для Google Drive
-        logger.info("📄 Генерируем полный отчет для Google Drive (с детализацией вопросов)...")
-        result = pdf_generator_gdrive.generate_enhanced_report_with_gdrive(
-            participant_name=session.name,
-            test_date=test_date,
-            paei_scores=paei_normalized,
-            disc_scores=disc_normalized,
-            hexaco_scores=hexaco_normalized,
-            soft_skills_scores=soft_skills_normalized,
-            ai_interpretations=interpretations,
-            out_path=pdf_path_gdrive,
-            upload_to_gdrive=True,
-            user_answers=user_answers  # 🔑 Передаем собранные ответы для полного отчета
+        except Exception as e:
+            print(f"⚠️ Ошибка AI интерпретации: {e}")
+        logger.info(f"🧠 Кэш интерпретаций: {get_interpretation_cache().stats()}")
+    
+    missing_sections = [s for s in INTERPRETATION_SECTIONS if not interpretations.get(s)]
+    if missing_sections:
+        # Fallback на интерпретации согласно формату general_system_res.txt - только для недостающих разделов
+        fallback = generate_interpretations_from_prompt(
+            session.paei_scores, session.disc_scores, 
+            session.hexaco_scores, session.soft_skills_scores
         )
-        
-        # Проверяем результат Google Drive загрузки
-        if result and len(result) == 2:
-            local_path, gdrive_link = result
-            logger.info(f"📁 Пользовательский отчет: {pdf_path_user.name}")
-            logger.info(f"📁 Полный отчет сохранен: {pdf_path_gdrive.name}")
-            if gdrive_link:
-                logger.info(f"☁️ Google Drive: {gdrive_link}")
-            else:
-                logger.info("⚠️ Google Drive загрузка не удалась")
-        else:
-            logger.info(f"📁 Пользовательский отчет: {pdf_path_user.name}")
-            logger.info(f"📁 Полный отчет сохранен: {pdf_path_gdrive.name}")
-            logger.warning("⚠️ Проблема с Google Drive интеграцией")
-        
-        # Возвращаем пути к обоим отчетам
-        return str(pdf_path_user), str(pdf_path_gdrive)
-            
+        for section in missing_sections:
+            interpretations[section] = fallback.get(section, "")
+    
+    # Создаем папки для сохранения PDF
+    docs_dir = Path("docs")
+    docs_dir.mkdir(exist_ok=True)
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    user_name_part = session.name.replace(' ', '_') if session.name else 'TelegramUser'
+    
+    # Пути для двух отчетов
+    pdf_path_user = docs_dir / f"{timestamp}_{user_name_part}.pdf"                           # Для пользователя (чистое имя)
+    pdf_path_gdrive = docs_dir / f"{timestamp}_{user_name_part}_(tg_{session.user_id})_full.pdf"    # Для Google Drive (с ID)
+    
+    # Нормализуем баллы к единой шкале 0-10
+    paei_normalized, paei_method = ScaleNormalizer.auto_normalize("PAEI", session.paei_scores)
+    disc_normalized, disc_method = ScaleNormalizer.auto_normalize("DISC", session.disc_scores)
+    hexaco_normalized, hexaco_method = ScaleNormalizer.auto_normalize("HEXACO", session.hexaco_scores)
+    soft_skills_normalized, soft_skills_method = ScaleNormalizer.auto_normalize("SOFT_SKILLS", session.soft_skills_scores)
+    
+    logger.info(f"📏 Нормализация шкал:")
+    logger.info(f"  {paei_method}")
+    logger.info(f"  {disc_method}")
+    logger.info(f"  {hexaco_method}")
+    logger.info(f"  {soft_skills_method}")
+    
+    return ReportJob(
+        participant_name=session.name,
+        test_date=datetime.now().strftime("%Y-%m-%d %H:%M"),
+        paei_scores=paei_normalized,
+        disc_scores=disc_normalized,
+        hexaco_scores=hexaco_normalized,
+        soft_skills_scores=soft_skills_normalized,
+        interpretations=interpretations,
+        pdf_path_user=None if user_pdf_in_memory else str(pdf_path_user),
+        pdf_path_full=str(pdf_path_gdrive),
+        user_answers=user_answers,  # 🔑 Ответы только для полного отчета
+        upload_to_gdrive=False      # загружает upload_outbox после отправки отчета пользователю
+    )
+
+def log_report_result(result: ReportResult) -> None:
+    """Логирует результат отрисовки и загрузки в Google Drive"""
+    if result.pdf_path_user:
+        logger.info(f"📁 Пользовательский отчет: {Path(result.pdf_path_user).name}")
+    else:
+        logger.info(f"📁 Пользовательский отчет в памяти: {len(result.pdf_user_bytes or b'')} байт")
+    logger.info(f"📁 Полный отчет сохранен: {Path(result.pdf_path_full).name}")
+    if result.gdrive_link:
+        logger.info(f"☁️ Google Drive: {result.gdrive_link}")
+
+def generate_user_report(session: UserSession) -> tuple[str, str]:
+    """Генерирует два PDF отчета: один для пользователя (без вопросов), другой для Google Drive (с вопросами)"""
+    try:
+        result = render_report(prepare_report_job(session, user_pdf_in_memory=False))
     except Exception as e:
         logger.error(f"Ошибка генерации отчета: {e}")
         raise e
-    finally:
-        # Очищаем временную папку
-        try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            logger.debug(f"Временная папка {temp_dir} удалена")
-        except Exception as e:
-            logger.warning(f"Не удалось удалить временную папку {temp_dir}: {e}")
+    log_report_result(result)
+    return result.pdf_path_user, result.pdf_path_full
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Отмена тестирования"""
@@ -1261,11 +1038,35 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     await update.message.reply_text(help_text, parse_mode='HTML')
 
+# Продолжение незавершенного теста: current_test -> (тест в банке вопросов, вопрос)
+RESUME_TESTS = {
+    "PAEI": ('paei', ask_paei_question),
+    "SOFT_SKILLS": ('soft_skills', ask_soft_skills_question),
+    "HEXACO": ('hexaco', ask_hexaco_question),
+    "DISC": ('disc', ask_disc_question),
+}
+
+async def start_report_scheduler(application: Application) -> None:
+    """Открывает хранилище сессий, прогревает воркеры отчетов до первого пользователя, запускает загрузку в Drive"""
+    global user_sessions, upload_outbox
+    user_sessions = await asyncio.to_thread(create_session_store, UserSession.from_dict)
+    await report_scheduler.prewarm()
+    upload_outbox = await asyncio.to_thread(create_upload_outbox)
+    upload_outbox.start()
+
+async def shutdown_report_scheduler(application: Application) -> None:
+    """Останавливает пул генерации отчетов, очередь загрузок и сохраняет сессии при остановке бота"""
+    await report_scheduler.shutdown()
+    if upload_outbox is not None:
+        await asyncio.to_thread(upload_outbox.close)
+    if user_sessions is not None:
+        await asyncio.to_thread(user_sessions.close)
+
 def main():
     """Основная функция запуска бота"""
     
     # Создаем приложение
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = Application.builder().token(BOT_TOKEN).post_init(start_report_scheduler).post_shutdown(shutdown_report_scheduler).build()
     
     # Создаем ConversationHandler
     conv_handler = ConversationHandler(
@@ -1277,6 +1078,7 @@ def main():
             DISC_TESTING: [CallbackQueryHandler(handle_disc_answer)],
             HEXACO_TESTING: [CallbackQueryHandler(handle_hexaco_answer)],
             SOFT_SKILLS_TESTING: [CallbackQueryHandler(handle_soft_skills_answer)],
+            WAITING_REPORT_RETRY: [CallbackQueryHandler(handle_report_retry)],
         },
         fallbacks=[
             CommandHandler("cancel", cancel),
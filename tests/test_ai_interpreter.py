@@ -0,0 +1,161 @@
+"""
+Тесты параллельной AI интерпретации
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from src.psytest import interpretation_cache
+from src.psytest.ai_interpreter import AIInterpreter, INTERPRETATION_SECTIONS
+from src.psytest.interpretation_cache import InterpretationCache
+
+
+class FakeCompletions:
+    """Заглушка chat.completions: задержка и ошибка по ключевому слову в запросе"""
+
+    def __init__(self, delay=0.2, slow_marker=None, fail_marker=None):
+        self.delay = delay
+        self.slow_marker = slow_marker
+        self.fail_marker = fail_marker
+        self.calls = 0
+
+    def create(self, model, messages, temperature):
+        self.calls += 1
+        user_prompt = messages[-1]["content"]
+        if self.fail_marker and self.fail_marker in user_prompt:
+            raise RuntimeError("API error")
+        time.sleep(2 if self.slow_marker and self.slow_marker in user_prompt else self.delay)
+        message = SimpleNamespace(content=f"ответ: {user_prompt[:30]}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeClient:
+    def __init__(self, completions):
+        self.chat = SimpleNamespace(completions=completions)
+
+    def with_options(self, **kwargs):
+        return self
+
+
+def make_interpreter(completions):
+    interpreter = AIInterpreter.__new__(AIInterpreter)
+    interpreter.client = FakeClient(completions)
+    interpreter.model = "test-model"
+    return interpreter
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path):
+    """Изолированный кэш интерпретаций во временной папке"""
+    test_cache = InterpretationCache(db_path=tmp_path / "interpretations.sqlite3")
+    interpretation_cache.set_interpretation_cache(test_cache)
+    yield test_cache
+    interpretation_cache.set_interpretation_cache(None)
+
+
+SCORES = (
+    {'P': 5, 'A': 3, 'E': 2, 'I': 4},
+    {'D': 3.5, 'I': 2.0, 'S': 4.1, 'C': 1.5},
+    {'H': 3.0, 'E': 3.2, 'X': 4.0, 'A': 3.1, 'C': 3.8, 'O': 4.2},
+    {'Лидерство': 4.0, 'Коммуникация': 3.5},
+)
+
+
+class TestInterpretAll:
+    """Проверяет параллельный запуск, дедлайн и частичные результаты"""
+
+    def test_sections_run_concurrently(self):
+        """Пять запросов по 0.2 с укладываются во время одного запроса"""
+        interpreter = make_interpreter(FakeCompletions(delay=0.2))
+
+        start = time.perf_counter()
+        result = interpreter.interpret_all(*SCORES)
+        elapsed = time.perf_counter() - start
+
+        assert set(result) == set(INTERPRETATION_SECTIONS)
+        assert elapsed < 0.8
+
+    def test_failed_and_late_sections_are_omitted(self):
+        """Упавший и не успевший к дедлайну разделы не попадают в результат"""
+        interpreter = make_interpreter(
+            FakeCompletions(delay=0.05, slow_marker="теста DISC", fail_marker="теста HEXACO")
+        )
+
+        start = time.perf_counter()
+        result = interpreter.interpret_all(*SCORES, deadline=0.5)
+        elapsed = time.perf_counter() - start
+
+        assert set(result) == {'paei', 'soft_skills', 'general'}
+        assert elapsed < 2
+
+
+class TestInterpretationCache:
+    """Проверяет кэширование ответов AI"""
+
+    def test_repeated_profile_is_served_from_cache(self, cache):
+        """Повторный профиль не отправляется в API"""
+        completions = FakeCompletions(delay=0)
+        interpreter = make_interpreter(completions)
+
+        first = interpreter.interpret_disc(SCORES[1])
+        second = interpreter.interpret_disc(SCORES[1])
+
+        assert first == second
+        assert completions.calls == 1
+        assert cache.stats()['hits'] == 1
+
+    def test_errors_are_not_cached(self, cache):
+        """Ошибка API не сохраняется в кэш"""
+        interpreter = make_interpreter(FakeCompletions(delay=0, fail_marker="теста DISC"))
+
+        assert "ошибка AI" in interpreter.interpret_disc(SCORES[1])
+        assert cache.stats()['entries'] == 0
+
+    def test_key_depends_on_system_prompt_text(self):
+        """Правка системного промпта меняет ключ"""
+        base = InterpretationCache.make_key("m", "prompt v1", "user", 0.3)
+        assert base == InterpretationCache.make_key("m", "prompt v1", "user", 0.3)
+        assert base != InterpretationCache.make_key("m", "prompt v2", "user", 0.3)
+        assert base != InterpretationCache.make_key("m2", "prompt v1", "user", 0.3)
+        assert base != InterpretationCache.make_key("m", "prompt v1", "user", 0.7)
+
+    def test_expired_and_excess_entries_are_evicted(self, tmp_path):
+        """Устаревшие записи не возвращаются, лишние вытесняются"""
+        expired = InterpretationCache(db_path=tmp_path / "ttl.sqlite3", ttl_seconds=-1)
+        expired.put("k", "v")
+        assert expired.get("k") is None
+
+        small = InterpretationCache(db_path=tmp_path / "small.sqlite3", max_entries=3)
+        for i in range(10):
+            small.put(f"k{i}", "v")
+        assert small.stats()['entries'] <= 3
+        assert small.get("k9") == "v"
+
+    def test_shared_cache_is_created_once_across_threads(self, tmp_path, monkeypatch):
+        """Параллельные первые обращения получают один и тот же общий кэш"""
+        monkeypatch.setenv("AI_CACHE_PATH", str(tmp_path / "shared.sqlite3"))
+        interpretation_cache.set_interpretation_cache(None)
+        created = []
+        original_init = InterpretationCache.__init__
+
+        def slow_init(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.05)
+            original_init(self, *args, **kwargs)
+
+        monkeypatch.setattr(InterpretationCache, "__init__", slow_init)
+        barrier = threading.Barrier(5)
+
+        def first_access():
+            barrier.wait()
+            return interpretation_cache.get_interpretation_cache()
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            caches = list(pool.map(lambda _: first_access(), range(5)))
+
+        assert len(created) == 1
+        assert all(c is caches[0] for c in caches)
@@ -114,25 +114,6 @@ class TestCodeQuality:
             for pattern in dangerous_patterns:
                 assert pattern not in code_content, f"Найден потенциально хардкодинный токен: {pattern}"
     
-    def test_temp_directory_cleanup_exists(self):
-        """Проверяет наличие cleanup логики для временных директорий"""
-        bot_file = Path("telegram_test_bot.py")
-        
-        if bot_file.exists():
-            with open(bot_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Проверяем наличие cleanup логики
-            cleanup_indicators = [
-                "shutil.rmtree",
-                "tempfile.mkdtemp",
-                "finally:",
-                "temp_dir"
-            ]
-            
-            found_indicators = [indicator for indicator in cleanup_indicators if indicator in content]
-            assert len(found_indicators) >= 3, f"Недостаточно индикаторов cleanup логики. Найдено: {found_indicators}"
-    
     def test_async_threading_pattern(self):
         """Проверяет использование async threading паттернов"""
         bot_file = Path("telegram_test_bot.py")
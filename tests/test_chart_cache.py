@@ -0,0 +1,67 @@
+"""
+Тесты кэша PNG диаграмм
+"""
+
+import pytest
+
+from src.psytest import chart_cache
+from src.psytest.chart_cache import ChartCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Изолированный кэш диаграмм во временной папке"""
+    test_cache = ChartCache(cache_dir=tmp_path / "cache")
+    chart_cache.set_chart_cache(test_cache)
+    yield test_cache
+    chart_cache.set_chart_cache(None)
+
+
+class TestChartCache:
+    """Проверяет попадания, промахи и вытеснение"""
+
+    def test_repeated_chart_is_served_from_cache(self, cache, tmp_path):
+        """Повторная диаграмма с теми же баллами не перерисовывается"""
+        from src.psytest.charts import make_disc_combined_chart
+
+        first = tmp_path / "first.png"
+        second = tmp_path / "second.png"
+        make_disc_combined_chart(['D', 'I', 'S', 'C'], [3.5, 2.0, 4.1, 1.5], first, title="DISC")
+        make_disc_combined_chart(['D', 'I', 'S', 'C'], [3.5, 2.0, 4.1, 1.5], second, title="DISC")
+
+        stats = cache.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_in_memory_chart_shares_cache_with_files(self, cache, tmp_path):
+        """Диаграмма в памяти берётся из того же кэша, что и PNG на диске"""
+        from src.psytest.charts import make_radar
+
+        on_disk = tmp_path / "radar.png"
+        make_radar(['A', 'B', 'C'], [1.0, 2.0, 3.0], on_disk, title="R")
+        buffer = make_radar(['A', 'B', 'C'], [1.0, 2.0, 3.0], title="R")
+
+        assert cache.stats()['hits'] == 1
+        assert buffer.tell() == 0
+        assert buffer.getvalue() == on_disk.read_bytes()
+
+    def test_key_depends_on_values_and_params(self):
+        """Разные значения или параметры дают разные ключи"""
+        base = ChartCache.make_key("radar", ["A", "B"], [1.0, 2.0], {"title": "T"})
+        assert base == ChartCache.make_key("radar", ["A", "B"], [1.0, 2.0], {"title": "T"})
+        assert base != ChartCache.make_key("radar", ["A", "B"], [1.0, 2.1], {"title": "T"})
+        assert base != ChartCache.make_key("radar", ["A", "B"], [1.0, 2.0], {"title": "X"})
+        assert base != ChartCache.make_key("radar", ["A", "B"], [1, 2], {"title": "T"})
+
+    def test_eviction_respects_entry_limit(self, tmp_path):
+        """При превышении лимита старые записи вытесняются"""
+        small = ChartCache(cache_dir=tmp_path / "small", max_entries=3)
+        src = tmp_path / "chart.png"
+        src.write_bytes(b"png")
+        for i in range(10):
+            small.store(ChartCache.make_key("radar", ["A"], [i], {}), src)
+
+        stats = small.stats()
+        assert stats['entries'] <= 3
+        assert stats['evictions'] >= 7
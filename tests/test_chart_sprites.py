@@ -0,0 +1,69 @@
+"""
+Тесты готовых фонов радарных диаграмм
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from enhanced_pdf_report import EnhancedCharts, EnhancedPDFReportV2
+from src.psytest import chart_cache, chart_sprites
+from src.psytest.chart_cache import ChartCache
+from src.psytest.chart_sprites import SpriteCache
+from src.psytest.charts import make_hexaco_radar, make_radar
+
+LABELS = ["Коммуникация", "Работа в команде", "Лидерство", "Критическое мышление", "Адаптивность"]
+
+
+@pytest.fixture
+def sprites():
+    """Свежий кэш фонов, кэш PNG выключен - каждая диаграмма рисуется"""
+    test_sprites = SpriteCache()
+    chart_sprites.set_sprite_cache(test_sprites)
+    chart_cache.set_chart_cache(ChartCache(enabled=False))
+    yield test_sprites
+    chart_sprites.set_sprite_cache(None)
+    chart_cache.set_chart_cache(None)
+
+
+def pixels(png) -> np.ndarray:
+    return np.asarray(Image.open(png).convert('RGB')).astype(int)
+
+
+class TestChartSprites:
+    """Проверяет совпадение с matplotlib и однократную отрисовку фона"""
+
+    @pytest.mark.parametrize("make_chart, labels, values", [
+        (make_radar, LABELS, [1.0, 4.5, 3.0, 7.0, 0.0]),   # 7.0 - за пределами шкалы
+        (make_hexaco_radar, list("HEXACO"), [3.5, 4.2, 2.8, 4.0, 3.1, 3.7]),
+    ])
+    def test_sprite_matches_matplotlib(self, sprites, make_chart, labels, values):
+        """Слой данных на готовом фоне совпадает с диаграммой, нарисованной целиком"""
+        sprites.enabled = False
+        full = pixels(make_chart(labels, values, title="Радар", max_value=5, normalize=False))
+        sprites.enabled = True
+        fast = pixels(make_chart(labels, values, title="Радар", max_value=5, normalize=False))
+
+        assert fast.shape == full.shape
+        diff = np.abs(fast - full).max(axis=2)
+        assert diff.mean() < 2
+        assert (diff > 64).mean() < 0.01
+
+    def test_background_drawn_once_per_layout(self, sprites):
+        """Новые значения не перерисовывают фон, новый заголовок - перерисовывает"""
+        make_radar(LABELS, [1, 2, 3, 4, 5], title="Радар", max_value=5, normalize=False)
+        make_radar(LABELS, [5, 4, 3, 2, 1], title="Радар", max_value=5, normalize=False)
+        assert sprites.builds == 1
+
+        make_radar(LABELS, [5, 4, 3, 2, 1], title="Другой", max_value=5, normalize=False)
+        assert sprites.builds == 2
+
+    def test_prerendered_backgrounds_cover_report(self, sprites, tmp_path):
+        """После прогрева диаграммы отчёта не рисуют фонов"""
+        assert EnhancedCharts.prerender_backgrounds() == 2
+
+        report = EnhancedPDFReportV2(template_dir=tmp_path, chart_backend="raster")
+        report._create_all_charts({"P": 5, "A": 2, "E": 7, "I": 3}, {"D": 3, "I": 2, "S": 4, "C": 1},
+                                  {"H": 3, "E": 4, "X": 2, "A": 4, "C": 3, "O": 3},
+                                  {f"skill_{i}": 3 for i in range(10)}, in_memory=True)
+        assert sprites.builds == 2
@@ -0,0 +1,84 @@
+"""
+Тесты потокобезопасной отрисовки диаграмм (без pyplot)
+"""
+
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from enhanced_pdf_report import EnhancedPDFReportV2
+from src.psytest import chart_cache, chart_sprites
+from src.psytest.chart_cache import ChartCache
+from src.psytest.chart_sprites import SpriteCache
+from src.psytest.charts import (make_bar_chart, make_disc_combined_chart, make_hexaco_radar,
+                                make_paei_combined_chart, make_pie_chart, make_radar)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHARTS = [
+    (make_radar, ["Коммуникация", "Лидерство", "Адаптивность", "Креативность"], [1.0, 4.5, 3.0, 2.0],
+     {"max_value": 5, "normalize": False}),
+    (make_hexaco_radar, list("HEXACO"), [3.5, 4.2, 2.8, 4.0, 3.1, 3.7], {"max_value": 5, "normalize": False}),
+    (make_bar_chart, list("DISC"), [3.5, 2.0, 4.1, 1.5], {}),
+    (make_pie_chart, list("PAEI"), [5, 2, 7, 3], {}),
+    (make_paei_combined_chart, list("PAEI"), [5.0, 2.5, 7.5, 3.0], {}),
+    (make_disc_combined_chart, list("DISC"), [3.5, 2.0, 4.1, 1.5], {}),
+]
+
+SCORES = ({"P": 5, "A": 2, "E": 7, "I": 3}, {"D": 3, "I": 2, "S": 4, "C": 1},
+          {"H": 3, "E": 4, "X": 2, "A": 4, "C": 3, "O": 3}, {f"skill_{i}": 3 for i in range(10)})
+
+
+@pytest.fixture(params=[True, False], ids=["sprites", "full"])
+def uncached(request):
+    """Кэш PNG выключен; радары рисуются с готовым фоном и целиком"""
+    chart_sprites.set_sprite_cache(SpriteCache(enabled=request.param))
+    chart_cache.set_chart_cache(ChartCache(enabled=False))
+    yield
+    chart_sprites.set_sprite_cache(None)
+    chart_cache.set_chart_cache(None)
+
+
+def render(chart, title: str) -> bytes:
+    make_chart, labels, values, kwargs = chart
+    return make_chart(labels, values, title=title, **kwargs).getvalue()
+
+
+class TestChartThreads:
+    """Проверяет, что диаграммы из разных потоков совпадают с нарисованными по очереди"""
+
+    def test_concurrent_charts_match_sequential(self, uncached):
+        """Одновременная отрисовка всех типов диаграмм даёт те же PNG"""
+        tasks = [(chart, f"Заголовок {i}") for i in range(3) for chart in CHARTS]
+        expected = [render(chart, title) for chart, title in tasks]
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            actual = list(executor.map(lambda task: render(*task), tasks))
+
+        assert actual == expected
+
+    def test_report_charts_in_threads(self, uncached, tmp_path, monkeypatch):
+        """_create_all_charts в потоках возвращает те же диаграммы, что и по очереди"""
+        report = EnhancedPDFReportV2(template_dir=tmp_path, chart_backend="raster")
+
+        monkeypatch.setenv("PSYTEST_CHART_THREADS", "1")
+        sequential = report._create_all_charts(*SCORES, in_memory=True)
+        monkeypatch.setenv("PSYTEST_CHART_THREADS", "4")
+        parallel = report._create_all_charts(*SCORES, in_memory=True)
+
+        assert list(parallel) == ['paei', 'soft_skills', 'hexaco', 'disc']
+        assert {key: chart.name for key, chart in parallel.items()} == \
+            {key: chart.name for key, chart in sequential.items()}
+        assert all(parallel[key].getvalue() == sequential[key].getvalue() for key in sequential)
+
+    def test_charts_do_not_import_pyplot(self):
+        """Модуль диаграмм рисует без pyplot (глобального состояния фигур)"""
+        code = ("import sys\nfrom src.psytest.charts import make_radar\n"
+                "make_radar(['A', 'B', 'C'], [1, 2, 3], title='R')\n"
+                "assert 'matplotlib.pyplot' not in sys.modules")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+
+        assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,95 @@
+"""
+Тесты долгоживущего клиента Google Drive
+"""
+
+import sys
+import types
+
+import pytest
+
+from oauth_google_drive import DriveClient
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+    def next_chunk(self, num_retries=0):
+        return None, self.result
+
+
+class FakeFiles:
+    """files() сервиса Drive: считает запросы, папки создаются при первом обращении"""
+
+    def __init__(self):
+        self.calls = []
+        self.folders = {}
+
+    def list(self, q, fields):
+        self.calls.append(('list', q))
+        name = q.split("name='")[1].split("'")[0]
+        parent = q.split("and '")[1].split("'")[0] if " in parents" in q else None
+        folder_id = self.folders.get((name, parent))
+        return FakeRequest({'files': [{'id': folder_id, 'name': name}] if folder_id else []})
+
+    def create(self, body, media_body=None, fields=None):
+        self.calls.append(('create', body['name']))
+        folder_id = f"id-{len(self.calls)}"
+        if media_body is None:
+            parent = body.get('parents', [None])[0]
+            self.folders[(body['name'], parent)] = folder_id
+            return FakeRequest({'id': folder_id})
+        return FakeRequest({'id': folder_id, 'webViewLink': f"https://drive/{body['parents'][0]}/{body['name']}"})
+
+
+class FakeService:
+    def __init__(self):
+        self._files = FakeFiles()
+
+    def files(self):
+        return self._files
+
+
+@pytest.fixture(autouse=True)
+def fake_media_upload(monkeypatch):
+    """googleapiclient.http.MediaFileUpload без установленного googleapiclient"""
+    http = types.ModuleType("googleapiclient.http")
+    http.MediaFileUpload = lambda path, mimetype, **kwargs: (path, mimetype)
+    package = types.ModuleType("googleapiclient")
+    package.http = http
+    monkeypatch.setitem(sys.modules, "googleapiclient", package)
+    monkeypatch.setitem(sys.modules, "googleapiclient.http", http)
+
+
+class TestDriveClient:
+    """Проверяет кэш папок и число запросов к API"""
+
+    def test_steady_state_upload_is_single_call(self, tmp_path):
+        """После первой загрузки папки год/месяц берутся из кэша"""
+        service = FakeService()
+        client = DriveClient(service=service)
+        report = tmp_path / "report.pdf"
+        report.write_bytes(b"%PDF")
+
+        link = client.upload(str(report), folder_id="base", use_monthly_structure=True)
+        assert link.endswith("/report.pdf")
+        first_calls = len(service.files().calls)
+        assert first_calls == 5  # 2 поиска + 2 создания папок + загрузка
+
+        client.upload(str(report), folder_id="base", use_monthly_structure=True)
+        assert len(service.files().calls) == first_calls + 1
+
+    def test_month_rollover_resolves_new_folder(self):
+        """Смена месяца сбрасывает запомненные папки прошлого месяца"""
+        service = FakeService()
+        client = DriveClient(service=service)
+
+        october = client.monthly_folder(2025, 10, "base")
+        assert client.monthly_folder(2025, 10, "base") == october
+        november = client.monthly_folder(2025, 11, "base")
+
+        assert november != october
+        assert list(client._folders) == [("base", 2025, 11)]
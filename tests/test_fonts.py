@@ -0,0 +1,39 @@
+"""
+Тесты реестра шрифтов PDF
+"""
+
+from src.psytest import fonts
+from src.psytest.fonts import BUILTIN_FONT_SET, get_font_set, load_font_set
+
+
+class TestFontRegistry:
+    """Проверяет однократную регистрацию и цепочку запасных шрифтов"""
+
+    def test_bundled_dejavu_is_used(self):
+        """По умолчанию используется DejaVu из папки fonts/ репозитория"""
+        font_set = get_font_set()
+        assert font_set.regular == "DejaVuSans"
+        assert font_set.bold == "DejaVuSans-Bold"
+
+    def test_registration_happens_once(self):
+        """Повторные отчёты не разбирают TTF заново"""
+        from enhanced_pdf_report import EnhancedPDFReportV2, DesignConfig
+
+        get_font_set()
+        cached = dict(fonts._ttf_cache)
+        EnhancedPDFReportV2()
+        EnhancedPDFReportV2()
+
+        assert fonts._ttf_cache == cached
+        assert DesignConfig.BODY_FONT == get_font_set().regular
+
+    def test_fallback_chain(self):
+        """Отсутствующие шрифты пропускаются, без вариантов - встроенные Times"""
+        assert load_font_set([("missing.ttf",)]) == BUILTIN_FONT_SET
+
+        font_set = load_font_set([
+            ("missing.ttf", "missing-Bold.ttf"),
+            (f"{fonts.DEJAVU_DIR}/DejaVuSerif.ttf",),
+        ])
+        assert font_set.regular == "DejaVuSerif"
+        assert font_set.bold == "DejaVuSerif"
@@ -0,0 +1,138 @@
+"""
+Тесты популяционных норм и поиска процентилей
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from scale_normalizer import ScaleNormalizer
+from src.psytest.init_db import init_db
+from src.psytest.norms import NormIndex, NormStore, main
+
+SCHEMA = "data/schema.sql"
+
+
+def add_scores(path, test_id, scale, raws):
+    conn = sqlite3.connect(str(path))
+    conn.execute("INSERT OR IGNORE INTO sessions VALUES ('s', '2025-10-01', '[]', NULL)")
+    conn.executemany(
+        "INSERT INTO scores (session_id, test_id, scale, raw, norm, ts) VALUES ('s', ?, ?, ?, NULL, 'ts')",
+        [(test_id, scale, raw) for raw in raws]
+    )
+    conn.commit()
+    conn.close()
+
+
+def count_rows(path, table):
+    conn = sqlite3.connect(str(path))
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "psytest.sqlite3"
+    init_db(path, SCHEMA)
+    return path
+
+
+@pytest.fixture
+def normalizer():
+    yield ScaleNormalizer
+    ScaleNormalizer.set_norm_index(None)
+
+
+class TestNormIndex:
+    """Проверяет перевод сырого балла в процентиль"""
+
+    def test_percentile_mid_rank(self):
+        """Равные значения получают середину своего ранга"""
+        index = NormIndex({('disc', 'D'): (np.array([5.0, 1.0, 3.0]), np.array([1, 2, 1]))})
+
+        assert index.percentile('disc', 'D', 1.0) == 25.0
+        assert index.percentile('disc', 'D', 2.0) == 50.0
+        assert index.percentile('disc', 'D', 0.0) == 0.0
+        assert index.percentile('disc', 'D', 9.0) == 100.0
+        assert index.percentile('disc', 'I', 1.0) is None
+        assert list(index.percentiles('disc', 'D', [1.0, 3.0, 5.0, 9.0])) == [25.0, 62.5, 87.5, 100.0]
+
+
+class TestNormStore:
+    """Проверяет инкрементальное построение и уплотнение норм"""
+
+    def test_incremental_ingest_and_compact(self, db):
+        """Повторный ingest берёт только новые баллы, compact сворачивает дельты"""
+        store = NormStore(db, chunk_size=2)
+        add_scores(db, 'hexaco', 'O', [3.0, 3.0, 4.0])
+        assert store.ingest() == 3
+        assert store.ingest() == 0
+
+        add_scores(db, 'hexaco', 'O', [3.0, 2.0])
+        assert store.ingest() == 2
+        assert store.compact() > 0
+        assert count_rows(db, 'norm_delta') == 0
+
+        index = store.load_index()
+        assert index.size('hexaco', 'O') == 5
+        assert index.percentile('hexaco', 'O', 3.0) == 50.0   # 1 ниже + 3/2 равных из 5
+
+    def test_update_compacts_over_threshold(self, db):
+        """update уплотняет только когда дельт накопилось больше порога"""
+        store = NormStore(db)
+        add_scores(db, 'disc', 'D', [1.0, 2.0])
+        store.update(max_delta_rows=10)
+        assert count_rows(db, 'norm_delta') == 2
+
+        add_scores(db, 'disc', 'D', [3.0])
+        store.update(max_delta_rows=2)
+        assert count_rows(db, 'norm_delta') == 0
+        assert count_rows(db, 'norm_bins') == 3
+
+    def test_update_mode_from_cli(self, db, capsys):
+        """--update добавляет только новые баллы и дописывает процентили в пустые scores.norm"""
+        add_scores(db, 'disc', 'D', [1.0, 2.0])
+        assert main(["--db", str(db), "--update", "--max-delta-rows", "1", "--fill"]) == 0
+        assert count_rows(db, 'norm_bins') == 2
+
+        add_scores(db, 'disc', 'D', [3.0])
+        assert main(["--db", str(db), "--update", "--fill"]) == 0
+        out = capsys.readouterr().out
+        assert "Добавлено баллов: 1" in out and "Заполнено scores.norm: 1" in out
+        assert count_rows(db, 'norm_delta') == 1   # ниже порога - без уплотнения
+
+    def test_fill_norms_and_rebuild(self, db, capsys):
+        """fill_norms пишет процентили в scores.norm, rebuild не удваивает счёт"""
+        add_scores(db, 'disc', 'D', [1.0, 2.0, 3.0, 4.0])
+        store = NormStore(db)
+        store.ingest()
+        store.compact()
+        assert store.fill_norms() == 4
+        assert store.fill_norms() == 0   # незаполненных не осталось
+
+        assert store.rebuild() == 4
+        assert store.load_index().size('disc', 'D') == 4
+
+        conn = sqlite3.connect(str(db))
+        norms = [row[0] for row in conn.execute("SELECT norm FROM scores ORDER BY raw")]
+        conn.close()
+        assert norms == [12.5, 37.5, 62.5, 87.5]
+
+        assert main(["--db", str(db), "--fill"]) == 0
+        assert "Добавлено баллов: 0" in capsys.readouterr().out
+
+
+class TestScaleNormalizerPercentiles:
+    """Проверяет подключение норм к ScaleNormalizer"""
+
+    def test_percentiles_from_loaded_norms(self, db, normalizer):
+        """Нормы бота (test_id строчными) находятся по типу теста прописными"""
+        assert normalizer.percentile("DISC", "D", 2.0) is None
+
+        add_scores(db, 'disc', 'D', [1.0, 2.0, 3.0, 4.0])
+        NormStore(db).rebuild()
+        normalizer.load_norms(db)
+
+        assert normalizer.to_percentiles("DISC", {"D": 2.0, "I": 1.0}) == {"D": 37.5, "I": None}
@@ -0,0 +1,35 @@
+"""
+Тесты однопроходной нумерации страниц "Стр. X из N"
+"""
+
+from io import BytesIO
+from functools import partial
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet
+
+
+class TestNumberedCanvas:
+    """Проверяет отложенную нумерацию страниц"""
+
+    def test_total_pages_known_on_every_page(self):
+        """Каждая страница получает итоговое число страниц за один проход вёрстки"""
+        from enhanced_pdf_report import NumberedCanvas
+
+        calls = []
+
+        def decorator(canvas_obj, total_pages):
+            calls.append((canvas_obj.getPageNumber(), total_pages))
+
+        styles = getSampleStyleSheet()
+        story = [Paragraph("one", styles['Normal']), PageBreak(),
+                 Paragraph("two", styles['Normal']), PageBreak(),
+                 Paragraph("three", styles['Normal'])]
+
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        doc.build(story, canvasmaker=partial(NumberedCanvas, page_decorator=decorator))
+
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+        assert buffer.getvalue().startswith(b"%PDF")
@@ -0,0 +1,65 @@
+"""
+Тесты общего банка вопросов
+"""
+
+import dataclasses
+import os
+import shutil
+
+import pytest
+
+from src.psytest.question_bank import QuestionBank, PROMPTS_DIR, QUESTION_FILES
+
+
+@pytest.fixture
+def prompts_copy(tmp_path):
+    """Копия файлов вопросов, которую можно менять"""
+    for name in QUESTION_FILES.values():
+        shutil.copy(PROMPTS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+class TestQuestionBank:
+    """Проверяет разбор, неизменяемость и перечитывание вопросов"""
+
+    def test_repository_questions(self):
+        """Вопросы из data/prompts разбираются со шкалами и вариантами ответов"""
+        bank = QuestionBank()
+
+        assert len(bank.paei) == 5
+        assert all(len(q.options) == 4 for q in bank.paei)
+        assert bank.disc.scale_counts() == {'D': 2, 'I': 2, 'S': 2, 'C': 2}
+        assert [q.scale for q in bank.hexaco] == ['H', 'E', 'X', 'A', 'C', 'O']
+        assert len(bank.soft_skills) == 10
+        assert bank.soft_skills[0].scale == "Коммуникация"
+        assert bank.soft_skills[0].option_text(5)
+
+    def test_questions_are_frozen_and_shared(self):
+        """Структуры неизменяемы, повторный доступ не разбирает файл заново"""
+        bank = QuestionBank()
+        first = bank.paei
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first[0].text = "другой"
+        assert bank.paei is first
+
+    def test_hot_reload_on_mtime_change(self, prompts_copy):
+        """Изменённый файл перечитывается без перезапуска"""
+        bank = QuestionBank(prompts_dir=prompts_copy, check_interval=0)
+        assert len(bank.hexaco) == 6
+
+        path = prompts_copy / QUESTION_FILES['hexaco']
+        path.write_text("1. Единственный вопрос.\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert [q.text for q in bank.hexaco] == ["Единственный вопрос."]
+
+    def test_pdf_appendix_uses_bank(self, prompts_copy):
+        """Раздел с вопросами PDF берёт вопросы из переданного банка"""
+        from questions_answers_section import QuestionAnswerSection
+
+        bank = QuestionBank(prompts_dir=prompts_copy)
+        section = QuestionAnswerSection(question_bank=bank)
+
+        assert section.disc_questions is bank.disc
@@ -0,0 +1,98 @@
+"""
+Тесты рабочего места отрисовки отчёта
+"""
+
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from enhanced_pdf_report import EnhancedPDFReportV2
+from src.psytest import chart_cache
+from src.psytest.chart_cache import ChartCache
+from src.psytest.render_workspace import RenderWorkspace
+
+SCORES = [
+    ({"P": 5, "A": 2, "E": 7, "I": 3}, {"D": 3, "I": 2, "S": 4, "C": 1},
+     {"H": 3, "E": 4, "X": 2, "A": 4, "C": 3, "O": 3}, {f"skill_{i}": 3 for i in range(10)}),
+    ({"P": 1, "A": 8, "E": 2, "I": 6}, {"D": 1, "I": 4, "S": 2, "C": 5},
+     {"H": 2, "E": 1, "X": 5, "A": 3, "C": 4, "O": 2}, {f"skill_{i}": 4 for i in range(10)}),
+]
+
+
+@pytest.fixture
+def temp_root(tmp_path, monkeypatch):
+    """Временные папки создаются внутри tmp_path, кэш PNG выключен"""
+    root = tmp_path / "tmp"
+    root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(root))
+    chart_cache.set_chart_cache(ChartCache(enabled=False))
+    yield root
+    chart_cache.set_chart_cache(None)
+
+
+class TestRenderWorkspace:
+    """Проверяет изоляцию и очистку папок диаграмм"""
+
+    def test_temporary_directory_removed(self, temp_root):
+        """Своя папка создаётся при первой диаграмме и удаляется при выходе"""
+        with RenderWorkspace() as first, RenderWorkspace() as second:
+            assert list(temp_root.iterdir()) == []
+            path = first.target("hexaco_radar.png")
+            assert path.parent.is_dir()
+            assert path != second.target("hexaco_radar.png")
+        assert list(temp_root.iterdir()) == []
+
+    def test_given_directory_kept(self, tmp_path):
+        """Папку вызывающего рабочее место не удаляет; в памяти - без файлов"""
+        with RenderWorkspace(tmp_path) as workspace:
+            workspace.target("disc_combined.png").write_bytes(b"png")
+        assert (tmp_path / "disc_combined.png").exists()
+
+        with RenderWorkspace(in_memory=True) as workspace:
+            assert workspace.target("disc_combined.png") is None
+
+    def test_report_without_template_dir_cleans_up(self, temp_root, tmp_path, monkeypatch):
+        """PNG отчёта без template_dir живут в psytest_charts_* только до конца сборки PDF"""
+        monkeypatch.chdir(tmp_path)
+        report = EnhancedPDFReportV2(chart_backend="raster")
+        during_build = []
+        build_document = report._build_document
+
+        def recording_build(doc, story):
+            during_build.extend(temp_root.glob("psytest_charts_*/*.png"))
+            return build_document(doc, story)
+
+        monkeypatch.setattr(report, "_build_document", recording_build)
+        report.generate_enhanced_report("Иван Петров", "2025-10-01", *SCORES[0], {}, tmp_path / "report.pdf")
+
+        assert len(during_build) == 4
+        assert list(temp_root.glob("psytest_charts_*")) == []
+        assert not (tmp_path / "temp_charts").exists()
+
+    def test_parallel_reports_use_own_workspaces(self, temp_root, tmp_path, monkeypatch):
+        """Отчёты без template_dir в соседних потоках не пишут диаграммы в общую папку"""
+        monkeypatch.chdir(tmp_path)
+        used = []
+        target = RenderWorkspace.target
+
+        def recording_target(self, file_name):
+            path = target(self, file_name)
+            used.append(path)
+            return path
+
+        monkeypatch.setattr(RenderWorkspace, "target", recording_target)
+        report = EnhancedPDFReportV2(chart_backend="raster")
+
+        def build(index):
+            out_path = tmp_path / f"report_{index}.pdf"
+            report.generate_enhanced_report("Иван Петров", "2025-10-01", *SCORES[index % 2], {}, out_path)
+            return out_path.read_bytes()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pdfs = list(executor.map(build, range(4)))
+
+        assert all(pdf[:4] == b"%PDF" for pdf in pdfs)
+        assert len({path.parent for path in used}) == 4
+        assert not (tmp_path / "temp_charts").exists()
+        assert list(temp_root.iterdir()) == []
@@ -0,0 +1,157 @@
+"""
+Тесты каталога архива отчетов
+"""
+
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import report_archiver
+from report_archiver import ReportArchiver, hash_user, partition_dir, store_file
+from src.psytest.user_hash import set_user_hash_salt
+
+
+@pytest.fixture(autouse=True)
+def test_salt():
+    """Фиксированная соль: тесты не создают data/user_hash_salt"""
+    set_user_hash_salt("test-salt")
+    yield
+    set_user_hash_salt(None)
+
+
+@pytest.fixture
+def archiver(tmp_path):
+    return ReportArchiver(base_dir=tmp_path)
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF-1.4 test")
+    return path
+
+
+class TestReportCatalog:
+    """Проверяет, что статистика и очистка работают по каталогу"""
+
+    def test_catalog_created_on_first_use(self, tmp_path, report):
+        """Конструктор не трогает диск: папка и каталог появляются при первом сохранении"""
+        archiver = ReportArchiver(base_dir=tmp_path / "project")
+        assert not (tmp_path / "project").exists()
+
+        archiver.save_report(report, "full", "User")
+        assert archiver.catalog_path.exists()
+
+    def test_save_records_metadata(self, archiver, report):
+        """save_report пишет тип теста, хэш пользователя, размер и контрольную сумму"""
+        saved = archiver.save_telegram_report(report, 123456789, "full", "Иван Петров")
+
+        [entry] = archiver.find_reports(user_hash=hash_user(123456789))
+        assert entry["path"] == saved
+        assert entry["test_type"] == "FULL"
+        assert entry["size"] == report.stat().st_size
+        assert len(entry["sha256"]) == 64
+
+    def test_stats_do_not_scan_directory(self, archiver, report, monkeypatch):
+        """Статистика считается запросом к каталогу, без glob по папке"""
+        archiver.save_report(report, "disc", "User")
+        archiver.save_report(report, "paei", "User")
+
+        def no_glob(*args, **kwargs):
+            raise AssertionError("glob не должен вызываться")
+        monkeypatch.setattr(Path, "glob", no_glob)
+
+        stats = archiver.get_report_stats()
+        assert stats["total_reports"] == 2
+        assert stats["test_types"] == {"DISC": 1, "PAEI": 1}
+        assert stats["reports_today"] == 2
+
+    def test_retention_and_date_range(self, archiver, report):
+        """Очистка удаляет папки дней старше срока хранения вместе с записями"""
+        old_day = archiver.reports_dir / "2020" / "01" / "15"
+        old_day.mkdir(parents=True)
+        old = old_day / "2020-01-15_10-00-00_DISC_Old.pdf"
+        old.write_bytes(report.read_bytes())
+        archiver.rebuild_catalog()
+        new = archiver.save_report(report, "disc", "New")
+
+        week_ago = datetime.now() - timedelta(days=7)
+        assert [r["path"] for r in archiver.find_reports(start=week_ago)] == [new]
+
+        assert archiver.cleanup_old_reports(days_to_keep=30) == 1
+        assert not (archiver.reports_dir / "2020").exists()
+        assert new.exists()
+        assert archiver.get_report_stats()["total_reports"] == 1
+
+    def test_partitioned_hard_link(self, archiver, report):
+        """Копия лежит в папке дня и делит данные с исходником (без копирования байтов)"""
+        saved = archiver.save_report(report, "paei", "User")
+
+        assert saved.parent == partition_dir(archiver.reports_dir, datetime.now())
+        assert saved.stat().st_ino == report.stat().st_ino
+
+        report.unlink()  # бот удаляет временный PDF - копия в архиве остается
+        assert saved.read_bytes() == b"%PDF-1.4 test"
+
+    def test_store_file_falls_back_to_copy(self, tmp_path, report, monkeypatch):
+        """Без поддержки ссылок и reflink файл копируется"""
+        def unsupported(*args, **kwargs):
+            raise OSError("not supported")
+        monkeypatch.setattr(os, "link", unsupported)
+        monkeypatch.setattr(report_archiver, "_reflink", unsupported)
+
+        target = tmp_path / "copy.pdf"
+        assert store_file(report, target) == "copy"
+        assert target.read_bytes() == report.read_bytes()
+
+    def test_rebuild_from_existing_files(self, archiver, report):
+        """Старый архив без каталога индексируется по именам файлов"""
+        archiver.reports_dir.mkdir(parents=True)
+        legacy = archiver.reports_dir / "2025-10-01_12-30-00_HEXACO_User_tg_1234.pdf"
+        legacy.write_bytes(report.read_bytes())
+
+        assert archiver.rebuild_catalog() == 1
+        [entry] = archiver.find_reports(test_type="hexaco")
+        assert entry["created_at"] == "2025-10-01T12:30:00"
+
+        legacy.unlink()
+        assert archiver.rebuild_catalog() == 0
+        assert archiver.get_report_stats()["total_reports"] == 0
+
+
+class TestReportBundles:
+    """Проверяет упаковку старых отчетов в архивы месяцев"""
+
+    def test_pack_and_read_by_offset(self, archiver, report):
+        """Старые отчеты уходят в zip месяца и читаются по смещению из каталога"""
+        for day in ("03", "17"):
+            day_dir = archiver.reports_dir / "2020" / "01" / day
+            day_dir.mkdir(parents=True)
+            (day_dir / f"2020-01-{day}_10-00-00_DISC_User.pdf").write_bytes(b"%PDF " + day.encode() * 100)
+        archiver.rebuild_catalog()
+        fresh = archiver.save_report(report, "paei", "User")
+
+        assert archiver.pack_old_reports(older_than_days=90) == 2
+        assert (archiver.reports_dir / "bundles" / "2020-01.zip").exists()
+        assert not (archiver.reports_dir / "2020").exists()
+        assert fresh.exists()
+
+        assert archiver.read_report("2020/01/17/2020-01-17_10-00-00_DISC_User.pdf") == b"%PDF " + b"17" * 100
+        assert archiver.get_report_stats()["bundled_reports"] == 2
+
+        # Пересборка каталога сохраняет упакованные отчеты
+        assert archiver.rebuild_catalog() == 3
+        assert archiver.read_report("2020/01/03/2020-01-03_10-00-00_DISC_User.pdf").endswith(b"03")
+
+    def test_cleanup_removes_expired_bundle(self, archiver, report):
+        """Архив месяца удаляется, когда истек срок хранения всех его отчетов"""
+        day_dir = archiver.reports_dir / "2020" / "02" / "01"
+        day_dir.mkdir(parents=True)
+        (day_dir / "2020-02-01_09-00-00_HEXACO_User.pdf").write_bytes(b"%PDF old")
+        archiver.rebuild_catalog()
+        archiver.pack_old_reports(older_than_days=30)
+
+        assert archiver.cleanup_old_reports(days_to_keep=365) == 1
+        assert not (archiver.reports_dir / "bundles" / "2020-02.zip").exists()
@@ -0,0 +1,40 @@
+"""
+Тесты бенчмарка генерации отчета
+"""
+
+import json
+
+from benchmarks.report_benchmark import STAGES, compare, main, run_benchmark
+from src.psytest.chart_cache import get_chart_cache
+
+
+class TestReportBenchmark:
+    """Проверяет замеры по этапам без сети и ключа OpenAI"""
+
+    def test_stages_measured_offline(self, monkeypatch):
+        """Все этапы замерены, заглушка AI заменяет запросы, кэши восстанавливаются"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        cache_enabled = get_chart_cache().enabled
+
+        result = run_benchmark(sessions=2, warmup=0, memory_sessions=1)
+
+        assert set(result['stages']) == set(STAGES)
+        for stage in STAGES:
+            stats = result['stages'][stage]
+            assert 0 <= stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+            assert stats['alloc_peak_mb'] is not None
+        assert result['stages']['build']['p50_ms'] > 0
+        assert result['total']['p50_ms'] >= result['stages']['charts']['p50_ms']
+        assert get_chart_cache().enabled == cache_enabled
+        json.dumps(result)
+
+        assert "charts" in compare(result, result)
+
+    def test_cli_writes_json(self, tmp_path, capsys):
+        """CLI сохраняет результат в файл для сравнения между коммитами"""
+        output = tmp_path / "bench.json"
+        assert main(["--sessions", "1", "--warmup", "0", "--memory-sessions", "0", "--output", str(output)]) == 0
+
+        result = json.loads(output.read_text(encoding="utf-8"))
+        assert result['sessions'] == 1
+        assert result['stages']['upload']['alloc_peak_mb'] is None
@@ -0,0 +1,155 @@
+"""
+Тесты планировщика генерации отчетов
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from concurrent.futures import BrokenExecutor
+
+import pytest
+
+from report_scheduler import ReportScheduler, ReportQueueFull
+
+
+def kill_worker():
+    """Процесс пула погибает, как при OOM"""
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+class TestReportScheduler:
+    """Проверяет ограничение параллельности, очередь и метрики"""
+
+    def test_concurrency_is_capped(self):
+        """Одновременно выполняется не больше max_workers заданий"""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def job(i):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return i
+
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=2, max_queue=10, use_processes=False)
+            results = await asyncio.gather(*(scheduler.submit(job, i) for i in range(6)))
+            metrics = scheduler.metrics()
+            await scheduler.shutdown()
+            return results, metrics
+
+        results, metrics = asyncio.run(scenario())
+
+        assert results == list(range(6))
+        assert state['peak'] == 2
+        assert metrics['completed'] == 6
+        assert metrics['queue_depth'] == 0
+        assert metrics['wait_max'] > 0
+
+    def test_full_queue_rejects_and_reports_positions(self):
+        """Переполненная очередь отклоняет задание, ожидающие получают место в очереди"""
+        release = threading.Event()
+        positions = []
+
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1, max_queue=2, use_processes=False)
+
+            async def on_position(position):
+                positions.append(position)
+
+            running = asyncio.ensure_future(scheduler.submit(release.wait))
+            await asyncio.sleep(0.05)
+            waiting = [asyncio.ensure_future(scheduler.submit(release.wait, on_position=on_position))
+                       for _ in range(2)]
+            await asyncio.sleep(0.05)
+
+            with pytest.raises(ReportQueueFull):
+                await scheduler.submit(release.wait)
+
+            release.set()
+            await asyncio.gather(running, *waiting)
+            metrics = scheduler.metrics()
+            await scheduler.shutdown()
+            return metrics
+
+        metrics = asyncio.run(scenario())
+
+        assert metrics['rejected'] == 1
+        assert metrics['completed'] == 3
+        assert positions[:2] == [1, 2]
+        assert positions.count(0) == 2
+
+    def test_cancelled_job_is_not_run(self):
+        """Отмененное ожидающее задание уходит из очереди и не выполняется"""
+        release = threading.Event()
+        calls = []
+
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1, max_queue=1, use_processes=False)
+            try:
+                running = asyncio.ensure_future(scheduler.submit(release.wait))
+                await asyncio.sleep(0.05)
+                waiting = asyncio.ensure_future(scheduler.submit(calls.append, "cancelled"))
+                await asyncio.sleep(0.05)
+
+                waiting.cancel()
+                await asyncio.gather(waiting, return_exceptions=True)
+                depth = scheduler.metrics()['queue_depth']
+                queued = asyncio.ensure_future(scheduler.submit(calls.append, "next"))  # место свободно
+
+                release.set()
+                await asyncio.gather(running, queued)
+                return depth
+            finally:
+                await scheduler.shutdown()
+
+        assert asyncio.run(scenario()) == 0
+        assert calls == ["next"]
+
+    def test_errors_propagate_to_caller(self):
+        """Исключение задания передается вызывающему коду"""
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1, use_processes=False)
+            try:
+                with pytest.raises(ZeroDivisionError):
+                    await scheduler.submit(divmod, 1, 0)
+                return scheduler.metrics()
+            finally:
+                await scheduler.shutdown()
+
+        assert asyncio.run(scenario())['failed'] == 1
+
+    def test_process_pool_runs_in_another_process(self):
+        """По умолчанию задания выполняются вне процесса бота"""
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1)
+            try:
+                return await scheduler.submit(os.getpid)
+            finally:
+                await scheduler.shutdown()
+
+        assert asyncio.run(scenario()) != os.getpid()
+
+    def test_pool_recreated_after_worker_killed(self):
+        """Гибель процесса пула не ломает планировщик: следующее задание выполняется"""
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1)
+            try:
+                first_pid = await scheduler.submit(os.getpid)
+                with pytest.raises(BrokenExecutor):
+                    await scheduler.submit(kill_worker)   # погибает и при повторе
+                next_pid = await scheduler.submit(os.getpid)
+                return first_pid, next_pid, scheduler.metrics()
+            finally:
+                await scheduler.shutdown()
+
+        first_pid, next_pid, metrics = asyncio.run(scenario())
+
+        assert next_pid not in (first_pid, os.getpid())
+        assert metrics['restarts'] == 2
+        assert metrics['failed'] == 1
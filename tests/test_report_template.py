@@ -0,0 +1,69 @@
+"""
+Тесты шаблона отчёта: стили и постоянные абзацы создаются один раз
+"""
+
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+
+import enhanced_pdf_report
+from enhanced_pdf_report import EnhancedPDFReportV2, ReportTemplate, StaticParagraph
+
+SCORES = (
+    {"P": 3, "A": 1, "E": 0, "I": 1},
+    {"D": 3, "I": 2, "S": 1, "C": 2},
+    {"H": 3.5, "E": 4.2, "X": 2.8, "A": 4.0, "C": 3.1, "O": 3.7},
+    {f"skill_{i}": 3 for i in range(10)},
+)
+INTERPRETATIONS = {key: "Текст интерпретации. " * 50 for key in ('paei', 'disc', 'hexaco', 'soft_skills', 'general')}
+
+
+def build_story(report):
+    return report._build_story("Иван Петров", "2025-10-01", *SCORES, INTERPRETATIONS, {})
+
+
+class TestReportTemplate:
+    """Проверяет кэширование неизменной части отчёта"""
+
+    def test_styles_built_once_per_process(self, tmp_path, monkeypatch):
+        """Второй отчёт не пересобирает таблицу стилей"""
+        first = EnhancedPDFReportV2(template_dir=tmp_path)
+        styles = first._get_custom_styles()
+
+        def no_rebuild():
+            raise AssertionError("getSampleStyleSheet не должен вызываться повторно")
+        monkeypatch.setattr(enhanced_pdf_report, "getSampleStyleSheet", no_rebuild)
+
+        second = EnhancedPDFReportV2(template_dir=tmp_path)
+        assert second._get_custom_styles() is styles
+        build_story(second)
+
+    def test_static_paragraphs_share_layout(self, tmp_path):
+        """Копии постоянного абзаца разбирают разметку и верстают строки один раз"""
+        report = EnhancedPDFReportV2(template_dir=tmp_path)
+        first = [f for f in build_story(report) if isinstance(f, StaticParagraph)]
+        second = [f for f in build_story(report) if isinstance(f, StaticParagraph)]
+
+        assert len(first) == len(second) > 10
+        assert all(a is not b and a.frags is b.frags for a, b in zip(first, second))
+
+        width = A4[0] - 30
+        first[0].wrap(width, 800)
+        second[0].wrap(width, 800)
+        assert first[0].blPara is second[0].blPara
+
+    def test_repeated_reports_render_identically(self, tmp_path):
+        """Повторное использование шаблона не меняет содержимое PDF"""
+        report = EnhancedPDFReportV2(template_dir=tmp_path)
+        template = ReportTemplate.for_fonts(enhanced_pdf_report.DesignConfig.TITLE_FONT,
+                                            enhanced_pdf_report.DesignConfig.BODY_FONT)
+        assert report.template is template
+
+        outputs = []
+        for _ in range(2):
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+            report._build_document(doc, build_story(report))
+            outputs.append(buffer.getvalue())
+        assert outputs[0] == outputs[1]
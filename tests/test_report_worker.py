@@ -0,0 +1,79 @@
+"""
+Тесты отрисовки отчетов в процессе-воркере
+"""
+
+import asyncio
+import pickle
+import tempfile
+
+from report_scheduler import ReportScheduler
+from report_worker import ReportJob, render_report, warm_up_worker
+
+
+def make_job(tmp_path) -> ReportJob:
+    return ReportJob(
+        participant_name="Тест Воркер",
+        test_date="2025-01-01 12:00",
+        paei_scores={'P': 5.0, 'A': 2.5, 'E': 7.5, 'I': 10.0},
+        disc_scores={'D': 6.0, 'I': 4.0, 'S': 8.0, 'C': 2.0},
+        hexaco_scores={'H': 5.0, 'E': 5.5, 'X': 7.5, 'A': 5.0, 'C': 7.0, 'O': 8.0},
+        soft_skills_scores={f"skill_{i}": float(i) for i in range(1, 11)},
+        interpretations={section: f"Интерпретация {section}"
+                         for section in ('paei', 'disc', 'hexaco', 'soft_skills', 'general')},
+        pdf_path_user=str(tmp_path / "user.pdf"),
+        pdf_path_full=str(tmp_path / "full.pdf"),
+        user_answers={'paei': {}, 'disc': {}, 'hexaco': {}, 'soft_skills': {}},
+        upload_to_gdrive=False,
+    )
+
+
+class TestReportWorker:
+    """Проверяет сериализуемое задание и отрисовку в прогретом процессе"""
+
+    def test_job_is_picklable(self, tmp_path):
+        """Задание передается в процесс без ссылок на объекты бота"""
+        job = make_job(tmp_path)
+        assert pickle.loads(pickle.dumps(job)) == job
+
+    def test_render_in_prewarmed_process(self, tmp_path):
+        """Воркер пула процессов рисует оба PDF и возвращает их пути"""
+        job = make_job(tmp_path)
+
+        async def scenario():
+            scheduler = ReportScheduler(max_workers=1, initializer=warm_up_worker)
+            try:
+                await scheduler.prewarm()
+                return await scheduler.submit(render_report, job)
+            finally:
+                await scheduler.shutdown()
+
+        result = asyncio.run(scenario())
+
+        assert result.gdrive_link is None
+        for pdf in (result.pdf_path_user, result.pdf_path_full):
+            with open(pdf, 'rb') as f:
+                assert f.read(4) == b"%PDF"
+
+    def test_user_report_in_memory(self, tmp_path):
+        """Без pdf_path_user отчет пользователя возвращается байтами, на диске только полный"""
+        job = make_job(tmp_path)
+        job.pdf_path_user = None
+
+        result = render_report(job)
+
+        assert result.pdf_path_user is None
+        assert result.pdf_user_bytes.startswith(b"%PDF")
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["full.pdf"]
+
+    def test_render_leaves_no_temp_dirs(self, tmp_path, monkeypatch):
+        """После отрисовки во временной папке системы не остается файлов задания"""
+        temp_root = tmp_path / "tmp"
+        temp_root.mkdir()
+        monkeypatch.setattr(tempfile, "tempdir", str(temp_root))
+        job = make_job(tmp_path)
+
+        render_report(job)
+        job.pdf_path_user = None
+        render_report(job)
+
+        assert list(temp_root.iterdir()) == []
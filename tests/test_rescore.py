@@ -0,0 +1,82 @@
+"""
+Тесты пакетного пересчёта баллов по таблице responses
+"""
+
+import sqlite3
+
+import pytest
+
+from src.psytest.cli_rescore import build_definitions, main, rescore
+from src.psytest.init_db import init_db
+
+SCHEMA = "data/schema.sql"
+
+
+@pytest.fixture
+def db(tmp_path):
+    """База со схемой data/schema.sql и ответами трёх сессий бота"""
+    path = tmp_path / "psytest.sqlite3"
+    init_db(path, SCHEMA)
+    conn = sqlite3.connect(str(path))
+    rows = []
+    for n, session_id in enumerate(["s1", "s2", "s3"]):
+        conn.execute("INSERT INTO sessions VALUES (?, '2025-10-01', '[]', NULL)", (session_id,))
+        # PAEI: ответы 1-4 соответствуют P, A, E, I
+        rows += [(session_id, 'paei', i, answer, 'ts') for i, answer in enumerate([1, 1, 2, 4, 1])]
+        # DISC: 8 вопросов по 2 на категорию D, D, I, I, S, S, C, C
+        rows += [(session_id, 'disc', i, 1 + (i + n) % 5, 'ts') for i in range(8)]
+        rows += [(session_id, 'hexaco', i, 3, 'ts') for i in range(6)]
+    rows.append(("s3", 'unknown_test', 0, 1, 'ts'))
+    conn.executemany("INSERT INTO responses (session_id, test_id, item_id, answer, ts) VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def fetch_scores(path, session_id, test_id):
+    conn = sqlite3.connect(str(path))
+    rows = conn.execute(
+        "SELECT scale, raw, norm FROM scores WHERE session_id = ? AND test_id = ? ORDER BY scale",
+        (session_id, test_id)
+    ).fetchall()
+    conn.close()
+    return {scale: (raw, norm) for scale, raw, norm in rows}
+
+
+class TestRescore:
+    """Проверяет потоковый пересчёт частями и повторный запуск"""
+
+    def test_scores_written_in_chunks(self, db):
+        """Маленькие части режут сессии, но баллы считаются по сессии целиком"""
+        stats = rescore(db, chunk_size=7)
+
+        assert stats['responses'] == 3 * (5 + 8 + 6) + 1
+        assert stats['sessions'] == 3
+        assert stats['skipped'] == 1
+        assert stats['rows_per_second'] > 0
+
+        # У всех сессий одинаковые ответы PAEI -> середина распределения
+        assert fetch_scores(db, "s1", "paei") == {
+            'A': (1.0, 50.0), 'E': (0.0, 50.0), 'I': (1.0, 50.0), 'P': (3.0, 50.0),
+        }
+        # DISC D: суммы 3, 5, 7 у s1, s2, s3
+        assert fetch_scores(db, "s1", "disc")['D'] == (3.0, 16.7)
+        assert fetch_scores(db, "s3", "disc")['D'] == (7.0, 83.3)
+        assert fetch_scores(db, "s2", "hexaco")['O'] == (3.0, 50.0)
+        assert stats['norms'] == stats['scores']
+
+    def test_rerun_replaces_scores(self, db):
+        """Повторный пересчёт заменяет баллы, а не дублирует их"""
+        rescore(db, chunk_size=1000)
+        first = rescore(db, chunk_size=1000)
+
+        conn = sqlite3.connect(str(db))
+        total = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        conn.close()
+        assert total == first['scores'] == 3 * (4 + 4 + 6)
+
+    def test_cli(self, db, capsys):
+        """CLI печатает пропускную способность"""
+        assert main(["--db", str(db), "--tests", "hexaco"]) == 0
+        assert "строк/с" in capsys.readouterr().out
+        assert set(build_definitions()) >= {'paei', 'disc', 'hexaco', 'soft_skills', 'HEXACO'}
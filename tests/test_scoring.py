@@ -0,0 +1,82 @@
+"""
+Тесты векторизованного подсчёта баллов
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.psytest.bank import load_items
+from src.psytest.scoring import ScoringEngine, score_likert, score_paei
+
+BANK = "data/bank"
+
+
+def reference_score(df_items, df_resp, max_val=5):
+    """Прежний построчный подсчёт (merge + apply) для сравнения"""
+    df = df_resp.merge(df_items[['item_id', 'scale', 'reverse']], on='item_id', how='left')
+    df['adj'] = df.apply(lambda r: (max_val + 1 - r['answer']) if r['reverse'] == 1 else r['answer'], axis=1)
+    return df.groupby('scale')['adj'].sum().reset_index(name='raw')
+
+
+@pytest.fixture
+def items():
+    """Банк с обратными вопросами и несколькими шкалами"""
+    return pd.DataFrame({
+        'item_id': [1, 2, 3, 4, 5, 6],
+        'scale': ['H', 'H', 'E', 'X', 'E', 'X'],
+        'reverse': [0, 1, 0, 1, 1, 0],
+    })
+
+
+class TestScoringEngine:
+    """Проверяет совпадение с прежним подсчётом и пакетный режим"""
+
+    def test_matches_rowwise_scoring(self, items):
+        """Один респондент: те же шкалы и сырые баллы, что у merge + apply"""
+        resp = pd.DataFrame({'item_id': [1, 2, 3, 4, 5, 6], 'answer': [5, 2, 3, 1, 4, 2]})
+
+        result = score_likert(items, resp)
+        expected = reference_score(items, resp)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        assert result['raw'].dtype.kind == 'i'
+
+    def test_partial_and_unknown_items(self, items):
+        """Неизвестные вопросы игнорируются, шкалы без ответов не выводятся"""
+        resp = pd.DataFrame({'item_id': [2, 99], 'answer': [1, 5]})
+        result = score_likert(items, resp)
+        assert result.to_dict('list') == {'scale': ['H'], 'raw': [5]}
+
+    def test_bank_items(self):
+        """Реальные банки вопросов дают те же баллы"""
+        for name in ("paei_items.csv", "hexaco_items.csv"):
+            bank = load_items(f"{BANK}/{name}")
+            resp = pd.DataFrame({'item_id': bank['item_id'], 'answer': 4})
+            pd.testing.assert_frame_equal(score_paei(bank, resp), reference_score(bank, resp), check_dtype=False)
+
+    def test_answer_matrix(self, items):
+        """Матрица N × M считается одним вызовом и совпадает с подсчётом по одному"""
+        rng = np.random.default_rng(0)
+        answers = rng.integers(1, 6, size=(50, 6)).astype(float)
+        answers[rng.random(answers.shape) < 0.1] = np.nan
+        engine = ScoringEngine(items)
+
+        raw = engine.score_matrix(answers)
+        for row in range(len(answers)):
+            answered = ~np.isnan(answers[row])
+            resp = pd.DataFrame({'item_id': items['item_id'][answered], 'answer': answers[row][answered]})
+            expected = reference_score(items, resp).set_index('scale')['raw']
+            got = pd.Series(raw[row], index=engine.scales)[expected.index]
+            np.testing.assert_allclose(got.to_numpy(), expected.to_numpy())
+
+    def test_score_many_long_format(self, items):
+        """Длинная таблица ответов нескольких сессий -> баллы по сессиям"""
+        resp = pd.DataFrame({
+            'session_id': ['a', 'a', 'b', 'b'],
+            'item_id': [1, 2, 3, 5],
+            'answer': [5, 5, 2, 2],
+        })
+        result = ScoringEngine(items).score_many(resp)
+        assert result.to_dict('list') == {
+            'session_id': ['a', 'b'], 'scale': ['H', 'E'], 'raw': [6.0, 6.0],
+        }
@@ -0,0 +1,172 @@
+"""
+Тесты хранилища сессий бота
+"""
+
+import hashlib
+import sqlite3
+import time
+
+import pytest
+
+from session_store import MemorySessionStore, SQLiteSessionStore
+from src.psytest import user_hash
+from src.psytest.user_hash import hash_user, set_user_hash_salt
+
+
+class FakeSession:
+    """Минимальная сессия с тем же интерфейсом снимков, что у UserSession"""
+
+    def __init__(self, user_id, current_question=0):
+        self.user_id = user_id
+        self.session_id = f"tg{user_id}"
+        self.current_question = current_question
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['user_id'], data['current_question'])
+
+
+@pytest.fixture(autouse=True)
+def test_salt():
+    """Фиксированная соль: тесты не создают data/user_hash_salt"""
+    set_user_hash_salt("test-salt")
+    yield
+    set_user_hash_salt(None)
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    """Создает SQLite хранилище в tmp (флаш только вручную) и закрывает его после теста"""
+    stores = []
+
+    def factory(**kwargs):
+        kwargs.setdefault('flush_interval', 3600)
+        store = SQLiteSessionStore(FakeSession.from_dict, db_path=tmp_path / "sessions.sqlite3", **kwargs)
+        stores.append(store)
+        return store
+
+    yield factory
+    for store in stores:
+        store.close()
+
+
+class TestMemorySessionStore:
+    """Проверяет вытеснение сессий из памяти"""
+
+    def test_lru_eviction(self):
+        """При превышении лимита вытесняется давно не использованная сессия"""
+        store = MemorySessionStore(max_sessions=2)
+        store[1] = FakeSession(1)
+        store[2] = FakeSession(2)
+        assert store[1].user_id == 1  # 1 становится свежей
+        store[3] = FakeSession(3)
+
+        assert 2 not in store
+        assert 1 in store and 3 in store
+        assert store.evictions == 1
+
+    def test_idle_ttl_eviction(self):
+        """Брошенные сессии удаляются после idle_ttl"""
+        store = MemorySessionStore(idle_ttl=0.01)
+        store[1] = FakeSession(1)
+        time.sleep(0.02)
+
+        assert store.get(1) is None
+        assert len(store) == 0
+
+
+class TestSQLiteSessionStore:
+    """Проверяет отложенную запись и продолжение после перезапуска"""
+
+    def test_answers_batched_and_resumed_after_restart(self, make_store, tmp_path):
+        """Ответы пишутся пачкой, после перезапуска сессия продолжается с того же вопроса"""
+        store = make_store()
+        session = FakeSession(42)
+        store[42] = session
+        for item_id in range(3):
+            session.current_question += 1
+            store.record_answer(42, 'hexaco', item_id, 4)
+
+        db = sqlite3.connect(str(tmp_path / "sessions.sqlite3"))
+        assert db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0  # еще в памяти
+        store.close()
+
+        rows = db.execute("SELECT session_id, test_id, item_id, answer FROM responses ORDER BY id").fetchall()
+        assert rows == [("tg42", "hexaco", i, 4) for i in range(3)]
+        assert store.flushes == 1
+
+        restarted = make_store()
+        assert 42 in restarted
+        assert restarted[42].current_question == 3
+
+    def test_evicted_session_reloaded_from_db(self, make_store):
+        """Вытесненная из памяти сессия не теряется"""
+        store = make_store(max_sessions=1)
+        store[1] = FakeSession(1, current_question=5)
+        store[2] = FakeSession(2)
+        store.flush()
+
+        assert 1 not in store._sessions
+        assert store[1].current_question == 5
+
+    def test_delete_removes_resume_state(self, make_store, tmp_path):
+        """Завершенная сессия больше не предлагается к продолжению, ответы остаются"""
+        store = make_store()
+        store[7] = FakeSession(7)
+        store.record_answer(7, 'disc', 0, 3)
+        store.flush()
+        del store[7]
+        store.close()
+
+        restarted = make_store()
+        assert 7 not in restarted
+        db = sqlite3.connect(str(tmp_path / "sessions.sqlite3"))
+        assert db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 1
+
+
+@pytest.fixture
+def salt_config(tmp_path, monkeypatch):
+    """Соль читается заново: без USER_HASH_SALT, файл соли - в tmp"""
+    monkeypatch.delenv("USER_HASH_SALT", raising=False)
+    monkeypatch.setattr(user_hash, "DEFAULT_SALT_PATH", tmp_path / "user_hash_salt")
+    set_user_hash_salt(None)
+    yield monkeypatch
+    set_user_hash_salt(None)
+
+
+class TestUserHash:
+    """Проверяет соль анонимного идентификатора пользователя"""
+
+    def test_hash_salted_from_config(self, salt_config):
+        """С USER_HASH_SALT хэш не совпадает с простым sha256 ID и зависит от соли"""
+        salt_config.setenv("USER_HASH_SALT", "first")
+        first = hash_user(123456789)
+        assert first == hash_user(123456789)
+        assert first != hashlib.sha256(b"123456789").hexdigest()[:16]
+
+        salt_config.setenv("USER_HASH_SALT", "second")
+        set_user_hash_salt(None)
+        assert hash_user(123456789) != first
+
+    def test_generated_salt_persisted(self, salt_config, tmp_path):
+        """Без настройки соль создается один раз и переживает перезапуск"""
+        first = hash_user(42)
+        salt_file = tmp_path / "user_hash_salt"
+        assert salt_file.stat().st_mode & 0o777 == 0o600
+
+        set_user_hash_salt(None)
+        assert hash_user(42) == first
+
+    def test_sessions_store_salted_hash(self, salt_config, make_store, tmp_path):
+        """Хранилище записывает в sessions.user_hash хэш ID с солью"""
+        salt_config.setenv("USER_HASH_SALT", "test-salt")
+        store = make_store()
+        store[987654321] = FakeSession(987654321)
+        store.flush()
+
+        with sqlite3.connect(tmp_path / "sessions.sqlite3") as db:
+            rows = db.execute("SELECT user_hash FROM sessions").fetchall()
+        assert rows == [(hash_user(987654321),)]
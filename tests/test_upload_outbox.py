@@ -0,0 +1,84 @@
+"""
+Тесты очереди загрузки отчетов в Google Drive
+"""
+
+import time
+
+import pytest
+
+from upload_outbox import UploadOutbox
+
+
+class FlakyUploader:
+    """Загрузчик, который падает заданное число раз, затем возвращает ссылку"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, path, file_name, folder_name, folder_id, use_monthly):
+        self.calls.append(file_name)
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("503 Service Unavailable")
+        return f"https://drive/{file_name}"
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "report_full.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return path
+
+
+class TestUploadOutbox:
+    """Проверяет перенос файла в outbox, повторы и переживание перезапуска"""
+
+    def test_enqueue_moves_file_and_uploads(self, tmp_path, report):
+        """Файл переносится в outbox и удаляется оттуда после загрузки"""
+        uploader = FlakyUploader()
+        outbox = UploadOutbox(tmp_path / "outbox", uploader=uploader)
+
+        outbox.enqueue(str(report))
+        assert not report.exists()
+
+        assert outbox.process_due() == 1
+        assert uploader.calls == ["report_full.pdf"]
+        assert outbox.stats() == {'pending': 0, 'done': 1, 'failed': 0}
+        assert not list((tmp_path / "outbox").glob("*.pdf"))
+        outbox.close()
+
+    def test_retry_with_backoff_then_failed(self, tmp_path, report):
+        """Ошибка откладывает попытку, после max_attempts загрузка помечается failed"""
+        uploader = FlakyUploader(failures=10)
+        outbox = UploadOutbox(tmp_path / "outbox", uploader=uploader, max_attempts=2, retry_base=0)
+
+        outbox.enqueue(str(report))
+        outbox.process_due()
+
+        assert len(uploader.calls) == 2
+        assert outbox.stats()['failed'] == 1
+        assert list((tmp_path / "outbox").glob("*.pdf"))  # файл оставлен для ручной загрузки
+
+        pending = UploadOutbox(tmp_path / "outbox2", uploader=FlakyUploader(failures=1), retry_base=60)
+        pending.enqueue(str(next((tmp_path / "outbox").glob("*.pdf"))))
+        assert pending.process_due() == 0  # следующая попытка через ~минуту
+        assert pending.stats()['pending'] == 1
+        outbox.close()
+        pending.close()
+
+    def test_queue_survives_restart(self, tmp_path, report):
+        """Незагруженные файлы подхватываются после перезапуска"""
+        outbox = UploadOutbox(tmp_path / "outbox", uploader=FlakyUploader())
+        outbox.enqueue(str(report))
+        outbox.close()
+
+        uploader = FlakyUploader()
+        restarted = UploadOutbox(tmp_path / "outbox", uploader=uploader)
+        restarted.start()
+        deadline = time.monotonic() + 5
+        while restarted.stats()['done'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert uploader.calls == ["report_full.pdf"]
+        assert restarted.stats()['done'] == 1
+        restarted.close()
@@ -0,0 +1,101 @@
+"""
+Тесты векторного бэкенда диаграмм (reportlab.graphics)
+"""
+
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from reportlab.graphics.shapes import Drawing, Polygon, String
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from enhanced_pdf_report import EnhancedPDFReportV2
+from src.psytest.vector_charts import draw_hexaco_radar, draw_radar
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SOFT_LABELS = ["Коммуникация", "Работа в команде", "Критическое мышление", "Восприимчивость к критике",
+               "Решение проблем", "Креативность"]
+
+VECTOR_REPORT = """
+import sys
+from io import BytesIO
+from pathlib import Path
+from enhanced_pdf_report import EnhancedPDFReportV2
+
+report = EnhancedPDFReportV2(template_dir=Path(sys.argv[1]), chart_backend="vector")
+report.generate_enhanced_report(
+    "Иван Петров", "2025-10-01",
+    {"P": 5.0, "A": 2.5, "E": 7.5, "I": 3.0}, {"D": 3.5, "I": 2.0, "S": 4.1, "C": 1.5},
+    {"H": 3.5, "E": 4.2, "X": 2.8, "A": 4.0, "C": 3.1, "O": 3.7}, {f"skill_{i}": 3 for i in range(10)},
+    {}, Path(sys.argv[1]) / "report.pdf",
+)
+assert "matplotlib" not in sys.modules, "векторный отчёт импортировал matplotlib"
+"""
+
+
+def text_extents(drawing: Drawing):
+    for shape in drawing.contents:
+        if isinstance(shape, String):
+            width = stringWidth(shape.text, shape.fontName, shape.fontSize)
+            left = {'start': shape.x, 'middle': shape.x - width / 2, 'end': shape.x - width}[shape.textAnchor]
+            yield left, left + width
+
+
+class TestVectorCharts:
+    """Проверяет диаграммы Drawing и выбор бэкенда для отчёта"""
+
+    @pytest.mark.parametrize("draw, labels", [
+        (draw_radar, SOFT_LABELS),
+        (draw_hexaco_radar, list("HEXACO")),
+    ])
+    def test_radar_labels_fit_drawing(self, draw, labels):
+        """Подписи осей не выходят за границы рисунка"""
+        drawing = draw(labels, [3.0] * len(labels), 198, 198, title="Радар")
+        assert all(0 <= left and right <= drawing.width for left, right in text_extents(drawing))
+
+    def test_values_clipped_to_scale(self):
+        """Значения выше максимума шкалы обрезаются по внешнему кругу"""
+        inside = draw_radar(list("ABCD"), [5, 5, 5, 5], 200, 200, max_value=5)
+        overflow = draw_radar(list("ABCD"), [9, 5, 5, 5], 200, 200, max_value=5)
+        polygon = [shape for shape in inside.contents if isinstance(shape, Polygon)][0]
+        assert polygon.points == [shape for shape in overflow.contents if isinstance(shape, Polygon)][0].points
+
+    def test_report_charts_are_drawings(self, tmp_path):
+        """Векторный бэкенд не пишет PNG: диаграммы встраиваются как Drawing"""
+        report = EnhancedPDFReportV2(template_dir=tmp_path, chart_backend="vector")
+        charts = report._create_all_charts({"P": 5, "A": 2, "E": 7, "I": 3}, {"D": 3, "I": 2, "S": 4, "C": 1},
+                                           {"H": 3, "E": 4, "X": 2, "A": 4, "C": 3, "O": 3},
+                                           {f"skill_{i}": 3 for i in range(10)})
+
+        assert set(charts) == {'paei', 'soft_skills', 'hexaco', 'disc'}
+        assert all(isinstance(chart, Drawing) for chart in charts.values())
+        assert list(tmp_path.iterdir()) == []
+
+        with pytest.raises(ValueError):
+            EnhancedPDFReportV2(template_dir=tmp_path, chart_backend="svg")
+
+    def test_shared_charts_in_two_reports(self, tmp_path):
+        """Один набор Drawing верстается в обоих отчётах (пользователя и полном)"""
+        report = EnhancedPDFReportV2(template_dir=tmp_path, chart_backend="vector")
+        scores = ({"P": 5, "A": 2, "E": 7, "I": 3}, {"D": 3, "I": 2, "S": 4, "C": 1},
+                  {"H": 3, "E": 4, "X": 2, "A": 4, "C": 3, "O": 3}, {f"skill_{i}": 3 for i in range(10)})
+        charts = report._create_all_charts(*scores)
+        interpretations = {key: "Текст интерпретации. " * 40
+                           for key in ('paei', 'disc', 'hexaco', 'soft_skills', 'general')}
+
+        for _ in range(2):
+            buffer = BytesIO()
+            story = report._build_story("Иван Петров", "2025-10-01", *scores, interpretations, charts)
+            report._build_document(report._create_doc_template(buffer), story)
+            assert buffer.getvalue()[:4] == b"%PDF"
+
+    def test_vector_report_does_not_import_matplotlib(self, tmp_path):
+        """Отчёт с векторными диаграммами собирается без импорта matplotlib"""
+        completed = subprocess.run([sys.executable, "-c", VECTOR_REPORT, str(tmp_path)],
+                                   cwd=ROOT, capture_output=True, text=True)
+
+        assert completed.returncode == 0, completed.stderr
+        assert (tmp_path / "report.pdf").read_bytes()[:4] == b"%PDF"
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Очередь загрузки отчетов в Google Drive (outbox)
+
+Полный отчет больше не загружается во время генерации: пользователь получает
+свой PDF сразу, а файл для Drive переносится в папку outbox и записывается в
+SQLite очередь. Фоновый поток загружает файлы по очереди (возобновляемая
+загрузка DriveClient), при ошибке повторяет с экспоненциальной задержкой.
+Очередь переживает перезапуск бота: незагруженные файлы остаются в outbox.
+"""
+import os
+import random
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from oauth_google_drive import DEFAULT_FOLDER_ID, get_drive_client
+
+DEFAULT_OUTBOX_DIR = Path(__file__).parent / "data" / "outbox"
+
+# Загрузчик: (путь к файлу, имя файла в Drive, имя папки, ID папки, структура год/месяц) -> ссылка
+Uploader = Callable[[str, str, str, Optional[str], bool], Optional[str]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    folder_name TEXT NOT NULL,
+    folder_id TEXT,
+    use_monthly INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',   -- pending / done / failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    link TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_uploads_due ON uploads(status, next_attempt_at);
+"""
+
+
+def drive_uploader(path: str, file_name: str, folder_name: str,
+                   folder_id: Optional[str], use_monthly: bool) -> Optional[str]:
+    """Загрузка через общий DriveClient (ошибки API пробрасываются для повтора)"""
+    return get_drive_client().upload(
+        path, folder_name=folder_name, folder_id=folder_id,
+        use_monthly_structure=use_monthly, file_name=file_name
+    )
+
+
+class UploadOutbox:
+    """Постоянная очередь загрузок с фоновым воркером и повторами"""
+
+    def __init__(self, outbox_dir: Optional[Path] = None, uploader: Uploader = drive_uploader,
+                 max_attempts: int = 8, retry_base: float = 30.0, retry_max: float = 3600.0,
+                 poll_interval: float = 5.0):
+        """
+        Args:
+            outbox_dir: Папка для файлов в очереди и базы outbox.sqlite3
+            uploader: Функция загрузки (подменяется в тестах)
+            max_attempts: После стольких неудачных попыток загрузка помечается failed
+            retry_base: Задержка перед первым повтором (секунды), дальше удваивается
+            retry_max: Максимальная задержка между попытками
+            poll_interval: Как часто воркер проверяет очередь без новых заданий
+        """
+        self.outbox_dir = Path(outbox_dir or DEFAULT_OUTBOX_DIR)
+        self.uploader = uploader
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.outbox_dir / "outbox.sqlite3"), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def enqueue(self, file_path: str, folder_name: str = "PsychTest Reports",
+                folder_id: Optional[str] = DEFAULT_FOLDER_ID, use_monthly_structure: bool = True) -> int:
+        """
+        Переносит файл в outbox и ставит его в очередь загрузки
+
+        Returns:
+            ID загрузки в очереди
+        """
+        source = Path(file_path)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO uploads (path, file_name, folder_name, folder_id, use_monthly, "
+                "next_attempt_at, created_at) VALUES ('', ?, ?, ?, ?, ?, ?)",
+                (source.name, folder_name, folder_id, int(use_monthly_structure),
+                 time.time(), datetime.now().isoformat())
+            )
+            upload_id = cursor.lastrowid
+            target = self.outbox_dir / f"{upload_id:06d}_{source.name}"
+            shutil.move(str(source), str(target))
+            self._conn.execute("UPDATE uploads SET path = ? WHERE id = ?", (str(target), upload_id))
+        print(f"Отчет {source.name} поставлен в очередь загрузки в Google Drive (#{upload_id})")
+        self._wakeup.set()
+        return upload_id
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return delay * random.uniform(0.8, 1.2)  # разброс, чтобы повторы не шли пачкой
+
+    def process_due(self) -> int:
+        """Загружает все файлы, время попытки которых наступило. Возвращает число успешных"""
+        uploaded = 0
+        while not self._stop.is_set():
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT id, path, file_name, folder_name, folder_id, use_monthly, attempts FROM uploads "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT 1",
+                    (time.time(),)
+                ).fetchone()
+            if row is None:
+                break
+            upload_id, path, file_name, folder_name, folder_id, use_monthly, attempts = row
+
+            error = None
+            link = None
+            if not os.path.exists(path):
+                error = "файл отсутствует в outbox"
+                attempts = self.max_attempts - 1  # повторять бессмысленно
+            else:
+                try:
+                    link = self.uploader(path, file_name, folder_name, folder_id, bool(use_monthly))
+                    if not link:
+                        error = "Google Drive недоступен"
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+
+            attempts += 1
+            with self._lock, self._conn:
+                if error is None:
+                    self._conn.execute(
+                        "UPDATE uploads SET status = 'done', attempts = ?, link = ?, last_error = NULL "
+                        "WHERE id = ?", (attempts, link, upload_id))
+                elif attempts >= self.max_attempts:
+                    self._conn.execute(
+                        "UPDATE uploads SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                        (attempts, error, upload_id))
+                else:
+                    self._conn.execute(
+                        "UPDATE uploads SET attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                        (attempts, error, time.time() + self._retry_delay(attempts), upload_id))
+
+            if error is None:
+                uploaded += 1
+                Path(path).unlink(missing_ok=True)
+                print(f"Отчет {file_name} загружен в Google Drive: {link}")
+            elif attempts >= self.max_attempts:
+                print(f"Загрузка {file_name} не удалась после {attempts} попыток: {error}. "
+                      f"Файл оставлен в {self.outbox_dir}")
+            else:
+                print(f"Ошибка загрузки {file_name} (попытка {attempts}): {error}")
+        return uploaded
+
+    def _next_due_in(self) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM uploads WHERE status = 'pending'"
+            ).fetchone()
+        if row[0] is None:
+            return self.poll_interval
+        return max(0.0, min(row[0] - time.time(), self.poll_interval))
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.process_due()
+            except Exception as e:
+                print(f"Ошибка очереди загрузок: {e}")
+            self._wakeup.wait(self._next_due_in())
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Запускает фоновую загрузку (незавершенные загрузки прошлого запуска продолжаются)"""
+        if self._worker is None:
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._worker_loop, name="gdrive-outbox", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Останавливает воркер (текущая загрузка завершается или повторится при запуске)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Число загрузок по статусам"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM uploads GROUP BY status").fetchall()
+        stats = {'pending': 0, 'done': 0, 'failed': 0}
+        stats.update(dict(rows))
+        return stats
+
+
+def create_upload_outbox() -> UploadOutbox:
+    """Создает очередь загрузок по настройкам из переменных окружения"""
+    return UploadOutbox(
+        outbox_dir=os.getenv("UPLOAD_OUTBOX_DIR") or None,
+        max_attempts=int(os.getenv("UPLOAD_MAX_ATTEMPTS", "8")),
+        retry_base=float(os.getenv("UPLOAD_RETRY_BASE", "30")),
+    )